@@ -0,0 +1,99 @@
+"""
+Compares per-call latency of the docker SDK operator and the Engine API operator.
+
+Needs a docker daemon on a unix socket. Pulls busybox and runs one container
+named containup-bench-calls, removed at the end. With --fake, runs against the
+in-process fake engine instead, adding --fake-latency ms to each API call, to
+measure the client side alone.
+
+    python -m benchmarks.bench_operator_calls [--calls 200] [--fake [--fake-latency 1]]
+"""
+
+import argparse
+import statistics
+import time
+from typing import Callable
+
+import docker
+
+from containup import Service
+from containup.business.commands.container_operator import ContainerOperator
+from containup.infra.docker.docker_operator import DockerOperator
+from containup.infra.docker.engine_client import EngineClient
+from containup.infra.docker.engine_operator import EngineApiOperator
+from containup.infra.resource_pool import ResourcePool
+from containup.infra.user_interactions_cli import UserInteractionsCLI
+from tests.support.fake_engine import FakeEngine, FakeEngineBehavior
+
+IMAGE = "busybox:1.36"
+CONTAINER = "containup-bench-calls"
+
+
+def measure(call: Callable[[], object], calls: int) -> list[float]:
+    call()  # warm up (connections, caches)
+    timings: list[float] = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def report(backend: str, operation: str, timings: list[float]) -> None:
+    timings = sorted(timings)
+    p50 = statistics.median(timings) * 1000
+    p95 = timings[int(len(timings) * 0.95) - 1] * 1000
+    print(f"{backend:<8} {operation:<26} p50 {p50:7.3f} ms   p95 {p95:7.3f} ms")
+
+
+def bench(backend: str, operator: ContainerOperator, calls: int) -> None:
+    operations: dict[str, Callable[[], object]] = {
+        "container_exists": lambda: operator.container_exists(CONTAINER),
+        "container_health_status": lambda: operator.container_health_status(CONTAINER),
+        "image_exists": lambda: operator.image_exists(IMAGE),
+        "inventory": lambda: operator.inventory([CONTAINER], [], []),
+    }
+    for operation, call in operations.items():
+        report(backend, operation, measure(call, calls))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--fake", action="store_true", help="use the fake engine")
+    parser.add_argument("--fake-latency", type=float, default=0.0, metavar="MS")
+    args = parser.parse_args()
+
+    if not args.fake:
+        run(docker.from_env, EngineClient.from_env(), args.calls)
+        return
+    behavior = FakeEngineBehavior(latency={"*": args.fake_latency / 1000})
+    with FakeEngine(behavior) as engine:
+        run(engine.docker_client, engine.engine_client(), args.calls)
+
+
+def run(
+    docker_client: Callable[[], docker.DockerClient],
+    engine_client: EngineClient,
+    calls: int,
+) -> None:
+    operators: dict[str, ContainerOperator] = {
+        "docker": DockerOperator(ResourcePool(docker_client, 1), UserInteractionsCLI()),
+        "engine": EngineApiOperator(engine_client),
+    }
+    setup = operators["engine"]
+    setup.image_pull(IMAGE)
+    if setup.container_exists(CONTAINER):
+        setup.container_remove(CONTAINER)
+    setup.container_run("bench", Service(CONTAINER, IMAGE, command=["sleep", "600"]))
+    try:
+        for backend, operator in operators.items():
+            bench(backend, operator, calls)
+    finally:
+        setup.container_remove(CONTAINER)
+        for operator in operators.values():
+            operator.close()
+
+
+if __name__ == "__main__":
+    main()
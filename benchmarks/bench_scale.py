@@ -0,0 +1,174 @@
+"""
+Times containup over synthetic stacks of growing size, without docker.
+
+Scenarios, for each stack size:
+- check: audit inspectors and the check report
+- up --dry-run: CommandUp without changes, and its report
+- down --dry-run: CommandDown with every container existing, and its report
+- up: CommandUp against an operator that sleeps `--latency` ms per docker call
+
+Prints one row per size, times in milliseconds (best of `--repeat` runs), to
+compare across versions.
+
+    python -m benchmarks.bench_scale [--sizes 10,100,1000,5000] [--latency 1]
+"""
+
+import argparse
+import time
+from typing import Callable, Optional
+
+from benchmarks.synthetic_stack import synthetic_stack
+from containup import Config, Service
+from containup.business.audit.audit_registry import AuditRegistry
+from containup.business.commands.command_down import CommandDown
+from containup.business.commands.command_up import CommandUp
+from containup.business.commands.container_health_status import ContainerHealthStatus
+from containup.business.commands.container_operator import Cancellation
+from containup.business.execution_listener import ExecutionListenerStd
+from containup.business.live_state.stack_state import StackState
+from containup.business.plugins.plugin_builtins import PluginBuiltins
+from containup.business.plugins.plugin_registry import PluginRegistry, register
+from containup.business.reports.report_generator import ReportGenerator
+from containup.containup_cli import containup_cli_args
+from containup.infra.dryrun.dryrun_operator import DryRunOperator
+from containup.infra.user_interactions_cli import UserInteractionsCLI
+from containup.stack.stack import Stack
+
+SCENARIOS = ["check", "up --dry-run", "down --dry-run", "up"]
+
+
+class LatencyOperator(DryRunOperator):
+    """DryRunOperator where each write or wait takes `latency` seconds"""
+
+    def __init__(self, listener: ExecutionListenerStd, latency: float):
+        super().__init__(listener)
+        self._latency = latency
+
+    def image_pull(self, image: str, cancellation: Optional[Cancellation] = None):
+        time.sleep(self._latency)
+
+    def container_run(self, stack_name: str, service: Service):
+        time.sleep(self._latency)
+        super().container_run(stack_name, service)
+
+    def container_remove(self, container_name: str):
+        time.sleep(self._latency)
+        self._containers.pop(container_name, None)
+
+    def container_wait_healthy(
+        self, stack_name: str, container_name: str, timeout: float
+    ) -> ContainerHealthStatus:
+        time.sleep(self._latency)
+        return ContainerHealthStatus("running", "healthy")
+
+
+def report(stack: Stack, config: Config, listener: ExecutionListenerStd) -> str:
+    return ReportGenerator().generate_report(
+        stack=stack,
+        config=config,
+        listener=listener,
+        alerts=AuditRegistry(PluginRegistry()).inspect(stack),
+        stack_state=StackState(),
+        live_operations=False,
+    )
+
+
+def run_check(stack: Stack, args: argparse.Namespace) -> None:
+    report(stack, containup_cli_args("bench", ["check"]), ExecutionListenerStd())
+
+
+def run_up_dry_run(stack: Stack, args: argparse.Namespace) -> None:
+    listener = ExecutionListenerStd()
+    up(stack, DryRunOperator(listener), listener, StackState(), args, dry_run=True)
+    report(stack, containup_cli_args("bench", ["up", "--dry-run"]), listener)
+
+
+def run_down_dry_run(stack: Stack, args: argparse.Namespace) -> None:
+    listener = ExecutionListenerStd()
+    state = StackState()
+    for service in stack.services:
+        state.set_container_state(service.container_name_safe(), "exists")
+    CommandDown(
+        stack=stack,
+        operator=DryRunOperator(listener),
+        system_interactions=UserInteractionsCLI(),
+        auditor=listener,
+        dry_run=True,
+        live_check=False,
+        stack_state=state,
+        parallel=args.parallel,
+    ).down()
+    report(stack, containup_cli_args("bench", ["down", "--dry-run"]), listener)
+
+
+def run_up(stack: Stack, args: argparse.Namespace) -> None:
+    listener = ExecutionListenerStd()
+    operator = LatencyOperator(listener, args.latency / 1000)
+    up(stack, operator, listener, StackState(), args, dry_run=False)
+
+
+def up(
+    stack: Stack,
+    operator: DryRunOperator,
+    listener: ExecutionListenerStd,
+    state: StackState,
+    args: argparse.Namespace,
+    dry_run: bool,
+) -> None:
+    CommandUp(
+        stack=stack,
+        operator=operator,
+        system_interactions=UserInteractionsCLI(),
+        auditor=listener,
+        dry_run=dry_run,
+        live_check=False,
+        stack_state=state,
+        parallel=args.parallel,
+    ).up()
+
+
+RUNNERS: dict[str, Callable[[Stack, argparse.Namespace], None]] = {
+    "check": run_check,
+    "up --dry-run": run_up_dry_run,
+    "down --dry-run": run_down_dry_run,
+    "up": run_up,
+}
+
+
+def best_of(repeat: int, call: Callable[[], None]) -> float:
+    timings: list[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="10,100,1000,5000")
+    parser.add_argument("--depth", type=int, default=8, help="dependency levels")
+    parser.add_argument("--fan-out", type=int, default=3, help="max dependencies")
+    parser.add_argument("--latency", type=float, default=1.0, help="ms per call")
+    parser.add_argument("--parallel", type=int, default=16)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    args = parser.parse_args()
+
+    register(PluginBuiltins)
+    scenarios = args.scenarios.split(",")
+    print(f"depth {args.depth}, fan-out {args.fan_out}, latency {args.latency} ms,")
+    print(f"parallel {args.parallel}, best of {args.repeat}, times in ms")
+    print(f"{'services':>8} " + " ".join(f"{s:>15}" for s in scenarios))
+    for size in (int(s) for s in args.sizes.split(",")):
+        stack = synthetic_stack(size, args.depth, args.fan_out, args.seed)
+        row = [
+            best_of(args.repeat, lambda: RUNNERS[scenario](stack, args)) * 1000
+            for scenario in scenarios
+        ]
+        print(f"{size:>8} " + " ".join(f"{ms:>15.1f}" for ms in row), flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Times secrets: reveal() throughput, and stacks with thousands of secrets going
+through what reads them (environment given to docker, configuration hash,
+audit fingerprint), without docker.
+
+    python -m benchmarks.bench_secrets [--reveals 100000] [--sizes 100,1000,5000]
+"""
+
+import argparse
+import time
+from typing import Callable, Union
+
+from benchmarks.synthetic_stack import synthetic_stack
+from containup import SecretValue, Service, secret
+from containup.business.audit.audit_cache import service_fingerprint
+from containup.business.commands.service_config_hash import service_config_hash
+
+
+def docker_environment(service: Service) -> dict[str, str]:
+    """Environment as DockerOperator.container_run gives it to docker"""
+    return {
+        key: value.reveal() if isinstance(value, SecretValue) else value
+        for key, value in service.environment.items()
+    }
+
+
+def with_secrets(service: Service, count: int) -> Service:
+    environment: dict[str, Union[str, SecretValue]] = dict(service.environment)
+    for i in range(count):
+        environment[f"SECRET_{i}"] = secret(f"secret_{i}", f"value-{i}")
+    service.environment = environment
+    return service
+
+
+def best_of(repeat: int, run: Callable[[], None]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--reveals", type=int, default=100_000)
+    parser.add_argument("--sizes", default="100,1000,5000", help="services")
+    parser.add_argument("--per-service", type=int, default=4, help="more secrets")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    value = secret("bench", "value")
+
+    def reveal_all() -> None:
+        for _ in range(args.reveals):
+            value.reveal()
+
+    seconds = best_of(args.repeat, reveal_all)
+    print(
+        f"reveal: {args.reveals / seconds:,.0f}/s "
+        f"({seconds / args.reveals * 1e6:.2f} us per call)"
+    )
+
+    print(f"best of {args.repeat}, times in ms")
+    print(
+        f"{'services':>8} {'secrets':>8} {'environment':>12} {'config hash':>12} {'fingerprint':>12}"
+    )
+    for size in [int(s) for s in args.sizes.split(",")]:
+        stack = synthetic_stack(size)
+        services = [with_secrets(s, args.per_service) for s in stack.services]
+        secrets = sum(
+            isinstance(v, SecretValue) for s in services for v in s.environment.values()
+        )
+
+        def environments() -> None:
+            for service in services:
+                docker_environment(service)
+
+        def config_hashes() -> None:
+            for service in services:
+                service_config_hash(service, None)
+
+        def fingerprints() -> None:
+            for service in services:
+                service_fingerprint(service)
+
+        row = [
+            best_of(args.repeat, run) * 1000
+            for run in [environments, config_hashes, fingerprints]
+        ]
+        print(
+            f"{size:>8} {secrets:>8} " + " ".join(f"{ms:>12.1f}" for ms in row),
+            flush=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Times containup startup, each in a new interpreter as a pre-commit hook runs it:
+importing containup, then `check`, `up --dry-run` and `graph` on a synthetic
+stack. Importing the docker SDK alone is timed as the reference of what offline
+commands no longer pay.
+
+    python -m benchmarks.bench_startup [--services 50] [--repeat 10]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+STACK = """
+import sys
+from benchmarks.synthetic_stack import synthetic_stack
+from containup.containup_cli import containup_cli_args
+from containup.infra.runner.runner import StackRunner
+
+stack = synthetic_stack(int(sys.argv[1]))
+StackRunner(stack, containup_cli_args("bench", sys.argv[2:])).run()
+"""
+
+RUNS: list[tuple[str, list[str]]] = [
+    ("python", ["-c", "pass"]),
+    ("import docker", ["-c", "import docker"]),
+    ("import containup", ["-c", "import containup"]),
+    ("check", ["-c", STACK, "{services}", "check"]),
+    ("up --dry-run", ["-c", STACK, "{services}", "up", "--dry-run"]),
+    ("graph", ["-c", STACK, "{services}", "graph"]),
+]
+
+
+def best_of(repeat: int, command: list[str]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(
+            command,
+            check=True,
+            stdout=subprocess.DEVNULL,
+            # never reaches a daemon: offline commands shall not connect
+            env={**os.environ, "DOCKER_HOST": "unix:///nonexistent.sock"},
+        )
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--services", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"best of {args.repeat}, {args.services} services, times in ms")
+    for name, arguments in RUNS:
+        command = [sys.executable] + [
+            a.replace("{services}", str(args.services)) for a in arguments
+        ]
+        seconds = best_of(args.repeat, command)
+        print(f"{name:>16} {seconds * 1000:>8.1f}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Times the dependency graph functions over generated service lists, up to 100k
+services, to check they scale linearly.
+
+Shapes, for each size:
+- chain: each service depends on the previous one (one service per level)
+- layered: `--depth` levels, each service depends on 1 to `--fan-out` services
+  of the previous level
+- cycles: layered, with one cycle added every 100 services (sort fails and
+  reports all of them)
+
+Prints, per shape and size, the best of `--repeat` runs of the sort, the
+level grouping and the cycle search, in milliseconds and in microseconds per
+service (flat when linear).
+
+    python -m benchmarks.bench_toposort [--sizes 1000,10000,100000]
+"""
+
+import argparse
+import random
+import time
+from typing import Callable
+
+from containup import Service
+from containup.stack.stack_graph import (
+    ServiceCycleException,
+    services_cycles,
+    services_topological_levels,
+    services_topological_sort,
+)
+
+SHAPES = ["chain", "layered", "cycles"]
+
+
+def chain(size: int, args: argparse.Namespace) -> list[Service]:
+    services = [Service("s0", "dummy")]
+    services += [
+        Service(f"s{i}", "dummy", depends_on=[f"s{i - 1}"]) for i in range(1, size)
+    ]
+    return services[::-1]
+
+
+def layered(size: int, args: argparse.Namespace) -> list[Service]:
+    rnd = random.Random(args.seed)
+    per_level = max(size // args.depth, 1)
+    services: list[Service] = []
+    for i in range(size):
+        level = i // per_level
+        previous = (
+            range((level - 1) * per_level, level * per_level) if level else range(0)
+        )
+        depends_on = (
+            [f"s{rnd.choice(previous)}" for _ in range(rnd.randint(1, args.fan_out))]
+            if previous
+            else []
+        )
+        services.append(Service(f"s{i}", "dummy", depends_on=sorted(set(depends_on))))
+    return services
+
+
+def with_cycles(size: int, args: argparse.Namespace) -> list[Service]:
+    services = layered(size, args)
+    for i in range(0, size - 1, 100):
+        services[i].depends_on.append(services[i + 1].name)
+        services[i + 1].depends_on.append(services[i].name)
+    return services
+
+
+GENERATORS: dict[str, Callable[[int, argparse.Namespace], list[Service]]] = {
+    "chain": chain,
+    "layered": layered,
+    "cycles": with_cycles,
+}
+
+
+def sort(services: list[Service]) -> None:
+    try:
+        services_topological_sort(services)
+    except ServiceCycleException:
+        pass
+
+
+def levels(services: list[Service]) -> None:
+    try:
+        services_topological_levels(services)
+    except ServiceCycleException:
+        pass
+
+
+def cycles(services: list[Service]) -> None:
+    services_cycles(services)
+
+
+OPERATIONS: dict[str, Callable[[list[Service]], None]] = {
+    "sort": sort,
+    "levels": levels,
+    "cycles": cycles,
+}
+
+
+def best_of(repeat: int, run: Callable[[], None]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--depth", type=int, default=50, help="levels of layered")
+    parser.add_argument("--fan-out", type=int, default=3, help="max dependencies")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--shapes", default=",".join(SHAPES))
+    args = parser.parse_args()
+    sizes = [int(s) for s in args.sizes.split(",")]
+    shapes = args.shapes.split(",")
+
+    print(f"best of {args.repeat}, ms (us per service)")
+    print(f"{'shape':>8} {'services':>8} " + " ".join(f"{o:>18}" for o in OPERATIONS))
+    for shape in shapes:
+        for size in sizes:
+            services = GENERATORS[shape](size, args)
+            row: list[str] = []
+            for operation in OPERATIONS.values():
+
+                def run() -> None:
+                    operation(services)
+
+                seconds = best_of(args.repeat, run)
+                row.append(f"{seconds * 1000:>9.1f} ({seconds / size * 1e6:>5.2f})")
+            print(
+                f"{shape:>8} {size:>8} " + " ".join(f"{r:>18}" for r in row), flush=True
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Synthetic stacks for benchmarks: many services, random depends_on DAGs, mounts,
+environment variables and secrets.
+"""
+
+import random
+
+from containup import (
+    BindMount,
+    CmdHealthcheck,
+    Network,
+    Service,
+    Stack,
+    TmpfsMount,
+    Volume,
+    VolumeMount,
+    port,
+    secret,
+)
+from containup.stack.service_mounts import ServiceMounts
+
+
+def synthetic_stack(
+    services: int, depth: int = 8, fan_out: int = 3, seed: int = 0
+) -> Stack:
+    """
+    Builds a stack of `services` services spread over `depth` layers.
+
+    Each service outside the first layer depends on 1 to `fan_out` services of
+    previous layers, so the graph is a DAG of at most `depth` levels. One
+    service out of two has a healthcheck, one out of four a named volume, one out
+    of eight a bind mount and a published port. Every service has a few
+    environment variables, one of them a secret. The same seed gives the same
+    stack.
+    """
+    rnd = random.Random(seed)
+    stack = Stack(f"synthetic_{services}")
+    stack.add(Network("synthetic_net"))
+    layers: list[list[str]] = [[] for _ in range(max(depth, 1))]
+    for i in range(services):
+        name = f"svc_{i:05d}"
+        layer = 0 if i < len(layers) else rnd.randrange(len(layers))
+        candidates = [dep for previous in layers[:layer] for dep in previous]
+        depends_on = (
+            rnd.sample(candidates, min(len(candidates), rnd.randint(1, fan_out)))
+            if candidates
+            else []
+        )
+        layers[layer].append(name)
+
+        volumes: ServiceMounts = [TmpfsMount("/tmp")]
+        if i % 4 == 0:
+            stack.add(Volume(f"{name}_data"))
+            volumes.append(VolumeMount(f"{name}_data", "/data"))
+        if i % 8 == 0:
+            volumes.append(BindMount(f"/srv/synthetic/{name}", "/config", True))
+        stack.add(
+            Service(
+                name=name,
+                image=f"registry.example.com/synthetic/app{i % 20}:1.{i % 3}",
+                network="synthetic_net",
+                ports=[port(8080, 20000 + i)] if i % 8 == 0 else [],
+                environment={
+                    "SERVICE_NAME": name,
+                    "LOG_LEVEL": rnd.choice(["debug", "info", "warn"]),
+                    "UPSTREAMS": ",".join(depends_on),
+                    "API_KEY": secret(f"{name}_api_key", f"key-{rnd.random()}"),
+                },
+                volumes=volumes,
+                depends_on=depends_on,
+                healthcheck=CmdHealthcheck(["true"]) if i % 2 == 0 else None,
+            )
+        )
+    return stack
@@ -3,6 +3,7 @@ from containup.stack.stack import (
     Service as Service,
 )
 from containup.stack.network import Network as Network
+from containup.stack.service_group import ServiceGroup as ServiceGroup
 from containup.stack.volume import Volume as Volume
 from containup.stack.service_mounts import (
     VolumeMount as VolumeMount,
@@ -25,9 +26,20 @@ from containup.stack.service_healthcheck import (
     HealthcheckOptions as HealthcheckOptions,
 )
 from containup.containup_cli import containup_cli as containup_cli, Config as Config
-from containup.containup_run import containup_run as containup_run
+from containup.containup_run import (
+    containup_run as containup_run,
+    async_containup_run as async_containup_run,
+)
 
 from containup.utils.secret_value import SecretValue as SecretValue, secret as secret
+from containup.utils.secret_providers import (
+    SecretProviderException as SecretProviderException,
+    secret_cache_ttl as secret_cache_ttl,
+    secret_from as secret_from,
+    secret_from_command as secret_from_command,
+    secret_from_env as secret_from_env,
+    secret_from_file as secret_from_file,
+)
 
 # Updated by bumpver
 __version__ = "v0.1.9"
@@ -1,8 +1,9 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from enum import Enum
+from typing import Optional, Union
 
-from containup.stack.stack import Stack
+from containup.stack.stack import Service, Stack
 
 
 class AuditAlertType(str, Enum):
@@ -18,11 +19,22 @@ class AuditLocations(str, Enum):
     MOUNT = "mount"
     IMAGE = "image"
     DEPENDS_ON = "depends_on"
+    PORTS = "ports"
+
+
+AuditLocationKey = tuple[str, ...]
 
 
 @dataclass
 class AuditAlertLocation:
-    location: list[str]
+    location: list[Union[AuditLocations, str]]
+
+    def key(self) -> AuditLocationKey:
+        """Hashable form of the location, to index alerts"""
+        return tuple(
+            part.value if isinstance(part, AuditLocations) else part
+            for part in self.location
+        )
 
     @staticmethod
     def service(service_name: str):
@@ -43,6 +55,9 @@ class AuditAlertLocation:
     def depends_on(self, id: str):
         return AuditAlertLocation(self.location + [AuditLocations.DEPENDS_ON, id])
 
+    def ports(self):
+        return AuditAlertLocation(self.location + [AuditLocations.PORTS])
+
 
 @dataclass
 class AuditAlert:
@@ -52,12 +67,58 @@ class AuditAlert:
 
 
 class AuditInspector(ABC):
+    """
+    Checks a stack and reports alerts.
+
+    Results can be cached (`check --audit-cache`) when the inspector tells what
+    they depend on with `cache_key()`. Change `version` when the rules change,
+    so results cached by a previous version are not used.
+    """
 
     @property
     @abstractmethod
     def code(self) -> str:
         pass
 
+    @property
+    def version(self) -> str:
+        return "1"
+
     @abstractmethod
     def evaluate(self, stack: Stack) -> list[AuditAlert]:
         pass
+
+    def cache_key(self, stack: Stack, fingerprints: dict[str, str]) -> Optional[str]:
+        """
+        Key of everything the alerts depend on, None if they can't be cached (the
+        default): alerts cached with the same key are used instead of evaluating.
+
+        Arguments:
+            fingerprints: fingerprint of each service, by name
+        """
+        return None
+
+
+class AuditServiceInspector(AuditInspector):
+    """
+    Inspector checking services one by one: alerts on a service only depend on
+    that service (or on what `service_cache_key()` tells), so only changed
+    services are evaluated again when results are cached.
+    """
+
+    @abstractmethod
+    def evaluate_service(self, stack: Stack, service: Service) -> list[AuditAlert]:
+        pass
+
+    def evaluate(self, stack: Stack) -> list[AuditAlert]:
+        return [
+            alert
+            for service in stack.services
+            for alert in self.evaluate_service(stack, service)
+        ]
+
+    def service_cache_key(
+        self, stack: Stack, service: Service, fingerprints: dict[str, str]
+    ) -> str:
+        """Key of everything the alerts on the service depend on"""
+        return fingerprints[service.name]
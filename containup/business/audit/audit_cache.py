@@ -0,0 +1,195 @@
+import hashlib
+import json
+import threading
+from dataclasses import asdict, fields, is_dataclass
+from typing import Any, Optional, cast
+
+from containup.business.audit.audit_alert import (
+    AuditAlert,
+    AuditAlertLocation,
+    AuditAlertType,
+    AuditLocationKey,
+    AuditLocations,
+)
+from containup.stack.service import Service
+from containup.stack.service_mounts import ServiceMount
+from containup.stack.stack import Stack
+from containup.utils.secret_value import SecretValue
+
+AUDIT_CACHE_FORMAT = 1
+"""Version of the cache document. Documents of another version are ignored."""
+
+_ALERT_TYPES = {t.value for t in AuditAlertType}
+
+
+def service_fingerprint(service: Service) -> str:
+    """
+    Hash of the whole definition of a service, as audit inspectors see it.
+
+    Generated mount ids don't take part. Secrets only take part with their label:
+    their value never reaches the fingerprint, nor the cache.
+    """
+    document: dict[str, Any] = {
+        f.name: getattr(service, f.name) for f in fields(service) if f.init
+    }
+    document["environment"] = {
+        key: {"secret": value.label()} if isinstance(value, SecretValue) else value
+        for key, value in service.environment.items()
+    }
+    document["volumes"] = [_mount(mount) for mount in service.volumes]
+    document["mounts"] = [_mount(mount) for mount in service.mounts]
+    return combine_keys([json.dumps(document, sort_keys=True, default=_json_default)])
+
+
+def stack_fingerprints(stack: Stack) -> dict[str, str]:
+    """Fingerprint of each service of the stack, by name"""
+    return {service.name: service_fingerprint(service) for service in stack.services}
+
+
+def combine_keys(parts: list[str]) -> str:
+    """One key standing for all the parts, in this order"""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class AuditCache:
+    """
+    Alerts of previous audits, by inspector code, inspector version and cache
+    key (see `AuditInspector.cache_key()`).
+
+    Stored as a JSON document. Mount ids, generated at each run, are stored as
+    the position of the mount in the service, so cached alerts point to the
+    mounts of the current run. Only entries used by the last audit are kept.
+    Safe to use from several threads.
+    """
+
+    def __init__(self, document: Optional[dict[str, Any]] = None):
+        entries: Any = {}
+        if document and document.get("format") == AUDIT_CACHE_FORMAT:
+            entries = document.get("entries", {})
+        self._previous: dict[str, Any] = entries if isinstance(entries, dict) else {}
+        self._used: dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._put = False
+
+    def get(
+        self, code: str, version: str, key: str, stack: Stack
+    ) -> Optional[list[AuditAlert]]:
+        """Alerts cached for this key, None if there are none"""
+        entry_key = _entry_key(code, version, key)
+        with self._lock:
+            entry = self._previous.get(entry_key)
+        alerts = _decode_alerts(entry, stack)
+        if alerts is None:
+            return None
+        with self._lock:
+            self._used[entry_key] = entry
+        return alerts
+
+    def put(
+        self,
+        code: str,
+        version: str,
+        key: str,
+        alerts: list[AuditAlert],
+        stack: Stack,
+    ) -> None:
+        """Caches alerts, unless they point to something that can't be stored"""
+        entry = _encode_alerts(alerts, stack)
+        if entry is None:
+            return
+        with self._lock:
+            self._used[_entry_key(code, version, key)] = entry
+            self._put = True
+
+    @property
+    def changed(self) -> bool:
+        """True when the document differs from the one loaded"""
+        with self._lock:
+            return self._put or self._used.keys() != self._previous.keys()
+
+    def document(self) -> dict[str, Any]:
+        """Document to store, with the entries used since loaded"""
+        with self._lock:
+            return {"format": AUDIT_CACHE_FORMAT, "entries": dict(self._used)}
+
+
+def _entry_key(code: str, version: str, key: str) -> str:
+    return f"{code}:{version}:{key}"
+
+
+def _encode_alerts(alerts: list[AuditAlert], stack: Stack) -> Optional[list[Any]]:
+    entry: list[Any] = []
+    for alert in alerts:
+        location = _encode_location(alert.location.key(), stack)
+        if location is None:
+            return None
+        entry.append([alert.severity.value, alert.message, location])
+    return entry
+
+
+def _decode_alerts(entry: Any, stack: Stack) -> Optional[list[AuditAlert]]:
+    if not isinstance(entry, list):
+        return None
+    alerts: list[AuditAlert] = []
+    for item in cast(list[Any], entry):
+        if not isinstance(item, list) or len(cast(list[Any], item)) != 3:
+            return None
+        severity, message, location = cast(list[Any], item)
+        if severity not in _ALERT_TYPES or not isinstance(location, list):
+            return None
+        decoded = _decode_location(cast(list[Any], location), stack)
+        if decoded is None:
+            return None
+        alerts.append(AuditAlert(AuditAlertType(severity), str(message), decoded))
+    return alerts
+
+
+def _encode_location(key: AuditLocationKey, stack: Stack) -> Optional[list[str]]:
+    mounts = _mounts_of_location(list(key), stack)
+    if mounts is None:
+        return list(key)
+    position = next((i for i, m in enumerate(mounts) if m.id == key[3]), None)
+    if position is None:
+        return None
+    return [*key[:3], f"#{position}", *key[4:]]
+
+
+def _decode_location(location: list[Any], stack: Stack) -> Optional[AuditAlertLocation]:
+    parts = [str(part) for part in location]
+    mounts = _mounts_of_location(parts, stack)
+    if mounts is None:
+        return AuditAlertLocation(list(parts))
+    position = parts[3][1:]
+    if not position.isdigit() or int(position) >= len(mounts):
+        return None
+    return AuditAlertLocation([*parts[:3], mounts[int(position)].id, *parts[4:]])
+
+
+def _mounts_of_location(parts: list[str], stack: Stack) -> Optional[list[ServiceMount]]:
+    """Mounts of the service, if the location is a mount of a service"""
+    if (
+        len(parts) < 4
+        or parts[0] != AuditLocations.SERVICE.value
+        or parts[2] != AuditLocations.MOUNT.value
+    ):
+        return None
+    service = stack.graph.get(parts[1])
+    return service.mounts_all() if service is not None else []
+
+
+def _mount(mount: ServiceMount) -> dict[str, Any]:
+    # _id is generated at each run, it doesn't describe the mount
+    fields = {k: v for k, v in vars(mount).items() if k != "_id"}
+    return {"type": mount.type(), **fields}
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, SecretValue):
+        return {"secret": value.label()}
+    if is_dataclass(value) and not isinstance(value, type):
+        return asdict(value)
+    return str(value)
@@ -1,22 +1,20 @@
-from containup import Stack
+from containup import Service, Stack
 from containup.business.audit.audit_alert import (
     AuditAlert,
     AuditAlertType,
     AuditAlertLocation,
-    AuditInspector,
+    AuditServiceInspector,
 )
 
 
-class AuditServiceImageInspector(AuditInspector):
+class AuditServiceImageInspector(AuditServiceInspector):
 
     @property
     def code(self) -> str:
-        return "secrets"
+        return "container_image"
 
-    def evaluate(self, stack: Stack) -> list[AuditAlert]:
-        return [
-            alert for s in stack.services for alert in image_tag_alert(s.name, s.image)
-        ]
+    def evaluate_service(self, stack: Stack, service: Service) -> list[AuditAlert]:
+        return image_tag_alert(service.name, service.image)
 
 
 def image_tag_alert(service_name: str, image: str) -> list[AuditAlert]:
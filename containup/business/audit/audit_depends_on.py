@@ -1,38 +1,46 @@
 from containup import NoneHealthcheck
 from containup.business.audit.audit_alert import (
-    AuditInspector,
+    AuditServiceInspector,
     AuditAlert,
     AuditAlertType,
     AuditAlertLocation,
 )
-from containup.stack.stack import Stack
+from containup.business.audit.audit_cache import combine_keys
+from containup.stack.stack import Service, Stack
 
 
-class AuditServiceDependsOnInspector(AuditInspector):
+class AuditServiceDependsOnInspector(AuditServiceInspector):
 
     @property
     def code(self) -> str:
-        return "secrets"
+        return "depends_on"
 
-    def evaluate(self, stack: Stack) -> list[AuditAlert]:
+    def evaluate_service(self, stack: Stack, service: Service) -> list[AuditAlert]:
         alerts: list[AuditAlert] = []
-        for service in stack.services:
-            if service.depends_on:
-                for dependency_name in service.depends_on:
-                    dependency = next(
-                        s for s in stack.services if s.name == dependency_name
+        for dependency_name in service.depends_on:
+            dependency = stack.graph.get(dependency_name)
+            if dependency is None:
+                # unknown dependencies are reported when sorting services
+                continue
+            if dependency.healthcheck is None or isinstance(
+                dependency.healthcheck, NoneHealthcheck
+            ):
+                alerts.append(
+                    AuditAlert(
+                        AuditAlertType.WARN,
+                        f"{dependency_name} has no healthcheck",
+                        AuditAlertLocation.service(service.name).depends_on(
+                            dependency_name
+                        ),
                     )
-                    if dependency.healthcheck is None or isinstance(
-                        dependency.healthcheck, NoneHealthcheck
-                    ):
-                        alerts.append(
-                            AuditAlert(
-                                AuditAlertType.WARN,
-                                f"{dependency_name} has no healthcheck",
-                                AuditAlertLocation.service(service.name).depends_on(
-                                    dependency_name
-                                ),
-                            )
-                        )
-
+                )
         return alerts
+
+    def service_cache_key(
+        self, stack: Stack, service: Service, fingerprints: dict[str, str]
+    ) -> str:
+        # alerts change with the healthchecks of the dependencies
+        return combine_keys(
+            [fingerprints[service.name]]
+            + [fingerprints.get(name, "") for name in service.depends_on]
+        )
@@ -1,20 +1,254 @@
-from containup.business.audit.audit_report import AuditResult
-from containup.business.audit.audit_alert import AuditAlert
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from functools import partial
+from typing import Callable, Optional
+
+from containup.business.audit.audit_report import AuditInspectorStats, AuditResult
+from containup.business.audit.audit_alert import (
+    AuditAlert,
+    AuditInspector,
+    AuditServiceInspector,
+)
+from containup.business.audit.audit_cache import AuditCache, stack_fingerprints
 from containup.business.plugins.plugin_registry import PluginRegistry
 from containup.stack.stack import Stack
 
+logger = logging.getLogger(__name__)
+
 
 class AuditRegistry:
-    """Maintains and query the list of audit inspectors."""
+    """
+    Maintains and query the list of audit inspectors.
+
+    Inspectors run at the same time, at most `workers` of them (all by
+    default). An inspector still running `timeout` seconds after it started (or
+    after the audit started, if it is still waiting for a worker) is given up:
+    its alerts are missing and its stats say it timed out. Its thread is left to
+    finish, as threads can't be stopped, but is a daemon thread: it doesn't keep
+    the process alive once containup is done.
 
-    def __init__(self, plugins: PluginRegistry):
+    With a cache, alerts are taken from it when the inspector's cache key is
+    unchanged: for service inspectors, only changed services are evaluated.
+    """
+
+    def __init__(
+        self,
+        plugins: PluginRegistry,
+        workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+        clock: Callable[[], float] = time.perf_counter,
+        cache: Optional[AuditCache] = None,
+    ):
         self._plugins = plugins
+        self._cache = cache
+        self._workers = workers
+        self._timeout = timeout
+        self._clock = clock
 
     def inspect(self, stack: Stack) -> AuditResult:
         """Runs the stack over all audit inspectors and generates an audit report."""
-        alerts: list[AuditAlert] = [
-            alert
-            for inspector in self._plugins.get_all_inspectors()
-            for alert in inspector.evaluate(stack)
+        runs = [
+            _InspectorRun(i, self._clock) for i in self._plugins.get_all_inspectors()
+        ]
+        if not runs:
+            return AuditResult([])
+        audit_start = self._clock()
+        fingerprints = stack_fingerprints(stack) if self._cache else {}
+        tasks: list[Callable[[], None]] = [
+            partial(run.evaluate, stack, self._cache, fingerprints) for run in runs
+        ]
+        futures = dict(
+            zip(
+                _run_on_daemon_threads(
+                    tasks, max(1, min(self._workers or len(runs), len(runs)))
+                ),
+                runs,
+            )
+        )
+        try:
+            pending = set(futures)
+            while pending:
+                done, pending = wait(
+                    pending,
+                    self._wait_timeout(runs, audit_start),
+                    return_when=FIRST_COMPLETED,
+                )
+                for future in done:
+                    # an inspector failing fails the audit, as when run one by one
+                    future.result()
+                pending = self._give_up_late(pending, futures, audit_start)
+        finally:
+            # inspectors still waiting for a worker never start
+            for future in futures:
+                future.cancel()
+
+        alerts: list[AuditAlert] = [alert for run in runs for alert in run.alerts]
+        return AuditResult(alerts, [run.stats() for run in runs])
+
+    def _wait_timeout(
+        self, runs: list["_InspectorRun"], audit_start: float
+    ) -> Optional[float]:
+        """Time until the next unfinished inspector times out"""
+        if self._timeout is None:
+            return None
+        now = self._clock()
+        ends = [
+            run.start_or(audit_start) + self._timeout - now
+            for run in runs
+            if run.ended is None
         ]
-        return AuditResult(alerts)
+        return max(0.0, min(ends, default=0.0))
+
+    def _give_up_late(
+        self,
+        pending: set[Future[None]],
+        futures: dict[Future[None], "_InspectorRun"],
+        audit_start: float,
+    ) -> set[Future[None]]:
+        if self._timeout is None:
+            return pending
+        now = self._clock()
+        still_pending: set[Future[None]] = set()
+        for future in pending:
+            run = futures[future]
+            late = now - run.start_or(audit_start) >= self._timeout
+            if late and run.give_up():
+                logger.warning(
+                    f"Audit inspector {run.inspector.code}: no result after {self._timeout}s, ignored."
+                )
+            else:
+                still_pending.add(future)
+        return still_pending
+
+
+def _run_on_daemon_threads(
+    tasks: list[Callable[[], None]], workers: int
+) -> list["Future[None]"]:
+    """
+    Runs tasks on `workers` daemon threads, in order. Unlike ThreadPoolExecutor,
+    whose threads are joined when the interpreter exits, a task that never ends
+    doesn't prevent the process from exiting. Cancelled futures are skipped.
+    """
+    futures: list[Future[None]] = [Future() for _ in tasks]
+    queue = deque(zip(futures, tasks))
+    lock = threading.Lock()
+
+    def work() -> None:
+        while True:
+            with lock:
+                if not queue:
+                    return
+                future, task = queue.popleft()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                task()
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(None)
+
+    for i in range(workers):
+        threading.Thread(target=work, name=f"containup-audit-{i}", daemon=True).start()
+    return futures
+
+
+class _InspectorRun:
+    """
+    One inspector evaluated on a stack, with its timing.
+
+    Once given up, the run publishes nothing: its alerts are dropped and it no
+    longer reads or writes the cache, which the runner saves after the audit.
+    Both sides check and set this under the run's lock.
+    """
+
+    def __init__(self, inspector: AuditInspector, clock: Callable[[], float]):
+        self.inspector = inspector
+        self.alerts: list[AuditAlert] = []
+        self.started: Optional[float] = None
+        self.ended: Optional[float] = None
+        self.timed_out = False
+        self.cached = 0
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._published = False
+
+    def evaluate(
+        self, stack: Stack, cache: Optional[AuditCache], fingerprints: dict[str, str]
+    ) -> None:
+        self.started = self._clock()
+        try:
+            alerts = self._evaluate(stack, cache, fingerprints)
+        finally:
+            self.ended = self._clock()
+        with self._lock:
+            if not self.timed_out:
+                self.alerts = alerts
+                self._published = True
+
+    def give_up(self) -> bool:
+        """Times the run out, unless its alerts are already published"""
+        with self._lock:
+            if self._published:
+                return False
+            self.timed_out = True
+            return True
+
+    def _evaluate(
+        self, stack: Stack, cache: Optional[AuditCache], fingerprints: dict[str, str]
+    ) -> list[AuditAlert]:
+        inspector = self.inspector
+        if cache is None:
+            return inspector.evaluate(stack)
+        if isinstance(inspector, AuditServiceInspector):
+            alerts: list[AuditAlert] = []
+            for service in stack.services:
+                key = inspector.service_cache_key(stack, service, fingerprints)
+                cached = self._cache_get(cache, key, stack)
+                if cached is None:
+                    cached = inspector.evaluate_service(stack, service)
+                    self._cache_put(cache, key, cached, stack)
+                else:
+                    self.cached += 1
+                alerts += cached
+            return alerts
+        key = inspector.cache_key(stack, fingerprints)
+        cached = self._cache_get(cache, key, stack) if key is not None else None
+        if cached is not None:
+            self.cached += 1
+            return cached
+        alerts = inspector.evaluate(stack)
+        if key is not None:
+            self._cache_put(cache, key, alerts, stack)
+        return alerts
+
+    def _cache_get(
+        self, cache: AuditCache, key: str, stack: Stack
+    ) -> Optional[list[AuditAlert]]:
+        # a hit marks the entry used, so late runs don't read either
+        with self._lock:
+            if self.timed_out:
+                return None
+            return cache.get(self.inspector.code, self.inspector.version, key, stack)
+
+    def _cache_put(
+        self, cache: AuditCache, key: str, alerts: list[AuditAlert], stack: Stack
+    ) -> None:
+        with self._lock:
+            if not self.timed_out:
+                cache.put(
+                    self.inspector.code, self.inspector.version, key, alerts, stack
+                )
+
+    def start_or(self, default: float) -> float:
+        return self.started if self.started is not None else default
+
+    def stats(self) -> AuditInspectorStats:
+        end = self._clock() if self.ended is None or self.timed_out else self.ended
+        seconds = end - self.started if self.started is not None else 0.0
+        return AuditInspectorStats(
+            self.inspector.code, seconds, len(self.alerts), self.timed_out, self.cached
+        )
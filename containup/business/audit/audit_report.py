@@ -1,4 +1,25 @@
-from containup.business.audit.audit_alert import AuditAlert, AuditAlertLocation
+from collections import Counter
+from dataclasses import dataclass
+from typing import Optional
+
+from containup.business.audit.audit_alert import (
+    AuditAlert,
+    AuditAlertLocation,
+    AuditAlertType,
+    AuditLocationKey,
+)
+
+
+@dataclass
+class AuditInspectorStats:
+    """What running one audit inspector cost"""
+
+    code: str
+    seconds: float
+    alerts: int
+    timed_out: bool = False
+    cached: int = 0
+    """Evaluations (services, or the whole stack) answered by the audit cache"""
 
 
 class AuditResult:
@@ -6,11 +27,38 @@ class AuditResult:
     Contains the result of stack auditing.
 
     Implemented as a wrapper around a list of :class:`AuditAlert` with helper methods to
-    filter and find relevant alerts.
+    filter and find relevant alerts. Alerts are indexed by location once, so
+    queries don't go through every alert.
     """
 
-    def __init__(self, alerts: list[AuditAlert]):
+    def __init__(
+        self,
+        alerts: list[AuditAlert],
+        stats: Optional[list[AuditInspectorStats]] = None,
+    ):
         self._alerts = alerts
+        self.stats: list[AuditInspectorStats] = stats or []
+        """Time spent and alerts found by each inspector"""
+        self._by_location: dict[AuditLocationKey, list[AuditAlert]] = {}
+        self._by_prefix: dict[AuditLocationKey, list[AuditAlert]] = {}
+        self._counts = Counter(alert.severity for alert in alerts)
+        for alert in alerts:
+            key = alert.location.key()
+            self._by_location.setdefault(key, []).append(alert)
+            for length in range(1, len(key) + 1):
+                self._by_prefix.setdefault(key[:length], []).append(alert)
 
     def query(self, location: AuditAlertLocation) -> list[AuditAlert]:
-        return [alert for alert in self._alerts if alert.location == location]
+        """Alerts at exactly this location"""
+        return list(self._by_location.get(location.key(), []))
+
+    def query_under(self, location: AuditAlertLocation) -> list[AuditAlert]:
+        """Alerts at this location or below (all alerts of a service, for example)"""
+        return list(self._by_prefix.get(location.key(), []))
+
+    def count(self, severity: AuditAlertType) -> int:
+        """Number of alerts with this severity"""
+        return self._counts[severity]
+
+    def __len__(self) -> int:
+        return len(self._alerts)
@@ -1,27 +1,26 @@
 from typing import Union
 
 from containup.business.audit.audit_alert import (
-    AuditInspector,
+    AuditServiceInspector,
     AuditAlert,
     AuditAlertType,
     AuditAlertLocation,
 )
-from containup.stack.stack import Stack
+from containup.stack.stack import Service, Stack
 from containup.utils.secret_value import SecretValue
 
 
-class AuditSecretsInspector(AuditInspector):
+class AuditSecretsInspector(AuditServiceInspector):
 
     @property
     def code(self) -> str:
         return "secrets"
 
-    def evaluate(self, stack: Stack) -> list[AuditAlert]:
+    def evaluate_service(self, stack: Stack, service: Service) -> list[AuditAlert]:
         return [
             alert
-            for s in stack.services
-            for k, v in s.environment.items()
-            for alert in secrets_alerts(s.name, k, v)
+            for k, v in service.environment.items()
+            for alert in secrets_alerts(service.name, k, v)
         ]
 
 
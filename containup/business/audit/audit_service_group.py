@@ -0,0 +1,55 @@
+from typing import Optional
+
+from containup.business.audit.audit_alert import (
+    AuditInspector,
+    AuditAlert,
+    AuditAlertType,
+    AuditAlertLocation,
+)
+from containup.business.audit.audit_cache import combine_keys
+from containup.stack.service_group import has_fixed_host_ports
+from containup.stack.stack import Stack
+
+
+class AuditServiceGroupInspector(AuditInspector):
+
+    @property
+    def code(self) -> str:
+        return "service_groups"
+
+    def evaluate(self, stack: Stack) -> list[AuditAlert]:
+        alerts: list[AuditAlert] = []
+        for group in stack.groups:
+            for service in group.services:
+                if not has_fixed_host_ports(service):
+                    continue
+                if group.max_unavailable == 0:
+                    alerts.append(
+                        AuditAlert(
+                            AuditAlertType.CRITICAL,
+                            f"group {group.name} has max_unavailable=0 but fixed host "
+                            f"ports can't surge: container goes down while replaced",
+                            AuditAlertLocation.service(service.name).ports(),
+                        )
+                    )
+                elif group.max_surge > 0:
+                    alerts.append(
+                        AuditAlert(
+                            AuditAlertType.WARN,
+                            f"fixed host ports can't surge, replaced in place "
+                            f"in group {group.name}",
+                            AuditAlertLocation.service(service.name).ports(),
+                        )
+                    )
+        return alerts
+
+    def cache_key(self, stack: Stack, fingerprints: dict[str, str]) -> Optional[str]:
+        # alerts change with the groups and the ports of their members
+        return combine_keys(
+            [
+                f"{g.name}\0{g.max_unavailable}\0{g.max_surge}\0{s.name}\0"
+                + fingerprints[s.name]
+                for g in stack.groups
+                for s in g.services
+            ]
+        )
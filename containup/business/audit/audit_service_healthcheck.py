@@ -1,5 +1,5 @@
 from containup.business.audit.audit_alert import (
-    AuditInspector,
+    AuditServiceInspector,
     AuditAlert,
     AuditAlertType,
     AuditAlertLocation,
@@ -8,14 +8,14 @@ from containup.stack.stack import Service
 from containup.stack.stack import Stack
 
 
-class AuditServiceHealthcheckInspector(AuditInspector):
+class AuditServiceHealthcheckInspector(AuditServiceInspector):
 
     @property
     def code(self) -> str:
         return "service_healthcheck"
 
-    def evaluate(self, stack: Stack) -> list[AuditAlert]:
-        return [alert for s in stack.services for alert in healthcheck_alerts(s)]
+    def evaluate_service(self, stack: Stack, service: Service) -> list[AuditAlert]:
+        return healthcheck_alerts(service)
 
 
 def healthcheck_alerts(service: Service) -> list[AuditAlert]:
@@ -1,34 +1,66 @@
-from pathlib import PurePosixPath
+from typing import Optional
 
 from containup.business.audit.audit_alert import (
     AuditInspector,
+    AuditServiceInspector,
     AuditAlert,
     AuditAlertType,
     AuditAlertLocation,
 )
+from containup.business.audit.audit_cache import combine_keys
 from containup.stack.service_mounts import ServiceMount, BindMount
 from containup.stack.stack import Stack, Service
+from containup.utils.path_trie import PathTrie
 
 
-class AuditServiceMountsInspector(AuditInspector):
+class AuditServiceMountsInspector(AuditServiceInspector):
 
     @property
     def code(self) -> str:
         return "service_mounts"
 
+    def evaluate_service(self, stack: Stack, service: Service) -> list[AuditAlert]:
+        all_mounts = service.mounts_all()
+        conflicts = mount_conflicts(all_mounts)
+        return [
+            alert
+            for mount in all_mounts
+            for alert in mount_alert(service, mount, conflicts[mount.id])
+        ]
+
+
+class AuditSharedBindSourcesInspector(AuditInspector):
+    """Host paths bind-mounted by several services, writable on one side"""
+
+    @property
+    def code(self) -> str:
+        return "shared_bind_sources"
+
     def evaluate(self, stack: Stack) -> list[AuditAlert]:
+        shared = shared_bind_sources(stack)
         return [
             alert
-            for s in stack.services
-            for mount in s.mounts_all()
-            for alert in mount_alert(s, mount, s.mounts_all())
+            for service in stack.services
+            for mount in service.mounts_all()
+            for alert in shared_source_alerts(service, mount, shared.get(mount.id, []))
         ]
 
+    def cache_key(self, stack: Stack, fingerprints: dict[str, str]) -> Optional[str]:
+        # alerts change with the bind mounts of every service, and only with them
+        return combine_keys(
+            [
+                f"{service.name}\0{mount.source}\0{mount.read_only}"
+                for service in stack.services
+                for mount in service.mounts_all()
+                if isinstance(mount, BindMount)
+            ]
+        )
+
 
 def mount_alert(
-    service: Service, mount: ServiceMount, all_mounts: list[ServiceMount]
+    service: Service, mount: ServiceMount, conflicts: list[ServiceMount]
 ) -> list[AuditAlert]:
-    """Returns alerts on mount"""
+    """Returns alerts on mount, conflicts being the other mounts on overlapping targets"""
 
     alerts: list[AuditAlert] = []
     if isinstance(mount, BindMount):
@@ -50,7 +82,6 @@ def mount_alert(
                 )
             )
 
-    conflicts = find_mount_conflicts(mount, all_mounts)
     for conflict in conflicts:
         alerts.append(
             AuditAlert(
@@ -81,29 +112,59 @@ def mount_alert(
     return alerts
 
 
-def is_relative_to(child: PurePosixPath, parent: PurePosixPath) -> bool:
-    try:
-        child.relative_to(parent)
-        return True
-    except ValueError:
-        return False
-
-
-def find_mount_conflicts(
-    mount: ServiceMount, all_mounts: list[ServiceMount]
-) -> list[ServiceMount]:
-    target_path = PurePosixPath(mount.target)
-    conflicts: list[ServiceMount] = []
-
-    for other in all_mounts:
-        if other.id == mount.id:
-            continue
-        other_path = PurePosixPath(other.target)
-        if target_path == other_path:
-            conflicts.append(other)
-        elif is_relative_to(target_path, other_path) or is_relative_to(
-            other_path, target_path
-        ):
-            conflicts.append(other)
-
-    return conflicts
+def shared_source_alerts(
+    service: Service,
+    mount: ServiceMount,
+    shared: list[tuple[Service, BindMount]],
+) -> list[AuditAlert]:
+    """Returns alerts on a bind mount whose host path other services mount too"""
+    return [
+        AuditAlert(
+            AuditAlertType.WARN,
+            f"host path shared with {other.name} ({other_mount.source}), "
+            + "writable on one side",
+            AuditAlertLocation.service(service.name).mount(mount.id),
+        )
+        for other, other_mount in shared
+    ]
+
+
+def mount_conflicts(all_mounts: list[ServiceMount]) -> dict[str, list[ServiceMount]]:
+    """
+    For each mount id, the other mounts whose target is the same, inside it or
+    contains it. One pass over the mounts, through a trie of their targets.
+    """
+    targets = PathTrie[ServiceMount]()
+    for mount in all_mounts:
+        targets.add(mount.target, mount)
+    return {
+        mount.id: [o for o in targets.overlapping(mount.target) if o.id != mount.id]
+        for mount in all_mounts
+    }
+
+
+def shared_bind_sources(stack: Stack) -> dict[str, list[tuple[Service, BindMount]]]:
+    """
+    For each bind mount id, the bind mounts of other services on the same host
+    path, inside it or containing it, unless both are read-only.
+    """
+    binds = [
+        (service, mount)
+        for service in stack.services
+        for mount in service.mounts_all()
+        if isinstance(mount, BindMount)
+    ]
+    sources = PathTrie[tuple[Service, BindMount]]()
+    for service, mount in binds:
+        sources.add(mount.source, (service, mount))
+    shared: dict[str, list[tuple[Service, BindMount]]] = {}
+    for service, mount in binds:
+        others = [
+            (other, other_mount)
+            for other, other_mount in sources.overlapping(mount.source)
+            if other.name != service.name
+            and not (mount.read_only and other_mount.read_only)
+        ]
+        if others:
+            shared[mount.id] = others
+    return shared
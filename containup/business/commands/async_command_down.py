@@ -0,0 +1,108 @@
+import logging
+from typing import Optional
+
+from containup.business.commands.async_container_operator import (
+    AsyncContainerOperator,
+)
+from containup.business.commands.command_down import (
+    report_down_result,
+    reverse_dependencies,
+)
+from containup.business.commands.container_operator import (
+    ContainerNotFoundException,
+    ContainerOperatorException,
+)
+from containup.business.commands.rolling_gate import replaced_name
+from containup.business.commands.dag_scheduler import async_run_on_services
+from containup.business.commands.user_interactions import UserInteractions
+from containup.business.execution_listener import (
+    ExecutionEvt,
+    ExecutionEvtContainerRemoved,
+    ExecutionListener,
+)
+from containup.business.live_state.stack_state import StackState
+from containup.stack.service import Service
+from containup.stack.stack import Stack
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncCommandDown:
+    """
+    Puts the stack down, on an asyncio event loop.
+
+    Same behavior as CommandDown: reverse dependency order, independent removals
+    at the same time, errors collected for every service. Failures raise
+    ContainerOperatorException instead of exiting the process.
+
+    Args:
+        dry_run (bool): we don't do any changes to the system
+        live_check (bool): in dry run, we try to check if real things exists
+        parallel (int): maximum number of containers removed at the same time
+    """
+
+    def __init__(
+        self,
+        stack: Stack,
+        operator: AsyncContainerOperator,
+        auditor: ExecutionListener,
+        dry_run: bool,
+        live_check: bool,
+        stack_state: StackState,
+        parallel: int = 1,
+        system_interactions: Optional[UserInteractions] = None,
+    ):
+        self.stack = stack
+        self.operator = operator
+        self._system_interactions = system_interactions
+        self._system_write = not dry_run
+        self._auditor = auditor
+        self._stack_state = stack_state
+        self._parallel = parallel
+
+    async def down(self, filter_services: Optional[list[str]] = None) -> None:
+        services = self.stack.get_services_sorted(filter_services)[::-1]
+        result = await async_run_on_services(
+            services,
+            reverse_dependencies(self.stack.graph, services),
+            self._container_remove,
+            self._auditor,
+            self._parallel,
+            stop_on_error=False,
+        )
+        report_down_result(services, result)
+        if result.errors:
+            # raised, not exited: other coroutines of the event loop keep running
+            raise ContainerOperatorException(
+                "Command down failed, not removed: "
+                + ", ".join(s.name for s in services if s.name in result.errors)
+            )
+
+    async def _container_remove(
+        self, service: Service, events: list[ExecutionEvt]
+    ) -> None:
+        container_name = service.container_name_safe()
+        if self._system_write and self.stack.group_of(service.name) is not None:
+            # old container of an interrupted rolling replacement, if any
+            try:
+                await self.operator.container_remove(replaced_name(container_name))
+                events.append(
+                    ExecutionEvtContainerRemoved(replaced_name(container_name))
+                )
+            except ContainerNotFoundException:
+                pass
+        container_state = self._stack_state.get_container_state(container_name)
+        if container_state == "unknown" or container_state == "exists":
+            if self._system_write:
+                logger.info(
+                    f"Remove container {container_name}: container exists, removing."
+                )
+                try:
+                    await self.operator.container_remove(container_name)
+                except ContainerNotFoundException:
+                    logger.info(f"Remove container {container_name}: already removed.")
+                    return
+                logger.info(f"Remove container {container_name}: container removed.")
+            events.append(ExecutionEvtContainerRemoved(container_name))
+        else:
+            logger.info(f"Remove container {container_name}: container doesn't exist.")
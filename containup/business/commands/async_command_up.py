@@ -0,0 +1,204 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional
+
+from containup.business.commands.async_container_operator import (
+    AsyncContainerOperator,
+)
+from containup.business.commands.container_operator import (
+    ContainerNotFoundException,
+    ContainerOperatorException,
+)
+from containup.business.commands.dag_scheduler import async_run_on_services
+from containup.business.commands.image_pulls import async_pull_all
+from containup.business.commands.rolling_gate import AsyncRollingGate, replaced_name
+from containup.business.commands.up_plan import (
+    UpPlan,
+    check_healthy,
+    resolve_service_secrets,
+)
+from containup.business.commands.user_interactions import UserInteractions
+from containup.business.execution_listener import (
+    ExecutionEvt,
+    ExecutionEvtContainerRemoved,
+    ExecutionListener,
+)
+from containup.business.live_state.stack_state import StackState
+from containup.stack.service import Service
+from containup.stack.service_group import ServiceGroup, has_fixed_host_ports
+from containup.stack.stack import Stack
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncCommandUp:
+    """
+    Puts the stack up, on an asyncio event loop.
+
+    Same behavior as CommandUp, from the same :class:`UpPlan`. Pulls, starts and
+    health waits are coroutines, so waiting holds no thread and the whole command
+    can be cancelled. Failures raise ContainerOperatorException instead of exiting
+    the process.
+
+    Args:
+        dry_run (bool): we don't do any changes to the system
+        live_check (bool): in dry run, we try to check if real things exists
+        parallel (int): maximum number of services started at the same time.
+        pull_per_registry (int): maximum number of images pulled at the same time
+            from one registry.
+    """
+
+    def __init__(
+        self,
+        stack: Stack,
+        operator: AsyncContainerOperator,
+        system_interactions: UserInteractions,
+        auditor: ExecutionListener,
+        dry_run: bool,
+        live_check: bool,
+        stack_state: StackState,
+        parallel: int = 1,
+        pull_per_registry: int = 4,
+    ):
+        self.stack = stack
+        self.operator = operator
+        self._system_interactions = system_interactions
+        self._auditor = auditor
+        self._plan = UpPlan(stack, stack_state, auditor, dry_run, live_check)
+        self._parallel = parallel
+        self._pull_per_registry = pull_per_registry
+        self._gates: dict[str, AsyncRollingGate] = {}
+
+    async def up(self, filter_services: Optional[list[str]] = None) -> None:
+        # conditions are bound to the running loop, create them here
+        self._gates = {
+            group.name: AsyncRollingGate(group) for group in self.stack.groups
+        }
+        try:
+            for vol in self._plan.volumes_to_create():
+                await self.operator.volume_create(self.stack.name, vol)
+            for net in self._plan.networks_to_create():
+                await self.operator.network_create(self.stack.name, net)
+
+            services = self.stack.get_services_sorted(filter_services)
+            await async_pull_all(
+                self.operator,
+                self._plan.images_to_pull(services),
+                self._pull_per_registry,
+            )
+            if self._plan.system_read:
+                await asyncio.to_thread(resolve_service_secrets, services)
+            self._plan.decide(
+                services,
+                {
+                    image: await self.operator.image_id(image)
+                    for image in self._plan.images_to_identify(services)
+                },
+            )
+
+            await self._run_on_services(services, self._container_remove_existing, {})
+            await self._run_on_services(
+                services,
+                self._container_start,
+                {s.name: self.stack.graph.dependencies(s.name) for s in services},
+            )
+        except ContainerOperatorException as e:
+            # raised, not exited: other coroutines of the event loop keep running
+            logger.error(f"Command up failed: {e}")
+            raise
+
+    async def _run_on_services(
+        self,
+        services: list[Service],
+        action: Callable[[Service, list[ExecutionEvt]], Awaitable[None]],
+        dependencies: dict[str, list[str]],
+    ) -> None:
+        """Runs action on services, concurrently when dependencies allow it."""
+        result = await async_run_on_services(
+            services, dependencies, action, self._auditor, self._parallel
+        )
+        names = [service.name for service in services]
+        for name in names:
+            if name in result.errors:
+                logger.error(f"Service {name}: {result.errors[name]}")
+        error = result.first_error(names)
+        if error is not None:
+            raise error
+
+    async def _container_remove_existing(
+        self, service: Service, events: list[ExecutionEvt]
+    ) -> None:
+        if self._plan.action(service) == "recreate":
+            container_name = service.container_name_safe()
+            if self._plan.system_write:
+                await self.operator.container_remove(container_name)
+            events.append(ExecutionEvtContainerRemoved(container_name))
+
+    async def _container_start(
+        self, service: Service, events: list[ExecutionEvt]
+    ) -> None:
+        container_name = service.container_name_safe()
+        group = self.stack.group_of(service.name)
+        action = self._plan.action(service)
+
+        if action == "rolling" and group is not None:
+            await self._rolling_replace(group, service, events)
+            return
+        if action != "unchanged" and self._plan.system_write:
+            logger.info(f"Run container {container_name} : start")
+            await self.operator.container_run(self.stack.name, service)
+        events.extend(self._plan.start_events(service))
+        await self._container_wait_healthy(service)
+        logger.info(f"Run container {container_name} : start done")
+
+    async def _rolling_replace(
+        self, group: ServiceGroup, service: Service, events: list[ExecutionEvt]
+    ) -> None:
+        """Same as CommandUp._rolling_replace"""
+        container_name = service.container_name_safe()
+        gate = self._gates[group.name]
+        async with gate.slot(not has_fixed_host_ports(service)) as surge:
+            if not surge:
+                logger.info(f"Group {group.name}: replace {container_name} in place")
+                if self._plan.system_write:
+                    await self.operator.container_remove(container_name)
+                    await self.operator.container_run(self.stack.name, service)
+                events.extend(self._plan.start_events(service))
+                await self._container_wait_healthy(service)
+                return
+
+            logger.info(f"Group {group.name}: start {container_name} next to old one")
+            if self._plan.system_write:
+                old_name = replaced_name(container_name)
+                try:
+                    await self.operator.container_remove(old_name)
+                except ContainerNotFoundException:
+                    pass
+                await self.operator.container_rename(container_name, old_name)
+                try:
+                    await self.operator.container_run(self.stack.name, service)
+                    await self._container_wait_healthy(service)
+                except BaseException:
+                    # also on interruption (Ctrl-C, cancelled task): never leave the
+                    # old container renamed next to an unverified new one
+                    logger.error(
+                        f"Group {group.name}: new {container_name} failed, restoring old one"
+                    )
+                    try:
+                        await self.operator.container_remove(container_name)
+                    except ContainerNotFoundException:
+                        pass
+                    await self.operator.container_rename(old_name, container_name)
+                    raise
+                await self.operator.container_remove(old_name)
+            events.extend(self._plan.start_events(service))
+
+    async def _container_wait_healthy(self, service: Service) -> None:
+        max_wait = self._plan.health_wait(service)
+        if max_wait is None:
+            return
+        container_name = service.container_name_safe()
+        state = await self.operator.container_wait_healthy(
+            self.stack.name, container_name, max_wait
+        )
+        check_healthy(container_name, state)
@@ -0,0 +1,247 @@
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from containup import Network, Service, Volume
+from containup.business.commands.container_health_status import ContainerHealthStatus
+from containup.business.commands.container_operator import (
+    Cancellation,
+    ContainerOperator,
+)
+from containup.business.commands.timed_operator import OperationTimer
+from containup.business.live_state.live_inventory import LiveInventory
+
+HEALTH_POLL_INTERVAL_SECONDS = 0.5
+"""
+Delay between two health checks while awaiting a container, when the operator
+can not tell about health changes (see ContainerOperator.container_health_subscribe)
+"""
+
+
+class AsyncContainerOperator(ABC):
+    """
+    Asyncio counterpart of ContainerOperator.
+
+    Same operations, same meaning, as coroutines. Long operations (pulls, health
+    waits) can be cancelled like any other awaitable.
+    """
+
+    @abstractmethod
+    async def image_exists(self, image: str) -> bool:
+        """Checks if image exists"""
+        pass
+
+    @abstractmethod
+    async def image_pull(self, image: str) -> None:
+        """Pulls image from remote repository"""
+        pass
+
+    @abstractmethod
+    async def image_id(self, image: str) -> Optional[str]:
+        """Returns the local id (digest) of the image, None if the image is not there"""
+        pass
+
+    @abstractmethod
+    async def container_exists(self, container_name: str) -> bool:
+        """Asks docker if the container exists"""
+        pass
+
+    @abstractmethod
+    async def container_run(self, stack_name: str, service: Service) -> None:
+        """Runs the service (ie. associated container)"""
+        pass
+
+    @abstractmethod
+    async def container_remove(self, container_name: str) -> None:
+        """Removes a container"""
+        pass
+
+    @abstractmethod
+    async def container_rename(self, container_name: str, new_name: str) -> None:
+        """Renames a container"""
+        pass
+
+    @abstractmethod
+    async def container_health_status(
+        self, container_name: str
+    ) -> ContainerHealthStatus:
+        """Returns status and health of container"""
+        pass
+
+    @abstractmethod
+    async def container_wait_healthy(
+        self, stack_name: str, container_name: str, timeout: float
+    ) -> ContainerHealthStatus:
+        """Waits until the container is healthy or exited, at most timeout seconds"""
+        pass
+
+    @abstractmethod
+    async def volume_exists(self, volume_name: str) -> bool:
+        """Asks docker if the volume exists"""
+        pass
+
+    @abstractmethod
+    async def volume_create(self, stack_name: str, volume: Volume) -> None:
+        """Creates the volume"""
+        pass
+
+    @abstractmethod
+    async def network_exists(self, network_name: str) -> bool:
+        """Asks docker if the network exists"""
+        pass
+
+    @abstractmethod
+    async def network_create(self, stack_name: str, network: Network) -> None:
+        """Creates the network"""
+        pass
+
+    @abstractmethod
+    async def inventory(
+        self,
+        container_names: list[str],
+        volume_names: list[str],
+        network_names: list[str],
+    ) -> LiveInventory:
+        """Lists containers, volumes, networks and images, one call for each kind"""
+        pass
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Releases resources (connections, streams) held by the operator"""
+        pass
+
+
+class ThreadedAsyncContainerOperator(AsyncContainerOperator):
+    """
+    Runs a ContainerOperator's calls in worker threads.
+
+    Each call holds a thread only while the underlying API call runs. Health waits
+    are not delegated to the blocking `container_wait_healthy`: the coroutine
+    checks the status each time the operator tells about a health change (its
+    shared docker events stream), or polls when it can't. Waiting containers hold
+    no thread and are cancelled right away. Cancelling a pull cancels the pull
+    running in its thread too.
+
+    Args:
+        operator (ContainerOperator): operator doing the real work
+        health_poll_interval (float): seconds between two health checks
+        timer (OperationTimer): times health waits, the other calls are timed by
+            the wrapped operator (see TimedContainerOperator)
+    """
+
+    def __init__(
+        self,
+        operator: ContainerOperator,
+        health_poll_interval: float = HEALTH_POLL_INTERVAL_SECONDS,
+        timer: Optional[OperationTimer] = None,
+    ):
+        self.operator = operator
+        self._health_poll_interval = health_poll_interval
+        self._timer = timer
+
+    async def image_exists(self, image: str) -> bool:
+        return await asyncio.to_thread(self.operator.image_exists, image)
+
+    async def image_pull(self, image: str) -> None:
+        cancellation = Cancellation()
+        try:
+            await asyncio.to_thread(self.operator.image_pull, image, cancellation)
+        except asyncio.CancelledError:
+            cancellation.cancel()
+            raise
+
+    async def image_id(self, image: str) -> Optional[str]:
+        return await asyncio.to_thread(self.operator.image_id, image)
+
+    async def container_exists(self, container_name: str) -> bool:
+        return await asyncio.to_thread(self.operator.container_exists, container_name)
+
+    async def container_run(self, stack_name: str, service: Service) -> None:
+        await asyncio.to_thread(self.operator.container_run, stack_name, service)
+
+    async def container_remove(self, container_name: str) -> None:
+        await asyncio.to_thread(self.operator.container_remove, container_name)
+
+    async def container_rename(self, container_name: str, new_name: str) -> None:
+        await asyncio.to_thread(
+            self.operator.container_rename, container_name, new_name
+        )
+
+    async def container_health_status(
+        self, container_name: str
+    ) -> ContainerHealthStatus:
+        return await asyncio.to_thread(
+            self.operator.container_health_status, container_name
+        )
+
+    async def container_wait_healthy(
+        self, stack_name: str, container_name: str, timeout: float
+    ) -> ContainerHealthStatus:
+        if self._timer is None:
+            return await self._wait_healthy(stack_name, container_name, timeout)
+        with self._timer.timed("health wait", "container", container_name):
+            return await self._wait_healthy(stack_name, container_name, timeout)
+
+    async def _wait_healthy(
+        self, stack_name: str, container_name: str, timeout: float
+    ) -> ContainerHealthStatus:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        changed = asyncio.Event()
+        following = True
+
+        def on_change(still_following: bool) -> None:
+            # called from the operator's events thread
+            def notify() -> None:
+                nonlocal following
+                following = following and still_following
+                changed.set()
+
+            loop.call_soon_threadsafe(notify)
+
+        # subscribed before the first check, so no change is missed in between
+        unsubscribe = await asyncio.to_thread(
+            self.operator.container_health_subscribe, stack_name, on_change
+        )
+        try:
+            while True:
+                changed.clear()
+                status = await self.container_health_status(container_name)
+                remaining = deadline - loop.time()
+                if status.is_final() or remaining <= 0:
+                    return status
+                if unsubscribe is None or not following:
+                    await asyncio.sleep(min(remaining, self._health_poll_interval))
+                    continue
+                try:
+                    await asyncio.wait_for(changed.wait(), remaining)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            if unsubscribe is not None:
+                unsubscribe()
+
+    async def volume_exists(self, volume_name: str) -> bool:
+        return await asyncio.to_thread(self.operator.volume_exists, volume_name)
+
+    async def volume_create(self, stack_name: str, volume: Volume) -> None:
+        await asyncio.to_thread(self.operator.volume_create, stack_name, volume)
+
+    async def network_exists(self, network_name: str) -> bool:
+        return await asyncio.to_thread(self.operator.network_exists, network_name)
+
+    async def network_create(self, stack_name: str, network: Network) -> None:
+        await asyncio.to_thread(self.operator.network_create, stack_name, network)
+
+    async def inventory(
+        self,
+        container_names: list[str],
+        volume_names: list[str],
+        network_names: list[str],
+    ) -> LiveInventory:
+        return await asyncio.to_thread(
+            self.operator.inventory, container_names, volume_names, network_names
+        )
+
+    async def close(self) -> None:
+        await asyncio.to_thread(self.operator.close)
@@ -2,14 +2,24 @@ import logging
 from typing import Optional
 
 from containup.business.commands.container_operator import (
+    ContainerNotFoundException,
     ContainerOperator,
     ContainerOperatorException,
 )
+from containup.business.commands.rolling_gate import replaced_name
+from containup.business.commands.dag_scheduler import (
+    DagSchedulerResult,
+    run_on_services,
+)
+from containup.business.commands.user_interactions import UserInteractions
 from containup.business.execution_listener import (
+    ExecutionEvt,
     ExecutionEvtContainerRemoved,
     ExecutionListener,
 )
 from containup.business.live_state.stack_state import StackState
+from containup.stack.service import Service
+from containup.stack.stack_graph import StackGraph
 from containup.stack.stack import (
     Stack,
 )
@@ -18,6 +28,19 @@ logger = logging.getLogger(__name__)
 
 
 class CommandDown:
+    """
+    Puts the stack down
+
+    Containers are removed in reverse dependency order: a service is removed once
+    every service depending on it is gone. Independent removals run at the same time.
+
+    Args:
+        dry_run (bool): we don't do any changes to the system
+        live_check (bool): in dry run, we try to check if real things exists
+        parallel (int): maximum number of containers removed at the same time
+        system_interactions (UserInteractions): exits the process when containers
+            could not be removed. Without it, ContainerOperatorException is raised.
+    """
 
     def __init__(
         self,
@@ -27,34 +50,86 @@ class CommandDown:
         dry_run: bool,
         live_check: bool,
         stack_state: StackState,
+        parallel: int = 1,
+        system_interactions: Optional[UserInteractions] = None,
     ):
         self.stack = stack
         self.operator = operator
+        self._system_interactions = system_interactions
         self._system_read = live_check if dry_run else True
         self._system_write = not dry_run
         self._auditor = auditor
         self._stack_state = stack_state
+        self._parallel = parallel
 
     def down(self, filter_services: Optional[list[str]] = None) -> None:
         services = self.stack.get_services_sorted(filter_services)[::-1]
-        for service in services:
-            container_name = service.container_name_safe()
-            container_state = self._stack_state.get_container_state(container_name)
+        result = run_on_services(
+            services,
+            reverse_dependencies(self.stack.graph, services),
+            self._container_remove,
+            self._auditor,
+            self._parallel,
+            stop_on_error=False,
+        )
+
+        report_down_result(services, result)
+        if not result.errors:
+            return
+        if self._system_interactions is None:
+            raise ContainerOperatorException(
+                "Command down failed, not removed: "
+                + ", ".join(s.name for s in services if s.name in result.errors)
+            )
+        self._system_interactions.exit_with_error(1)
+
+    def _container_remove(self, service: Service, events: list[ExecutionEvt]) -> None:
+        container_name = service.container_name_safe()
+        if self._system_write and self.stack.group_of(service.name) is not None:
+            # old container of an interrupted rolling replacement, if any
             try:
-                if container_state == "unknown" or container_state == "exists":
-                    if self._system_write:
-                        logger.info(
-                            f"Remove container {container_name}: container exists, removing."
-                        )
-                        self.operator.container_remove(container_name)
-                        logger.info(
-                            f"Remove container {container_name}: container removed."
-                        )
-                    self._auditor.record(ExecutionEvtContainerRemoved(container_name))
-                else:
-                    logger.info(
-                        f"Remove container {container_name}: container doesn't exist."
-                    )
-            except ContainerOperatorException:  # type: ignore
-                logger.info(f"Remove container {service.name}: not found.")
-                continue
+                self.operator.container_remove(replaced_name(container_name))
+                events.append(
+                    ExecutionEvtContainerRemoved(replaced_name(container_name))
+                )
+            except ContainerNotFoundException:
+                pass
+        container_state = self._stack_state.get_container_state(container_name)
+        if container_state == "unknown" or container_state == "exists":
+            if self._system_write:
+                logger.info(
+                    f"Remove container {container_name}: container exists, removing."
+                )
+                try:
+                    self.operator.container_remove(container_name)
+                except ContainerNotFoundException:
+                    logger.info(f"Remove container {container_name}: already removed.")
+                    return
+                logger.info(f"Remove container {container_name}: container removed.")
+            events.append(ExecutionEvtContainerRemoved(container_name))
+        else:
+            logger.info(f"Remove container {container_name}: container doesn't exist.")
+
+
+def reverse_dependencies(
+    graph: StackGraph, services: list[Service]
+) -> dict[str, list[str]]:
+    """For each service, the services depending on it (only among services given)"""
+    names = {service.name for service in services}
+    return {
+        service.name: [d for d in graph.dependents(service.name) if d in names]
+        for service in services
+    }
+
+
+def report_down_result(services: list[Service], result: DagSchedulerResult) -> None:
+    """Logs services that failed to be removed, or were kept because of them"""
+    for service in services:
+        if service.name in result.errors:
+            logger.error(
+                f"Remove container {service.container_name_safe()}: failed: {result.errors[service.name]}"
+            )
+        elif service.name in result.skipped:
+            logger.error(
+                f"Remove container {service.container_name_safe()}: not removed, services depending on it are still there."
+            )
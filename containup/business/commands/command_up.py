@@ -1,25 +1,29 @@
 import logging
-from typing import List, Optional
+from typing import Callable, List, Optional
 
-from containup import Network, NoneHealthcheck, Volume
 from containup.business.commands.container_operator import (
+    ContainerNotFoundException,
     ContainerOperator,
     ContainerOperatorException,
 )
+from containup.business.commands.rolling_gate import RollingGate, replaced_name
 from containup.business.commands.user_interactions import UserInteractions
+from containup.business.commands.dag_scheduler import run_on_services
+from containup.business.commands.image_pulls import ImagePulls
+from containup.business.commands.up_plan import (
+    UpPlan,
+    check_healthy,
+    resolve_service_secrets,
+)
 from containup.business.execution_listener import (
+    ExecutionEvt,
     ExecutionEvtContainerRemoved,
-    ExecutionEvtContainerRun,
-    ExecutionEvtImagePull,
-    ExecutionEvtNetworkCreated,
-    ExecutionEvtVolumeCreated,
     ExecutionListener,
 )
 from containup.business.live_state.stack_state import StackState
 from containup.stack.service import Service
-from containup.stack.service_healthcheck import HealthcheckOptions
+from containup.stack.service_group import ServiceGroup, has_fixed_host_ports
 from containup.stack.stack import Stack
-from containup.utils.duration_to_nano import duration_to_seconds
 
 logger = logging.getLogger(__name__)
 
@@ -28,9 +32,15 @@ class CommandUp:
     """
     Puts the stack up
 
+    Decisions are taken by :class:`UpPlan`, this class calls the operator.
+
     Args:
         dry_run (bool): we don't do any changes to the system
         live_check (bool): in dry run, we try to check if real things exists
+        parallel (int): maximum number of services started at the same time.
+            A service is started as soon as all its dependencies are up and healthy.
+        pull_per_registry (int): maximum number of images pulled at the same time
+            from one registry.
     """
 
     def __init__(
@@ -42,156 +52,146 @@ class CommandUp:
         dry_run: bool,
         live_check: bool,
         stack_state: StackState,
+        parallel: int = 1,
+        pull_per_registry: int = 4,
     ):
         self.stack = stack
         self.operator = operator
         self._system_interactions = system_interactions
-        self._system_read = live_check if dry_run else True
-        self._system_write = not dry_run
         self._auditor = auditor
-        self._stack_state = stack_state
+        self._plan = UpPlan(stack, stack_state, auditor, dry_run, live_check)
+        self._parallel = parallel
+        self._pull_per_registry = pull_per_registry
+        self._gates = {group.name: RollingGate(group) for group in stack.groups}
 
     def up(self, filter_services: Optional[List[str]] = None) -> None:
         try:
-
-            self._ensure_volumes()
-            self._ensure_networks()
+            for vol in self._plan.volumes_to_create():
+                self.operator.volume_create(self.stack.name, vol)
+            for net in self._plan.networks_to_create():
+                self.operator.network_create(self.stack.name, net)
 
             services = self.stack.get_services_sorted(filter_services)
-            self._ensure_images(services)
-
-            for service in services:
-                container_name = service.container_name_safe()
-                state = self._stack_state.get_container_state(container_name)
-                if state == "exists":
-                    logger.info(f"Container {container_name} exists... removing")
-                    if self._system_write:
-                        self.operator.container_remove(container_name)
-                    self._auditor.record(ExecutionEvtContainerRemoved(container_name))
-                else:
-                    logger.info(f"Container {container_name} doesn't exist")
-
-            for service in services:
-                container_name = service.container_name or service.name
-
-                if self._system_write:
-                    logger.info(f"Run container {container_name} : start")
-                    self.operator.container_run(self.stack.name, service)
-
-                self._auditor.record(ExecutionEvtContainerRun(container_name, service))
+            ImagePulls(self.operator, self._pull_per_registry).pull_all(
+                self._plan.images_to_pull(services)
+            )
+            if self._plan.system_read:
+                resolve_service_secrets(services)
+            self._plan.decide(
+                services,
+                {
+                    image: self.operator.image_id(image)
+                    for image in self._plan.images_to_identify(services)
+                },
+            )
 
-                if service.healthcheck and not isinstance(
-                    service.healthcheck, NoneHealthcheck
-                ):
-                    logger.info(
-                        f"Run container {container_name} : wait for healthcheck"
-                    )
-                    self._container_wait_healthy(service)
-                logger.info(f"Run container {container_name} : start done")
+            self._run_on_services(services, self._container_remove_existing, {})
+            self._run_on_services(
+                services,
+                self._container_start,
+                {s.name: self.stack.graph.dependencies(s.name) for s in services},
+            )
 
         except ContainerOperatorException as e:
             logger.error(f"Command up failed: {e}")
             self._system_interactions.exit_with_error(1)
 
-    def _ensure_volumes(self):
-        for vol in self.stack.volumes:
-            self._ensure_volume(vol)
-
-    def _ensure_volume(self, vol: Volume):
-        logger.debug(f"Volume {vol.name}: checking if exists")
-        state = self._stack_state.get_volume_state(vol.name)
-        if state != "exists":
-            logger.debug(f"Volume {vol.name}: create volume")
-            self._auditor.record(ExecutionEvtVolumeCreated(vol.name, vol))
-            if self._system_write:
-                self.operator.volume_create(self.stack.name, vol)
-            logger.debug(f"Volume {vol.name}: volume created")
-        else:
-            logger.debug(f"Volume {vol.name}: already exists")
-
-    def _ensure_networks(self):
-        for net in self.stack.networks:
-            self._ensure_network(net)
-
-    def _ensure_network(self, net: Network):
-        logger.debug(f"Network {net.name}: checking if exists")
-        state = self._stack_state.get_network_state(net.name)
-        if state != "exists":
-            logger.debug(f"Network {net.name}: create network")
-            self._auditor.record(ExecutionEvtNetworkCreated(net.name, net))
-            if self._system_write:
-                self.operator.network_create(self.stack.name, net)
-            logger.debug(f"Network {net.name}: network created")
-        else:
-            logger.debug(f"Network {net.name}: already exists")
-
-    def _ensure_images(self, containers: list[Service]):
-        for container in containers:
-            self._ensure_image(container)
-
-    def _ensure_image(self, container: Service):
-        image = container.image
-        state = self._stack_state.get_image_state(container.image)
-        if state != "exists":
-            logger.debug(f"Image {image}: pulling")
-            self._auditor.record(ExecutionEvtImagePull(image))
-            if self._system_write:
-                self.operator.image_pull(image)
-
-    def _container_wait_healthy(self, service: Service) -> None:
-
-        # We don't want to do that in dry-run mode
-        if not self._system_write:
-            return
-
-        # If no healthcheck defined, do nothing
-        healthcheck = service.healthcheck
-        if healthcheck is None or isinstance(healthcheck, NoneHealthcheck):
-            return
-
-        options = getattr(service.healthcheck, "options", None)
-        opts: HealthcheckOptions = options or HealthcheckOptions()
-        interval: float = duration_to_seconds(opts.interval or "1s")
-        timeout: float = duration_to_seconds(opts.timeout or "30s")
-        retries: int = opts.retries or 3
-        start_period: float = duration_to_seconds(opts.start_period or "1s")
-        start_interval: float = duration_to_seconds(opts.start_interval or "1s")
-        max_attempts: int = retries + 1
-
-        deadline: float = (
-            self._system_interactions.time()
-            + timeout * retries * interval
-            + start_period
-            + start_interval
+    def _run_on_services(
+        self,
+        services: list[Service],
+        action: Callable[[Service, list[ExecutionEvt]], None],
+        dependencies: dict[str, list[str]],
+    ) -> None:
+        """Runs action on services, in parallel when dependencies allow it."""
+        result = run_on_services(
+            services, dependencies, action, self._auditor, self._parallel
         )
-        attempt: int = 0
-
+        names = [service.name for service in services]
+        for name in names:
+            if name in result.errors:
+                logger.error(f"Service {name}: {result.errors[name]}")
+        error = result.first_error(names)
+        if error is not None:
+            raise error
+
+    def _container_remove_existing(
+        self, service: Service, events: list[ExecutionEvt]
+    ) -> None:
+        if self._plan.action(service) == "recreate":
+            container_name = service.container_name_safe()
+            if self._plan.system_write:
+                self.operator.container_remove(container_name)
+            events.append(ExecutionEvtContainerRemoved(container_name))
+
+    def _container_start(self, service: Service, events: list[ExecutionEvt]) -> None:
         container_name = service.container_name_safe()
+        group = self.stack.group_of(service.name)
+        action = self._plan.action(service)
 
-        logger.info(
-            f"Wait container {container_name} plan. Interval: {interval} timeout: {timeout} retries: {retries}"
-        )
-
-        while self._system_interactions.time() < deadline and attempt < max_attempts:
-            state = self.operator.container_health_status(container_name)
-            health = state.health
-            status = state.status
-            logger.info(
-                f"Wait container {container_name} attempts: {attempt}/{max_attempts} status: {status} health: {health}"
-            )
-            if status == "exited":
-                raise ContainerOperatorException(
-                    f"Container {container_name} exited before becoming healthy."
-                )
-
-            if health == "healthy":
+        if action == "rolling" and group is not None:
+            self._rolling_replace(group, service, events)
+            return
+        if action != "unchanged" and self._plan.system_write:
+            logger.info(f"Run container {container_name} : start")
+            self.operator.container_run(self.stack.name, service)
+        # unchanged: still wait for health, dependents may need it
+        events.extend(self._plan.start_events(service))
+        self._container_wait_healthy(service)
+        logger.info(f"Run container {container_name} : start done")
+
+    def _rolling_replace(
+        self, group: ServiceGroup, service: Service, events: list[ExecutionEvt]
+    ) -> None:
+        """
+        Replaces the container of a group member, waiting for a free slot of the
+        group. The slot is released once the new container is healthy.
+
+        With surge, the old container is renamed and kept running until the new one
+        is healthy. If the new one fails, it is removed and the old one restored.
+        """
+        container_name = service.container_name_safe()
+        with self._gates[group.name].slot(not has_fixed_host_ports(service)) as surge:
+            if not surge:
+                logger.info(f"Group {group.name}: replace {container_name} in place")
+                if self._plan.system_write:
+                    self.operator.container_remove(container_name)
+                    self.operator.container_run(self.stack.name, service)
+                events.extend(self._plan.start_events(service))
+                self._container_wait_healthy(service)
                 return
 
-            if health == "unhealthy":
-                attempt += 1
-
-            self._system_interactions.sleep(interval)
+            logger.info(f"Group {group.name}: start {container_name} next to old one")
+            if self._plan.system_write:
+                old_name = replaced_name(container_name)
+                try:
+                    self.operator.container_remove(old_name)
+                except ContainerNotFoundException:
+                    pass
+                self.operator.container_rename(container_name, old_name)
+                try:
+                    self.operator.container_run(self.stack.name, service)
+                    self._container_wait_healthy(service)
+                except BaseException:
+                    # also on interruption (Ctrl-C, cancelled task): never leave the
+                    # old container renamed next to an unverified new one
+                    logger.error(
+                        f"Group {group.name}: new {container_name} failed, restoring old one"
+                    )
+                    try:
+                        self.operator.container_remove(container_name)
+                    except ContainerNotFoundException:
+                        pass
+                    self.operator.container_rename(old_name, container_name)
+                    raise
+                self.operator.container_remove(old_name)
+            events.extend(self._plan.start_events(service))
 
-        raise ContainerOperatorException(
-            f"Container {container_name} did not become healthy in time."
+    def _container_wait_healthy(self, service: Service) -> None:
+        max_wait = self._plan.health_wait(service)
+        if max_wait is None:
+            return
+        container_name = service.container_name_safe()
+        state = self.operator.container_wait_healthy(
+            self.stack.name, container_name, max_wait
         )
+        check_healthy(container_name, state)
@@ -4,6 +4,17 @@ from dataclasses import dataclass
 @dataclass
 class ContainerHealthStatus:
     status: str
-    """Can be: unknown, exited"""
+    """Can be: unknown, running, exited, dead, removed (the container is gone)"""
     health: str
     """Can be: unknown, healthy, unhealthy"""
+
+    def is_final(self) -> bool:
+        """
+        Tells if waiting for health can stop: healthy, unhealthy (docker already
+        counted the failed retries), or not running anymore.
+        """
+        return self.health in ("healthy", "unhealthy") or self.status in (
+            "exited",
+            "dead",
+            "removed",
+        )
@@ -1,7 +1,52 @@
+import threading
 from abc import ABC, abstractmethod
+from typing import Callable, Optional
 
 from containup import Volume, Network, Service
 from containup.business.commands.container_health_status import ContainerHealthStatus
+from containup.business.live_state.live_inventory import LiveInventory
+
+
+HealthListener = Callable[[bool], None]
+"""
+Told about health changes of a stack's containers: called with True after each
+change (any container), with False once when changes can no longer be followed.
+"""
+
+
+class Cancellation:
+    """
+    Lets a caller stop a running operation from another thread.
+
+    Operators check `cancelled` or register with `on_cancel` how to interrupt
+    what they are doing (like closing a stream).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self._callbacks: list[Callable[[], None]] = []
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def on_cancel(self, callback: Callable[[], None]) -> None:
+        """Calls callback when cancelled, right now if already cancelled"""
+        with self._lock:
+            if not self._cancelled:
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def cancel(self) -> None:
+        with self._lock:
+            if self._cancelled:
+                return
+            self._cancelled = True
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
 
 
 class ContainerOperator(ABC):
@@ -16,14 +61,21 @@ class ContainerOperator(ABC):
         pass
 
     @abstractmethod
-    def image_pull(self, image: str):
+    def image_pull(self, image: str, cancellation: Optional[Cancellation] = None):
         """Pulls image from remote reposioty
 
         Arguments:
             image (str) image coordinates
+            cancellation (Cancellation) when cancelled, the pull stops and raises
+                ContainerOperatorException
         """
         pass
 
+    @abstractmethod
+    def image_id(self, image: str) -> Optional[str]:
+        """Returns the local id (digest) of the image, None if the image is not there"""
+        pass
+
     @abstractmethod
     def container_exists(self, container_name: str) -> bool:
         """Asks docker if the container exists"""
@@ -39,11 +91,40 @@ class ContainerOperator(ABC):
         """Removes a container"""
         pass
 
+    @abstractmethod
+    def container_rename(self, container_name: str, new_name: str) -> None:
+        """Renames a container"""
+        pass
+
     @abstractmethod
     def container_health_status(self, container_name: str) -> ContainerHealthStatus:
         """Returns status and health of container"""
         pass
 
+    @abstractmethod
+    def container_wait_healthy(
+        self, stack_name: str, container_name: str, timeout: float
+    ) -> ContainerHealthStatus:
+        """
+        Waits until the container is healthy, unhealthy or exited, at most timeout
+        seconds.
+
+        Returns the last known status and health of the container.
+        """
+        pass
+
+    def container_health_subscribe(
+        self, stack_name: str, listener: HealthListener
+    ) -> Optional[Callable[[], None]]:
+        """
+        Calls listener, from another thread, when containers of the stack change
+        health or exit, so that waiting for health needs no polling.
+
+        Returns the function ending the subscription, or None when the operator
+        can not follow changes (callers poll container_health_status then).
+        """
+        return None
+
     @abstractmethod
     def volume_exists(self, volume_name: str) -> bool:
         """Ensure that the volume exists"""
@@ -64,8 +145,34 @@ class ContainerOperator(ABC):
         """Creates the network"""
         pass
 
+    @abstractmethod
+    def inventory(
+        self,
+        container_names: list[str],
+        volume_names: list[str],
+        network_names: list[str],
+    ) -> LiveInventory:
+        """
+        Lists containers, volumes, networks and images, with one call for each kind.
+
+        Names are the ones the caller is interested in. Implementations may use them
+        to filter listings, but may return more objects.
+        """
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        """Releases resources (connections, streams) held by the operator"""
+        pass
+
 
 class ContainerOperatorException(Exception):
     """Custom high-level error for operator failures."""
 
     pass
+
+
+class ContainerNotFoundException(ContainerOperatorException):
+    """The container the operation applies to doesn't exist."""
+
+    pass
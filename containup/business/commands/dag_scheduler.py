@@ -0,0 +1,214 @@
+import asyncio
+import heapq
+import logging
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Mapping, Optional, Sequence
+
+from containup.business.execution_listener import ExecutionEvt, ExecutionListener
+from containup.stack.service import Service
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DagSchedulerResult:
+    """Outcome of a :class:`DagScheduler` run."""
+
+    done: list[str] = field(default_factory=lambda: [])
+    """Nodes whose action succeeded, in completion order."""
+
+    errors: dict[str, BaseException] = field(default_factory=lambda: {})
+    """Nodes whose action failed, with the error raised."""
+
+    skipped: list[str] = field(default_factory=lambda: [])
+    """Nodes never started, because a dependency failed or the run was stopped."""
+
+    def first_error(self, nodes: Sequence[str]) -> Optional[BaseException]:
+        """Returns the error of the first failed node, following the order of nodes."""
+        for node in nodes:
+            if node in self.errors:
+                return self.errors[node]
+        return None
+
+
+class DagScheduler:
+    """
+    Runs an action on each node of a dependency graph, with a limited number of workers.
+
+    A node is started as soon as all its dependencies are done. Dependencies that
+    are not part of the scheduled nodes are considered satisfied (this happens
+    when the user filters services).
+
+    Ready nodes are started following the order of the given node list, so with
+    one worker, nodes run exactly in that order.
+
+    Args:
+        max_workers (int): maximum number of actions running at the same time
+    """
+
+    def __init__(self, max_workers: int):
+        if max_workers < 1:
+            raise ValueError(f"max_workers must be at least 1, got {max_workers}")
+        self._max_workers = max_workers
+
+    def run(
+        self,
+        nodes: Sequence[str],
+        dependencies: Mapping[str, Sequence[str]],
+        action: Callable[[str], None],
+        stop_on_error: bool = True,
+    ) -> DagSchedulerResult:
+        """
+        Runs action over nodes.
+
+        Nodes depending on a failed node are never started. If stop_on_error is
+        True, no new node is started after the first failure, running ones are
+        awaited.
+
+        Arguments:
+            nodes (Sequence[str]) nodes to run, in preferred start order
+            dependencies (Mapping[str, Sequence[str]]) for each node, nodes that must be done before
+            action (Callable[[str], None]) what to do on each node
+            stop_on_error (bool) stop starting new nodes after the first failure
+        """
+        result = DagSchedulerResult()
+        order = {node: index for index, node in enumerate(nodes)}
+        waiting_for: dict[str, set[str]] = {
+            node: {
+                dep
+                for dep in dependencies.get(node, [])
+                if dep in order and dep != node
+            }
+            for node in nodes
+        }
+        dependents: dict[str, list[str]] = {node: [] for node in nodes}
+        for node, deps in waiting_for.items():
+            for dep in deps:
+                dependents[dep].append(node)
+
+        ready: list[tuple[int, str]] = [
+            (order[node], node) for node in nodes if not waiting_for[node]
+        ]
+        heapq.heapify(ready)
+        running: dict[Future[None], str] = {}
+
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            while ready or running:
+                can_start = not (stop_on_error and result.errors)
+                while can_start and ready and len(running) < self._max_workers:
+                    _, node = heapq.heappop(ready)
+                    running[executor.submit(action, node)] = node
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in sorted(finished, key=lambda f: order[running[f]]):
+                    node = running.pop(future)
+                    error = future.exception()
+                    if error is not None:
+                        logger.debug(f"Node {node}: failed with {error!r}")
+                        result.errors[node] = error
+                        continue
+                    result.done.append(node)
+                    for dependent in dependents[node]:
+                        waiting_for[dependent].discard(node)
+                        if not waiting_for[dependent]:
+                            heapq.heappush(ready, (order[dependent], dependent))
+
+        finished_nodes = set(result.done) | set(result.errors)
+        result.skipped = [node for node in nodes if node not in finished_nodes]
+        return result
+
+
+def run_on_services(
+    services: list[Service],
+    dependencies: Mapping[str, Sequence[str]],
+    action: Callable[[Service, list[ExecutionEvt]], None],
+    listener: ExecutionListener,
+    max_workers: int,
+    stop_on_error: bool = True,
+) -> DagSchedulerResult:
+    """
+    Runs action on services with a :class:`DagScheduler`.
+
+    Actions don't record events directly in the listener: each one gets its own
+    buffer, flushed in services order once everything is finished. That way,
+    events stay in the same order whatever the parallelism.
+
+    Arguments:
+        services (list[Service]) services, in preferred start order
+        dependencies (Mapping[str, Sequence[str]]) for each service name, names of services to wait for
+        action (Callable) what to do on each service, records events in the given list
+        listener (ExecutionListener) where events are flushed
+        max_workers (int) maximum number of actions running at the same time
+        stop_on_error (bool) stop starting new services after the first failure
+    """
+    by_name = {service.name: service for service in services}
+    buffers: dict[str, list[ExecutionEvt]] = {s.name: [] for s in services}
+    names = [service.name for service in services]
+    try:
+        return DagScheduler(max_workers).run(
+            names,
+            dependencies,
+            lambda name: action(by_name[name], buffers[name]),
+            stop_on_error=stop_on_error,
+        )
+    finally:
+        for name in names:
+            for evt in buffers[name]:
+                listener.record(evt)
+
+
+async def async_run_on_services(
+    services: list[Service],
+    dependencies: Mapping[str, Sequence[str]],
+    action: Callable[[Service, list[ExecutionEvt]], Awaitable[None]],
+    listener: ExecutionListener,
+    max_concurrency: int,
+    stop_on_error: bool = True,
+) -> DagSchedulerResult:
+    """
+    Asyncio counterpart of :func:`run_on_services`, with the same rules.
+
+    Each service is a task waiting for its dependencies, at most max_concurrency
+    actions run at the same time. Cancelling the caller cancels running actions,
+    events recorded so far are still flushed.
+    """
+    if max_concurrency < 1:
+        raise ValueError(f"max_concurrency must be at least 1, got {max_concurrency}")
+    result = DagSchedulerResult()
+    names = [service.name for service in services]
+    buffers: dict[str, list[ExecutionEvt]] = {name: [] for name in names}
+    finished: dict[str, asyncio.Event] = {name: asyncio.Event() for name in names}
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run(service: Service) -> None:
+        name = service.name
+        try:
+            for dep in dependencies.get(name, []):
+                if dep in finished and dep != name:
+                    await finished[dep].wait()
+                    if dep not in result.done:
+                        return
+            async with semaphore:
+                if stop_on_error and result.errors:
+                    return
+                try:
+                    await action(service, buffers[name])
+                except Exception as e:
+                    logger.debug(f"Node {name}: failed with {e!r}")
+                    result.errors[name] = e
+                    return
+                result.done.append(name)
+        finally:
+            finished[name].set()
+
+    try:
+        await asyncio.gather(*(run(service) for service in services))
+    finally:
+        for name in names:
+            for evt in buffers[name]:
+                listener.record(evt)
+    finished_nodes = set(result.done) | set(result.errors)
+    result.skipped = [name for name in names if name not in finished_nodes]
+    return result
@@ -0,0 +1,114 @@
+import asyncio
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Optional
+
+from containup.business.commands.async_container_operator import (
+    AsyncContainerOperator,
+)
+from containup.business.commands.container_operator import ContainerOperator
+from containup.utils.image_reference import image_registry, normalize_image_reference
+
+logger = logging.getLogger(__name__)
+
+
+def group_image_references(images: Iterable[str]) -> dict[str, list[str]]:
+    """
+    Groups image references that designate the same image.
+
+    Keys are normalized references, values are the spellings found, in order of
+    appearance (without duplicates). Groups are ordered by first appearance.
+    """
+    groups: dict[str, list[str]] = {}
+    for image in images:
+        aliases = groups.setdefault(normalize_image_reference(image), [])
+        if image not in aliases:
+            aliases.append(image)
+    return groups
+
+
+class ImagePulls:
+    """
+    Pulls distinct images at the same time, limiting concurrent pulls per registry.
+
+    Args:
+        operator (ContainerOperator): operator doing the real pulls
+        per_registry_limit (int): maximum number of simultaneous pulls on one registry
+    """
+
+    def __init__(self, operator: ContainerOperator, per_registry_limit: int):
+        if per_registry_limit < 1:
+            raise ValueError(
+                f"per_registry_limit must be at least 1, got {per_registry_limit}"
+            )
+        self._operator = operator
+        self._per_registry_limit = per_registry_limit
+
+    def pull_all(self, images: list[str]) -> None:
+        """
+        Pulls all images, each one must be a distinct image.
+
+        Waits for all pulls to finish, then raises the error of the first failed
+        image (in the order of images), if any.
+        """
+        if not images:
+            return
+        # one queue per registry, drained by as many threads as pulls allowed
+        # on it: no thread waits for a registry slot
+        queues: dict[str, deque[str]] = {}
+        for image in images:
+            queues.setdefault(image_registry(image), deque()).append(image)
+        errors: dict[str, BaseException] = {}
+
+        def pull_from(queue: "deque[str]") -> None:
+            while True:
+                try:
+                    image = queue.popleft()
+                except IndexError:
+                    return
+                try:
+                    self._operator.image_pull(image)
+                except Exception as e:
+                    logger.error(f"Image {image}: pull failed: {e}")
+                    errors[image] = e
+
+        workers = [
+            queue
+            for queue in queues.values()
+            for _ in range(min(self._per_registry_limit, len(queue)))
+        ]
+        with ThreadPoolExecutor(max_workers=len(workers)) as executor:
+            for future in [executor.submit(pull_from, queue) for queue in workers]:
+                future.result()
+
+        for image in images:
+            if image in errors:
+                raise errors[image]
+
+
+async def async_pull_all(
+    operator: AsyncContainerOperator, images: list[str], per_registry_limit: int
+) -> None:
+    """Asyncio counterpart of :meth:`ImagePulls.pull_all`, with the same rules."""
+    if per_registry_limit < 1:
+        raise ValueError(
+            f"per_registry_limit must be at least 1, got {per_registry_limit}"
+        )
+    semaphores: dict[str, asyncio.Semaphore] = {
+        image_registry(image): asyncio.Semaphore(per_registry_limit) for image in images
+    }
+
+    async def pull(image: str) -> Optional[BaseException]:
+        async with semaphores[image_registry(image)]:
+            try:
+                await operator.image_pull(image)
+                return None
+            except Exception as e:
+                logger.error(f"Image {image}: pull failed: {e}")
+                return e
+
+    errors = await asyncio.gather(*(pull(image) for image in images))
+    for error in errors:
+        if error is not None:
+            raise error
@@ -0,0 +1,108 @@
+import asyncio
+import threading
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Iterator, Optional
+
+from containup.business.commands.container_operator import ContainerOperatorException
+from containup.stack.service_group import ServiceGroup
+
+
+class RollingSlots:
+    """
+    Counts replacements in progress in a service group.
+
+    A replacement takes a surge slot when the member can surge (its old container
+    keeps running), otherwise an unavailable slot. Members that can't surge in a
+    group with max_unavailable=0 are replaced in place one at a time.
+    """
+
+    def __init__(self, group_name: str, max_unavailable: int, max_surge: int):
+        self._group_name = group_name
+        self._max_unavailable = max_unavailable
+        self._max_surge = max_surge
+        self._unavailable = 0
+        self._surge = 0
+        self.failed = False
+        """Set when a replacement failed: waiting members keep their old container"""
+
+    def take(self, can_surge: bool) -> Optional[bool]:
+        """
+        Takes a slot: True for surge, False for unavailable, None if none is free.
+
+        Raises ContainerOperatorException once a replacement of the group failed.
+        """
+        if self.failed:
+            raise ContainerOperatorException(
+                f"Group {self._group_name}: rolling update stopped after a failure"
+            )
+        if can_surge and self._surge < self._max_surge:
+            self._surge += 1
+            return True
+        limit = self._max_unavailable if can_surge else max(self._max_unavailable, 1)
+        if self._unavailable < limit:
+            self._unavailable += 1
+            return False
+        return None
+
+    def give(self, surge: bool) -> None:
+        if surge:
+            self._surge -= 1
+        else:
+            self._unavailable -= 1
+
+
+class RollingGate:
+    """Limits replacements running at the same time in a service group (threads)"""
+
+    def __init__(self, group: ServiceGroup):
+        self._slots = RollingSlots(group.name, group.max_unavailable, group.max_surge)
+        self._cond = threading.Condition()
+
+    @contextmanager
+    def slot(self, can_surge: bool) -> Iterator[bool]:
+        """Waits for a free slot, yields True if the replacement uses surge"""
+        with self._cond:
+            surge = self._slots.take(can_surge)
+            while surge is None:
+                self._cond.wait()
+                surge = self._slots.take(can_surge)
+        try:
+            yield surge
+        except BaseException:
+            self._slots.failed = True
+            raise
+        finally:
+            with self._cond:
+                self._slots.give(surge)
+                self._cond.notify_all()
+
+
+class AsyncRollingGate:
+    """Limits replacements running at the same time in a service group (asyncio)"""
+
+    def __init__(self, group: ServiceGroup):
+        self._slots = RollingSlots(group.name, group.max_unavailable, group.max_surge)
+        self._cond = asyncio.Condition()
+
+    @asynccontextmanager
+    async def slot(self, can_surge: bool) -> AsyncIterator[bool]:
+        """Waits for a free slot, yields True if the replacement uses surge"""
+        async with self._cond:
+            surge = self._slots.take(can_surge)
+            while surge is None:
+                await self._cond.wait()
+                surge = self._slots.take(can_surge)
+        try:
+            yield surge
+        except BaseException:
+            self._slots.failed = True
+            raise
+        finally:
+            async with self._cond:
+                self._slots.give(surge)
+                self._cond.notify_all()
+
+
+def replaced_name(container_name: str) -> str:
+    """Name given to the old container of a member while its new one starts"""
+    return f"{container_name}-containup-replaced"
@@ -0,0 +1,71 @@
+import hashlib
+import json
+from dataclasses import asdict, is_dataclass
+from typing import Any, Optional, Union
+
+from containup.stack.service import Service
+from containup.stack.service_healthcheck import HealthCheck
+from containup.stack.service_mounts import ServiceMount
+from containup.utils.image_reference import normalize_image_reference
+from containup.utils.secret_value import SecretValue
+
+CONFIG_HASH_LABEL = "containup.config.hash"
+"""Label set on containers, holding the hash of the configuration they were created with."""
+
+
+def service_config_hash(service: Service, image_id: Optional[str]) -> str:
+    """
+    Computes a hash of everything that makes a container of this service.
+
+    Two containers with the same hash are interchangeable: same image digest,
+    environment, mounts, ports, command, healthcheck and labels. Secret values
+    only take part as their own digest, so the hash never exposes them.
+
+    Arguments:
+        service (Service) the service definition
+        image_id (str) local id (digest) of the image, None if unknown
+    """
+    document: dict[str, Any] = {
+        "image": normalize_image_reference(service.image),
+        "image_id": image_id or "",
+        "command": service.command,
+        "environment": {
+            key: _environment_value(value)
+            for key, value in sorted(service.environment.items())
+        },
+        "mounts": [_mount(mount) for mount in service.mounts_all()],
+        "ports": [asdict(p) for p in service.ports],
+        "healthcheck": _healthcheck(service.healthcheck),
+        "labels": service.labels,
+        "network": service.network,
+        "restart": service.restart,
+    }
+    canonical = json.dumps(
+        document, sort_keys=True, separators=(",", ":"), default=_json_default
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _json_default(value: Any) -> Any:
+    if is_dataclass(value) and not isinstance(value, type):
+        return asdict(value)
+    return str(value)
+
+
+def _environment_value(value: Union[str, SecretValue]) -> Any:
+    if isinstance(value, SecretValue):
+        digest = hashlib.sha256(value.reveal().encode("utf-8")).hexdigest()
+        return {"secret": digest}
+    return value
+
+
+def _mount(mount: ServiceMount) -> dict[str, Any]:
+    # _id is generated at each run, it doesn't describe the mount
+    fields = {k: v for k, v in vars(mount).items() if k != "_id"}
+    return {"type": mount.type(), **fields}
+
+
+def _healthcheck(healthcheck: Optional[HealthCheck]) -> Any:
+    if healthcheck is None:
+        return None
+    return {"type": healthcheck.type, **vars(healthcheck)}
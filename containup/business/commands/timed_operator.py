@@ -0,0 +1,131 @@
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+from containup import Network, Service, Volume
+from containup.business.commands.container_health_status import ContainerHealthStatus
+from containup.business.commands.container_operator import (
+    Cancellation,
+    ContainerOperator,
+    HealthListener,
+)
+from containup.business.execution_listener import ExecutionEvtOperation
+from containup.business.live_state.live_inventory import LiveInventory
+
+
+class OperationTimer:
+    """
+    Keeps an ExecutionEvtOperation for each timed block.
+
+    Timings are kept here, not recorded in the execution listener: calls end in
+    any order when they run in parallel, and the listener's events must not
+    depend on it. Safe to use from several threads.
+
+    Args:
+        clock: wall-clock time in seconds, usually UserInteractions.time
+    """
+
+    def __init__(self, clock: Callable[[], float]):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._operations: list[ExecutionEvtOperation] = []
+
+    @contextmanager
+    def timed(self, operation: str, kind: str, resource: str) -> Iterator[None]:
+        start = self._clock()
+        failed = True
+        try:
+            yield
+            failed = False
+        finally:
+            evt = ExecutionEvtOperation(
+                operation, kind, resource, start, self._clock(), failed
+            )
+            with self._lock:
+                self._operations.append(evt)
+
+    def operations(self) -> list[ExecutionEvtOperation]:
+        """Operations timed so far, by start time"""
+        with self._lock:
+            return sorted(self._operations, key=lambda op: (op.start, op.end))
+
+
+class TimedContainerOperator(ContainerOperator):
+    """
+    Wraps an operator and times the calls that change things or wait: pulls,
+    container runs, removals, renames, health waits, volume and network
+    creations, and the inventory. Quick existence checks are not recorded.
+
+    Timings are kept by the timer (see OperationTimer), out of the listener.
+    """
+
+    def __init__(self, operator: ContainerOperator, timer: OperationTimer):
+        self.operator = operator
+        self._timer = timer
+
+    def image_exists(self, image: str) -> bool:
+        return self.operator.image_exists(image)
+
+    def image_pull(self, image: str, cancellation: Optional[Cancellation] = None):
+        with self._timer.timed("pull", "image", image):
+            self.operator.image_pull(image, cancellation)
+
+    def image_id(self, image: str) -> Optional[str]:
+        return self.operator.image_id(image)
+
+    def container_exists(self, container_name: str) -> bool:
+        return self.operator.container_exists(container_name)
+
+    def container_run(self, stack_name: str, service: Service):
+        with self._timer.timed("run", "container", service.container_name_safe()):
+            self.operator.container_run(stack_name, service)
+
+    def container_remove(self, container_name: str):
+        with self._timer.timed("remove", "container", container_name):
+            self.operator.container_remove(container_name)
+
+    def container_rename(self, container_name: str, new_name: str) -> None:
+        with self._timer.timed("rename", "container", container_name):
+            self.operator.container_rename(container_name, new_name)
+
+    def container_health_status(self, container_name: str) -> ContainerHealthStatus:
+        return self.operator.container_health_status(container_name)
+
+    def container_wait_healthy(
+        self, stack_name: str, container_name: str, timeout: float
+    ) -> ContainerHealthStatus:
+        with self._timer.timed("health wait", "container", container_name):
+            return self.operator.container_wait_healthy(
+                stack_name, container_name, timeout
+            )
+
+    def container_health_subscribe(
+        self, stack_name: str, listener: HealthListener
+    ) -> Optional[Callable[[], None]]:
+        return self.operator.container_health_subscribe(stack_name, listener)
+
+    def volume_exists(self, volume_name: str) -> bool:
+        return self.operator.volume_exists(volume_name)
+
+    def volume_create(self, stack_name: str, volume: Volume) -> None:
+        with self._timer.timed("create", "volume", volume.name):
+            self.operator.volume_create(stack_name, volume)
+
+    def network_exists(self, network_name: str) -> bool:
+        return self.operator.network_exists(network_name)
+
+    def network_create(self, stack_name: str, network: Network) -> None:
+        with self._timer.timed("create", "network", network.name):
+            self.operator.network_create(stack_name, network)
+
+    def inventory(
+        self,
+        container_names: list[str],
+        volume_names: list[str],
+        network_names: list[str],
+    ) -> LiveInventory:
+        with self._timer.timed("inventory", "stack", ""):
+            return self.operator.inventory(container_names, volume_names, network_names)
+
+    def close(self) -> None:
+        self.operator.close()
@@ -0,0 +1,268 @@
+import logging
+from typing import Iterable, Literal, Mapping, Optional
+
+from containup import Network, NoneHealthcheck, Volume
+from containup.business.commands.container_health_status import ContainerHealthStatus
+from containup.business.commands.container_operator import ContainerOperatorException
+from containup.business.commands.image_pulls import group_image_references
+from containup.business.commands.service_config_hash import service_config_hash
+from containup.business.execution_listener import (
+    ExecutionEvt,
+    ExecutionEvtContainerRemoved,
+    ExecutionEvtContainerRun,
+    ExecutionEvtContainerUnchanged,
+    ExecutionEvtImagePull,
+    ExecutionEvtNetworkCreated,
+    ExecutionEvtVolumeCreated,
+    ExecutionListener,
+)
+from containup.business.live_state.stack_state import StackState
+from containup.stack.service import Service
+from containup.stack.service_healthcheck import HealthcheckOptions
+from containup.stack.stack import Stack
+from containup.utils.duration_to_nano import duration_to_seconds
+from containup.utils.secret_providers import SecretProviderException, resolve_secrets
+from containup.utils.secret_value import SecretValue
+
+logger = logging.getLogger(__name__)
+
+UpAction = Literal["unchanged", "run", "recreate", "rolling"]
+"""
+What up does with a service's container:
+
+- unchanged: the container has the configuration asked, it is kept
+- run: there is no container, it is started
+- recreate: the container is removed before services start, then started again
+- rolling: the container of a group member is replaced, see CommandUp._rolling_replace
+"""
+
+
+class UpPlan:
+    """
+    Decisions of the up command, shared by CommandUp and AsyncCommandUp: what is
+    created, pulled, kept or replaced, and the events recorded for it. The
+    commands only call the operator with what the plan returns.
+
+    Methods returning work for the operator return nothing in dry run.
+
+    Args:
+        dry_run (bool): we don't do any changes to the system
+        live_check (bool): in dry run, we try to check if real things exists
+    """
+
+    def __init__(
+        self,
+        stack: Stack,
+        stack_state: StackState,
+        auditor: ExecutionListener,
+        dry_run: bool,
+        live_check: bool,
+    ):
+        self.stack = stack
+        self.system_read = live_check if dry_run else True
+        self.system_write = not dry_run
+        self._stack_state = stack_state
+        self._auditor = auditor
+        self._actions: dict[str, UpAction] = {}
+
+    def volumes_to_create(self) -> list[Volume]:
+        """Records the creation of missing volumes, returns the ones to create"""
+        to_create: list[Volume] = []
+        for vol in self.stack.volumes:
+            if self._stack_state.get_volume_state(vol.name) != "exists":
+                logger.debug(f"Volume {vol.name}: create volume")
+                self._auditor.record(ExecutionEvtVolumeCreated(vol.name, vol))
+                to_create.append(vol)
+            else:
+                logger.debug(f"Volume {vol.name}: already exists")
+        return to_create if self.system_write else []
+
+    def networks_to_create(self) -> list[Network]:
+        """Records the creation of missing networks, returns the ones to create"""
+        to_create: list[Network] = []
+        for net in self.stack.networks:
+            if self._stack_state.get_network_state(net.name) != "exists":
+                logger.debug(f"Network {net.name}: create network")
+                self._auditor.record(ExecutionEvtNetworkCreated(net.name, net))
+                to_create.append(net)
+            else:
+                logger.debug(f"Network {net.name}: already exists")
+        return to_create if self.system_write else []
+
+    def images_to_pull(self, services: list[Service]) -> list[str]:
+        """
+        Records the pull of missing images, returns the ones to pull. Different
+        spellings of the same image are pulled once.
+        """
+        to_pull: list[str] = []
+        groups = group_image_references(service.image for service in services)
+        for aliases in groups.values():
+            image = aliases[0]
+            states = [self._stack_state.get_image_state(alias) for alias in aliases]
+            if "exists" not in states:
+                logger.debug(f"Image {image}: pulling")
+                self._auditor.record(ExecutionEvtImagePull(image))
+                to_pull.append(image)
+        return to_pull if self.system_write else []
+
+    def images_to_identify(self, services: list[Service]) -> list[str]:
+        """
+        Images whose id must be asked to the operator to compare configurations:
+        images of existing containers, not already known by the stack state.
+        """
+        if not self.system_read:
+            return []
+        images: list[str] = []
+        for service in services:
+            if (
+                self._current_hash(service) is not None
+                and self._stack_state.get_image_id(service.image) is None
+                and service.image not in images
+            ):
+                images.append(service.image)
+        return images
+
+    def decide(
+        self, services: list[Service], image_ids: Mapping[str, Optional[str]]
+    ) -> None:
+        """
+        Chooses the action of each service. Containers with exactly the
+        configuration asked (same config hash) are kept.
+
+        Arguments:
+            image_ids (Mapping[str, Optional[str]]) ids of images_to_identify()
+        """
+        for service in services:
+            container_name = service.container_name_safe()
+            state = self._stack_state.get_container_state(container_name)
+            if self._is_unchanged(service, image_ids):
+                logger.info(f"Container {container_name} exists and is unchanged")
+                action: UpAction = "unchanged"
+            elif state == "exists" and self.stack.group_of(service.name) is not None:
+                logger.info(f"Container {container_name} exists, rolling replacement")
+                action = "rolling"
+            elif state == "exists":
+                logger.info(f"Container {container_name} exists... removing")
+                action = "recreate"
+            else:
+                logger.info(f"Container {container_name} doesn't exist")
+                action = "run"
+            self._actions[service.name] = action
+
+    def action(self, service: Service) -> UpAction:
+        """Action chosen by decide() for the service"""
+        return self._actions[service.name]
+
+    def start_events(self, service: Service) -> list[ExecutionEvt]:
+        """Events recorded once the service's container is started (or kept)"""
+        container_name = service.container_name_safe()
+        action = self.action(service)
+        if action == "unchanged":
+            return [ExecutionEvtContainerUnchanged(container_name)]
+        if action == "rolling":
+            return [
+                ExecutionEvtContainerRemoved(container_name),
+                ExecutionEvtContainerRun(container_name, service),
+            ]
+        return [ExecutionEvtContainerRun(container_name, service)]
+
+    def health_wait(self, service: Service) -> Optional[float]:
+        """
+        Maximum time (seconds) to wait for the service's container to become
+        healthy. None if there is nothing to wait for.
+        """
+        if not self.system_write:
+            return None
+        max_wait = healthcheck_max_wait(service)
+        if max_wait is not None:
+            logger.info(
+                f"Run container {service.container_name_safe()} : wait for healthcheck"
+            )
+        return max_wait
+
+    def _current_hash(self, service: Service) -> Optional[str]:
+        return self._stack_state.get_container_config_hash(
+            service.container_name_safe()
+        )
+
+    def _is_unchanged(
+        self, service: Service, image_ids: Mapping[str, Optional[str]]
+    ) -> bool:
+        if not self.system_read:
+            return False
+        current_hash = self._current_hash(service)
+        if current_hash is None:
+            return False
+        image_id = self._stack_state.get_image_id(service.image) or image_ids.get(
+            service.image
+        )
+        if service_config_hash(service, image_id) == current_hash:
+            return True
+        logger.info(f"Container {service.container_name_safe()}: configuration changed")
+        return False
+
+
+def resolve_service_secrets(services: Iterable[Service]) -> None:
+    """
+    Looks up the lazy secrets of the services (see secret_providers) at the same
+    time, before they are used. Only these services' secrets are looked up.
+    """
+    try:
+        resolve_secrets(
+            value
+            for service in services
+            for value in service.environment.values()
+            if isinstance(value, SecretValue)
+        )
+    except SecretProviderException as e:
+        raise ContainerOperatorException(str(e)) from e
+
+
+def healthcheck_max_wait(service: Service) -> Optional[float]:
+    """
+    Maximum time (seconds) to wait for the service's container to become healthy.
+
+    None if the service has no healthcheck to wait for.
+    """
+    healthcheck = service.healthcheck
+    if healthcheck is None or isinstance(healthcheck, NoneHealthcheck):
+        return None
+
+    options = getattr(service.healthcheck, "options", None)
+    opts: HealthcheckOptions = options or HealthcheckOptions()
+    interval: float = duration_to_seconds(opts.interval or "1s")
+    timeout: float = duration_to_seconds(opts.timeout or "30s")
+    retries: int = opts.retries or 3
+    start_period: float = duration_to_seconds(opts.start_period or "1s")
+    start_interval: float = duration_to_seconds(opts.start_interval or "1s")
+
+    logger.info(
+        f"Wait container {service.container_name_safe()} plan. Interval: {interval} timeout: {timeout} retries: {retries}"
+    )
+    return timeout * retries * interval + start_period + start_interval
+
+
+def check_healthy(container_name: str, state: ContainerHealthStatus) -> None:
+    """Raises if the container state at the end of the wait is not healthy"""
+    logger.info(
+        f"Wait container {container_name} status: {state.status} health: {state.health}"
+    )
+    if state.status == "exited":
+        raise ContainerOperatorException(
+            f"Container {container_name} exited before becoming healthy."
+        )
+
+    if state.status == "removed":
+        raise ContainerOperatorException(
+            f"Container {container_name} was removed before becoming healthy."
+        )
+
+    if state.health == "healthy":
+        return
+
+    if state.health == "unhealthy":
+        raise ContainerOperatorException(f"Container {container_name} is unhealthy.")
+
+    raise ContainerOperatorException(
+        f"Container {container_name} did not become healthy in time."
+    )
@@ -1,10 +1,12 @@
+import threading
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-
+from typing import Optional, TypeVar
 
 from containup.stack.network import Network
 from containup.stack.stack import Service
 from containup.stack.volume import Volume
+from containup.utils.image_reference import normalize_image_reference
 
 
 @dataclass
@@ -48,6 +50,13 @@ class ExecutionEvtContainerRemoved(ExecutionEvtContainer):
     container_id: str
 
 
+@dataclass
+class ExecutionEvtContainerUnchanged(ExecutionEvtContainer):
+    """Container already runs with the same configuration, it is left untouched"""
+
+    container_id: str
+
+
 @dataclass
 class ExecutionEvtContainerRun(ExecutionEvtContainer):
     container_id: str
@@ -70,6 +79,64 @@ class ExecutionEvtNetworkCreated(ExecutionEvtNetwork):
     network: Network
 
 
+@dataclass
+class ExecutionEvtOperation(ExecutionEvt):
+    """
+    One call to the container operator, with its wall-clock start and end.
+
+    kind is "container", "image", "volume", "network" or "stack" (whole-stack
+    reads like the inventory), resource the name of the object.
+    """
+
+    operation: str
+    kind: str
+    resource: str
+    start: float
+    end: float
+    failed: bool = False
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+E = TypeVar("E", bound=ExecutionEvt)
+
+_RESOURCE_KINDS: list[type[ExecutionEvt]] = [
+    ExecutionEvtContainer,
+    ExecutionEvtImage,
+    ExecutionEvtVolume,
+    ExecutionEvtNetwork,
+]
+
+
+def _resource_of(evt: ExecutionEvt) -> Optional[tuple[type[ExecutionEvt], str]]:
+    """Kind (base event class) and id of the resource an event is about"""
+    if isinstance(evt, ExecutionEvtContainer):
+        return ExecutionEvtContainer, evt.container_id
+    if isinstance(evt, ExecutionEvtImage):
+        return ExecutionEvtImage, normalize_image_reference(evt.image_id)
+    if isinstance(evt, ExecutionEvtVolume):
+        return ExecutionEvtVolume, evt.volume_id
+    if isinstance(evt, ExecutionEvtNetwork):
+        return ExecutionEvtNetwork, evt.network_id
+    return None
+
+
+def _resource_kind(kind: type[ExecutionEvt]) -> Optional[type[ExecutionEvt]]:
+    for base in _RESOURCE_KINDS:
+        if issubclass(kind, base):
+            return base
+    return None
+
+
+def _resource_id(kind: type[ExecutionEvt], resource_id: str) -> str:
+    # the same image may be written differently, events are kept under one name
+    if issubclass(kind, ExecutionEvtImage):
+        return normalize_image_reference(resource_id)
+    return resource_id
+
+
 class ExecutionListener:
     @abstractmethod
     def record(self, message: ExecutionEvt) -> None:
@@ -79,14 +146,42 @@ class ExecutionListener:
     def get_events(self) -> list[ExecutionEvt]:
         pass
 
+    def events_of(self, kind: type[E], resource_id: str) -> list[E]:
+        """
+        Events of one kind (ExecutionEvtContainer, ExecutionEvtImage,
+        ExecutionEvtVolume, ExecutionEvtNetwork or one of their subclasses)
+        about one resource, in the order they were recorded. Images match
+        whatever way they are written (`nginx` is `docker.io/library/nginx:latest`).
+        """
+        resource = (_resource_kind(kind), _resource_id(kind, resource_id))
+        return [
+            evt
+            for evt in self.get_events()
+            if isinstance(evt, kind) and _resource_of(evt) == resource
+        ]
+
 
 class ExecutionListenerStd(ExecutionListener):
+    """Keeps events in memory, indexed by resource as they are recorded"""
 
     def __init__(self):
         self._messages: list[ExecutionEvt] = []
+        self._by_resource: dict[tuple[type[ExecutionEvt], str], list[ExecutionEvt]] = {}
+        self._lock = threading.Lock()
 
     def record(self, message: ExecutionEvt) -> None:
-        self._messages.append(message)
+        resource = _resource_of(message)
+        with self._lock:
+            self._messages.append(message)
+            if resource is not None:
+                self._by_resource.setdefault(resource, []).append(message)
 
     def get_events(self) -> list[ExecutionEvt]:
         return self._messages
+
+    def events_of(self, kind: type[E], resource_id: str) -> list[E]:
+        base = _resource_kind(kind)
+        if base is None:
+            return []
+        events = self._by_resource.get((base, _resource_id(kind, resource_id)), [])
+        return [evt for evt in events if isinstance(evt, kind)]
@@ -0,0 +1,56 @@
+from dataclasses import dataclass, field
+from typing import Optional
+
+from containup.utils.image_reference import normalize_image_reference
+
+
+@dataclass
+class LiveContainer:
+    """A container found on the live system."""
+
+    name: str
+    running: bool
+    labels: dict[str, str] = field(default_factory=lambda: {})
+
+
+@dataclass
+class LiveInventory:
+    """
+    Snapshot of containers, volumes, networks and images found on the live system.
+
+    Filled with one listing per kind of object, then every state query is answered
+    from these in-memory indexes.
+    """
+
+    containers: dict[str, LiveContainer] = field(default_factory=lambda: {})
+    """Containers by name"""
+
+    volumes: set[str] = field(default_factory=lambda: set())
+    """Volume names"""
+
+    networks: set[str] = field(default_factory=lambda: set())
+    """Network names"""
+
+    images: dict[str, str] = field(default_factory=lambda: {})
+    """Image ids by normalized reference (tags and digests) and by id"""
+
+    def add_image(self, image_id: str, references: list[str]) -> None:
+        """Indexes an image under its id and all its references (tags, digests)"""
+        self.images[image_id] = image_id
+        for reference in references:
+            if reference and reference != "<none>:<none>":
+                self.images[normalize_image_reference(reference)] = image_id
+
+    def image_id(self, image: str) -> Optional[str]:
+        """Returns the id of a local image from any of its references, None if missing"""
+        if image in self.images:
+            return self.images[image]
+        reference = normalize_image_reference(image)
+        if reference in self.images:
+            return self.images[reference]
+        # "repo:tag@digest" is known as "repo@digest"
+        name, _, digest = reference.partition("@")
+        if digest:
+            repository = name[: name.rfind(":")] if ":" in name.split("/")[-1] else name
+            return self.images.get(f"{repository}@{digest}")
+        return None
@@ -1,4 +1,4 @@
-from typing import Literal
+from typing import Literal, Optional
 
 ContainerState = Literal["unknown", "exists", "missing"]
 VolumeState = Literal["unknown", "exists", "missing"]
@@ -21,6 +21,8 @@ class StackState:
         self._volume_states: dict[str, VolumeState] = {}
         self._network_states: dict[str, NetworkState] = {}
         self._image_states: dict[str, ImageState] = {}
+        self._container_config_hashes: dict[str, str] = {}
+        self._image_ids: dict[str, str] = {}
 
     def get_container_state(self, container_id: str) -> ContainerState:
         return self._container_states.get(container_id, "unknown")
@@ -28,6 +30,13 @@ class StackState:
     def set_container_state(self, container_id: str, state: ContainerState):
         self._container_states[container_id] = state
 
+    def get_container_config_hash(self, container_id: str) -> Optional[str]:
+        """Config hash of a running container, None if unknown or not running"""
+        return self._container_config_hashes.get(container_id)
+
+    def set_container_config_hash(self, container_id: str, config_hash: str):
+        self._container_config_hashes[container_id] = config_hash
+
     def get_volume_state(self, volume_id: str) -> ContainerState:
         return self._volume_states.get(volume_id, "unknown")
 
@@ -46,6 +55,13 @@ class StackState:
     def set_image_state(self, image_id: str, state: ImageState):
         self._image_states[image_id] = state
 
+    def get_image_id(self, image_id: str) -> Optional[str]:
+        """Local id (digest) of an existing image, None if unknown"""
+        return self._image_ids.get(image_id)
+
+    def set_image_id(self, image_id: str, local_id: str):
+        self._image_ids[image_id] = local_id
+
     def __repr__(self):
         return (
             f"{self.__class__.__name__}("
@@ -1,4 +1,5 @@
 from containup.business.commands.container_operator import ContainerOperator
+from containup.business.commands.service_config_hash import CONFIG_HASH_LABEL
 from containup.business.live_state.stack_state import StackState
 from containup.stack.stack import Stack
 
@@ -9,24 +10,43 @@ class StackStateResolver:
         pass
 
     def resolve(self, stack: Stack) -> StackState:
+        """
+        Reads the live state of everything the stack needs.
+
+        Only one listing per kind of object is done, whatever the size of the stack
+        or the number of objects on the host.
+        """
         state = StackState()
+        inventory = self._operator.inventory(
+            container_names=[s.container_name_safe() for s in stack.services],
+            volume_names=[v.name for v in stack.volumes],
+            network_names=[n.name for n in stack.networks],
+        )
+
         for network in stack.networks:
-            exists = self._operator.network_exists(network.name)
+            exists = network.name in inventory.networks
             state.set_network_state(network.name, "exists" if exists else "missing")
 
         for volume in stack.volumes:
-            exists = self._operator.volume_exists(volume.name)
+            exists = volume.name in inventory.volumes
             state.set_volume_state(volume.name, "exists" if exists else "missing")
 
         for service in stack.services:
             image = service.image
-            exists = self._operator.image_exists(image)
-            state.set_image_state(image, "exists" if exists else "missing")
+            image_id = inventory.image_id(image)
+            state.set_image_state(image, "exists" if image_id else "missing")
+            if image_id:
+                state.set_image_id(image, image_id)
 
         for service in stack.services:
-            exists = self._operator.container_exists(service.container_name_safe())
+            container_name = service.container_name_safe()
+            container = inventory.containers.get(container_name)
             state.set_container_state(
-                service.container_name_safe(), "exists" if exists else "missing"
+                container_name, "exists" if container else "missing"
             )
+            if container and container.running:
+                config_hash = container.labels.get(CONFIG_HASH_LABEL)
+                if config_hash is not None:
+                    state.set_container_config_hash(container_name, config_hash)
 
         return state
@@ -5,7 +5,11 @@ from containup.business.audit.audit_secrets import AuditSecretsInspector
 from containup.business.audit.audit_service_healthcheck import (
     AuditServiceHealthcheckInspector,
 )
-from containup.business.audit.audit_service_mounts import AuditServiceMountsInspector
+from containup.business.audit.audit_service_group import AuditServiceGroupInspector
+from containup.business.audit.audit_service_mounts import (
+    AuditServiceMountsInspector,
+    AuditSharedBindSourcesInspector,
+)
 from containup.business.plugins.plugin_registry import Plugin
 
 
@@ -20,6 +24,8 @@ class PluginBuiltins(Plugin):
             AuditSecretsInspector(),
             AuditServiceHealthcheckInspector(),
             AuditServiceMountsInspector(),
+            AuditSharedBindSourcesInspector(),
             AuditServiceImageInspector(),
             AuditServiceDependsOnInspector(),
+            AuditServiceGroupInspector(),
         ]
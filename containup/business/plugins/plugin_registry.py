@@ -28,9 +28,10 @@ def register(inpector_cls: type[Plugin]):
     """
     Allows registering plugin.
 
-    Bring your own plugin
+    Bring your own plugin. Registering a plugin again does nothing.
     """
-    _registry.append(inpector_cls)
+    if inpector_cls not in _registry:
+        _registry.append(inpector_cls)
 
 
 class PluginRegistry:
@@ -0,0 +1,25 @@
+from containup.business.audit.audit_report import AuditInspectorStats
+
+
+def report_audit_stats(stats: list[AuditInspectorStats]) -> str:
+    """Table of the audit inspectors, most expensive first"""
+    rows = sorted(stats, key=lambda s: s.seconds, reverse=True)
+    width = max([len("inspector")] + [len(s.code) for s in rows])
+    lines = [
+        "🔎 Audit inspectors",
+        f"  {'inspector':<{width}} {'time (ms)':>10} {'alerts':>7} {'cached':>7}",
+    ]
+    for s in rows:
+        note = "  timed out" if s.timed_out else ""
+        lines.append(
+            f"  {s.code:<{width}} {s.seconds * 1000:>10.1f} {s.alerts:>7}"
+            f" {s.cached:>7}{note}"
+        )
+    total_seconds = sum(s.seconds for s in rows)
+    total_alerts = sum(s.alerts for s in rows)
+    total_cached = sum(s.cached for s in rows)
+    lines.append(
+        f"  {'total':<{width}} {total_seconds * 1000:>10.1f} {total_alerts:>7}"
+        f" {total_cached:>7}"
+    )
+    return "\n".join(lines)
@@ -0,0 +1,161 @@
+import json
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from containup.stack.stack import Stack
+from containup.utils.image_reference import normalize_image_reference
+
+
+@dataclass
+class ServiceTimings:
+    """Durations (seconds) measured for a service during an `up`"""
+
+    pull: float = 0.0
+    start: float = 0.0
+    health: float = 0.0
+
+    @property
+    def startup(self) -> float:
+        """Time from the start of the container to healthy. Pulls happen before."""
+        return self.start + self.health
+
+
+@dataclass
+class CriticalPath:
+    """Chain of dependencies with the longest startup time"""
+
+    services: list[str]
+    seconds: float
+
+
+def timings_from_trace(
+    stack: Stack, trace: dict[str, Any]
+) -> dict[str, ServiceTimings]:
+    """
+    Reads durations of a trace written by `up --trace-out`.
+
+    Container runs and health waits are summed per service. A pull is reported
+    on every service using the image.
+    """
+    services_by_container = {s.container_name_safe(): s.name for s in stack.services}
+    timings = {s.name: ServiceTimings() for s in stack.services}
+    pulls: dict[str, float] = {}
+    for event in trace.get("traceEvents", []):
+        if event.get("ph") != "X":
+            continue
+        resource = str(event.get("args", {}).get("resource", ""))
+        seconds = float(event.get("dur", 0)) / 1_000_000
+        if event.get("cat") == "image" and event.get("name") == "pull":
+            image = normalize_image_reference(resource)
+            pulls[image] = pulls.get(image, 0.0) + seconds
+        elif event.get("cat") == "container" and resource in services_by_container:
+            service_timings = timings[services_by_container[resource]]
+            if event.get("name") == "run":
+                service_timings.start += seconds
+            elif event.get("name") == "health wait":
+                service_timings.health += seconds
+    for service in stack.services:
+        timings[service.name].pull = pulls.get(
+            normalize_image_reference(service.image), 0.0
+        )
+    return timings
+
+
+def critical_path(stack: Stack, timings: dict[str, ServiceTimings]) -> CriticalPath:
+    """
+    Longest chain of `depends_on`, weighted by startup time (run and health wait).
+
+    A service starts once all its dependencies are healthy, so the last service
+    of this chain is healthy at the earliest after the path's total time.
+    """
+    finish: dict[str, float] = {}
+    previous: dict[str, Optional[str]] = {}
+    for service in stack.get_services_sorted():
+        before = max(service.depends_on, key=lambda d: finish[d], default=None)
+        previous[service.name] = before
+        finish[service.name] = (finish[before] if before else 0.0) + timings.get(
+            service.name, ServiceTimings()
+        ).startup
+    last = max(finish, key=lambda name: finish[name], default=None)
+    if last is None:
+        return CriticalPath([], 0.0)
+    path: list[str] = []
+    current: Optional[str] = last
+    while current is not None:
+        path.append(current)
+        current = previous[current]
+    return CriticalPath(list(reversed(path)), finish[last])
+
+
+def graph_json(
+    stack: Stack, timings: Optional[dict[str, ServiceTimings]] = None
+) -> str:
+    """Dependency graph as JSON, with timings and critical path when given"""
+    path = critical_path(stack, timings) if timings is not None else None
+    on_path = set(path.services) if path else set[str]()
+    services: list[dict[str, Any]] = []
+    for service in stack.get_services_sorted():
+        node: dict[str, Any] = {
+            "name": service.name,
+            "image": service.image,
+            "depends_on": list(service.depends_on),
+        }
+        if timings is not None:
+            t = timings.get(service.name, ServiceTimings())
+            node["timings"] = {"pull": t.pull, "start": t.start, "health": t.health}
+            node["critical"] = service.name in on_path
+        services.append(node)
+    graph: dict[str, Any] = {
+        "stack": stack.name,
+        "services": services,
+        "edges": [
+            {"from": dependency, "to": service["name"]}
+            for service in services
+            for dependency in service["depends_on"]
+        ],
+    }
+    if path is not None:
+        graph["critical_path"] = path.services
+        graph["critical_path_seconds"] = path.seconds
+    return json.dumps(graph, indent=2)
+
+
+def graph_dot(stack: Stack, timings: Optional[dict[str, ServiceTimings]] = None) -> str:
+    """
+    Dependency graph in Graphviz DOT. Edges go from a dependency to the services
+    depending on it (start order). The critical path, if timings are given, is red.
+    """
+    path = critical_path(stack, timings) if timings is not None else None
+    on_path = path.services if path else []
+    lines = [
+        f"digraph {_dot_id(stack.name)} {{",
+        "  rankdir=LR;",
+        "  node [shape=box];",
+    ]
+    if path is not None:
+        lines.append(f'  label="critical path: {path.seconds:.1f}s";')
+    for service in stack.get_services_sorted():
+        label = f"{service.name}\\n{service.image}"
+        if timings is not None:
+            t = timings.get(service.name, ServiceTimings())
+            label += (
+                f"\\npull {t.pull:.1f}s | start {t.start:.1f}s | health {t.health:.1f}s"
+            )
+        style = ", color=red, penwidth=2" if service.name in on_path else ""
+        lines.append(f'  {_dot_id(service.name)} [label="{label}"{style}];')
+    for service in stack.get_services_sorted():
+        for dependency in service.depends_on:
+            critical = (
+                dependency in on_path
+                and service.name in on_path
+                and on_path.index(service.name) == on_path.index(dependency) + 1
+            )
+            style = " [color=red, penwidth=2]" if critical else ""
+            lines.append(f"  {_dot_id(dependency)} -> {_dot_id(service.name)}{style};")
+    lines.append("}")
+    return "\n".join(lines)
+
+
+def _dot_id(name: str) -> str:
+    escaped = name.replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
@@ -13,6 +13,7 @@ from containup.business.execution_listener import (
     ExecutionEvtContainer,
     ExecutionEvtContainerRemoved,
     ExecutionEvtContainerRun,
+    ExecutionEvtContainerUnchanged,
     ExecutionEvtImage,
     ExecutionEvtImagePull,
     ExecutionListener,
@@ -85,6 +86,17 @@ def report_standard(
         )
         lines.append("")
 
+    if len(audit_report):
+        counts = ", ".join(
+            f"{audit_report.count(severity)} {severity.value}"
+            for severity in [
+                AuditAlertType.CRITICAL,
+                AuditAlertType.WARN,
+                AuditAlertType.INFO,
+            ]
+        )
+        lines.append(f"🔎 Audit: {counts}")
+
     return "\n".join(lines)
 
 
@@ -101,10 +113,7 @@ def report_volume(
     state: StackState,
     live_operations: bool,
 ) -> list[str]:
-    volume_evts: list[ExecutionEvtVolume] = []
-    for evt in evts.get_events():
-        if isinstance(evt, ExecutionEvtVolume) and evt.volume_id == volume.name:
-            volume_evts.append(evt)
+    volume_evts = evts.events_of(ExecutionEvtVolume, volume.name)
     line = f"  - {volume.name:<{max_key_len}} : " + " → ".join(
         volume_evt_summaries(
             state.get_volume_state(volume.name), volume_evts, live_operations
@@ -120,11 +129,7 @@ def report_network(
     state: StackState,
     live_operations: bool,
 ) -> list[str]:
-
-    network_evts: list[ExecutionEvtNetwork] = []
-    for evt in evts.get_events():
-        if isinstance(evt, ExecutionEvtNetwork) and evt.network_id == network.name:
-            network_evts.append(evt)
+    network_evts = evts.events_of(ExecutionEvtNetwork, network.name)
     line = f"  - {network.name:<{max_key_len}} : " + " → ".join(
         network_evt_summaries(
             state.get_network_state(network.name), network_evts, live_operations
@@ -196,13 +201,9 @@ def report_container(
     container_number_fmt: str = "" + str(container_number) + "."
 
     container_state = state.get_container_state(c.container_name_safe())
-    container_evts: list[ExecutionEvtContainer] = []
-    for evt in execution_listener.get_events():
-        if (
-            isinstance(evt, ExecutionEvtContainer)
-            and evt.container_id == c.container_name_safe()
-        ):
-            container_evts.append(evt)
+    container_evts = execution_listener.events_of(
+        ExecutionEvtContainer, c.container_name_safe()
+    )
     container_evt_summary = " → ".join(
         container_evt_summaries(container_state, container_evts, live_operations)
     )
@@ -213,10 +214,8 @@ def report_container(
 
     # Image
 
-    image_evts: list[ExecutionEvtImage] = []
-    for evt in execution_listener.get_events():
-        if isinstance(evt, ExecutionEvtImage) and evt.image_id == c.image:
-            image_evts.append(evt)
+    # the same image may be written differently in services, but is pulled once
+    image_evts = execution_listener.events_of(ExecutionEvtImage, c.image)
 
     image_evt_summary = " → ".join(
         image_evt_summaries(state.get_image_state(c.image), image_evts, live_operations)
@@ -244,7 +243,13 @@ def report_container(
                 port_lines.append(f"{p.host_port}:{p.container_port}/{p.protocol}")
             else:
                 port_lines.append(f"{p.container_port}/{p.protocol}")
-        lines.extend(item_names.format(item_names.ports, [", ".join(port_lines)]))
+        ports_lines = [", ".join(port_lines)]
+        ports_lines += tab_messages(
+            to_formatted_alert_list(
+                audit_report.query(AuditAlertLocation.service(c.name).ports())
+            )
+        )
+        lines.extend(item_names.format(item_names.ports, ports_lines))
 
     # Mounts (volumes)
 
@@ -333,11 +338,20 @@ def container_evt_summaries(
             )
         ]
     )
-    for evt in evts:
+    # a container removed then run again is a recreation
+    recreated = False
+    for i, evt in enumerate(evts):
         if isinstance(evt, ExecutionEvtContainerRemoved):
-            summaries.append("🔴 removed")
+            recreated = i + 1 < len(evts) and isinstance(
+                evts[i + 1], ExecutionEvtContainerRun
+            )
+            summaries.append("🔄 recreate" if recreated else "🔴 removed")
         elif isinstance(evt, ExecutionEvtContainerRun):
-            summaries.append("🟢 run")
+            if not recreated:
+                summaries.append("🟢 run")
+            recreated = False
+        elif isinstance(evt, ExecutionEvtContainerUnchanged):
+            summaries.append("⚪ unchanged")
     return summaries
 
 
@@ -0,0 +1,84 @@
+from typing import Any
+
+from containup.business.commands.rolling_gate import replaced_name
+from containup.business.execution_listener import ExecutionEvtOperation
+from containup.stack.stack import Stack
+
+TRACE_PROCESS_ID = 1
+
+
+def chrome_trace(
+    stack: Stack, operations: list[ExecutionEvtOperation]
+) -> dict[str, Any]:
+    """
+    Operation timings of a run in Chrome trace-event format.
+
+    The result, written as JSON, opens in chrome://tracing, Perfetto or
+    speedscope. Each service has its own track (thread) holding the operations
+    on its container. Images, volumes and networks have a track each.
+    Timestamps are microseconds since the first operation.
+    """
+    tracks: dict[str, int] = {}
+    container_tracks: dict[str, str] = {}
+    for service in stack.services:
+        tracks.setdefault(service.name, len(tracks) + 1)
+        container_name = service.container_name_safe()
+        container_tracks[container_name] = service.name
+        container_tracks[replaced_name(container_name)] = service.name
+
+    origin = min((op.start for op in operations), default=0.0)
+    trace_events: list[dict[str, Any]] = []
+    for op in operations:
+        if op.kind == "container":
+            track = container_tracks.get(op.resource, op.resource)
+        elif op.kind == "stack":
+            track = stack.name
+        else:
+            track = f"{op.kind} {op.resource}"
+        if track not in tracks:
+            tracks[track] = len(tracks) + 1
+        trace_events.append(
+            {
+                "name": op.operation,
+                "cat": op.kind,
+                "ph": "X",
+                "ts": _microseconds(op.start - origin),
+                "dur": _microseconds(op.duration),
+                "pid": TRACE_PROCESS_ID,
+                "tid": tracks[track],
+                "args": {"resource": op.resource, "failed": op.failed},
+            }
+        )
+
+    metadata: list[dict[str, Any]] = [
+        {
+            "name": "process_name",
+            "ph": "M",
+            "pid": TRACE_PROCESS_ID,
+            "args": {"name": f"containup {stack.name}"},
+        }
+    ]
+    for track, tid in tracks.items():
+        metadata.append(
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": TRACE_PROCESS_ID,
+                "tid": tid,
+                "args": {"name": track},
+            }
+        )
+        metadata.append(
+            {
+                "name": "thread_sort_index",
+                "ph": "M",
+                "pid": TRACE_PROCESS_ID,
+                "tid": tid,
+                "args": {"sort_index": tid},
+            }
+        )
+    return {"traceEvents": metadata + trace_events, "displayTimeUnit": "ms"}
+
+
+def _microseconds(seconds: float) -> int:
+    return int(round(seconds * 1_000_000))
@@ -1,7 +1,8 @@
 import argparse
 import logging
+import os
 import sys
-from typing import List, cast
+from typing import List, Optional, cast
 
 logger = logging.getLogger(__name__)
 
@@ -56,11 +57,57 @@ class Config:
         """When in dry-run mode, tells if we need to read the live system."""
         return bool(getattr(self._args, "live_check", False))
 
+    @property
+    def parallel(self) -> int:
+        """Maximum number of services handled at the same time. Defaults to 1."""
+        return int(getattr(self._args, "parallel", None) or 1)
+
+    @property
+    def pull_per_registry(self) -> int:
+        """Maximum number of images pulled at the same time from one registry."""
+        return int(getattr(self._args, "pull_per_registry", None) or 4)
+
+    @property
+    def trace_out(self) -> Optional[str]:
+        """File where operation timings are written (Chrome trace format), if any."""
+        return cast(Optional[str], getattr(self._args, "trace_out", None))
+
+    @property
+    def graph_format(self) -> str:
+        """Output format of the graph command: "dot" or "json"."""
+        return str(getattr(self._args, "format", None) or "dot")
+
+    @property
+    def timings(self) -> Optional[str]:
+        """Trace file (from `up --trace-out`) giving timings to the graph command."""
+        return cast(Optional[str], getattr(self._args, "timings", None))
+
+    @property
+    def audit_stats(self) -> bool:
+        """Prints the time spent and alerts found by each audit inspector."""
+        return bool(getattr(self._args, "audit_stats", False))
+
+    @property
+    def audit_timeout(self) -> float:
+        """Seconds after which an audit inspector without result is ignored."""
+        return float(getattr(self._args, "audit_timeout", None) or 60)
+
+    @property
+    def audit_cache(self) -> Optional[str]:
+        """File keeping audit results between runs, if any."""
+        return cast(Optional[str], getattr(self._args, "audit_cache", None))
+
+    @property
+    def docker_api_version(self) -> Optional[str]:
+        """Docker API version to use (like "1.41"), None to ask the daemon."""
+        return cast(Optional[str], getattr(self._args, "docker_api_version", None))
+
     def __repr__(self) -> str:
         return (
             f"Config(command={self.command!r}, "
             f"services={self.services!r}, "
             f"dry_run={self.dry_run!r}, "
+            f"parallel={self.parallel!r}, "
             f"extra_args={self.extra_args!r}, "
             f"args={self._args!r})"
         )
@@ -96,28 +143,76 @@ def containup_cli_args(prog: str, known_args: list[str]) -> Config:
     # check
     check_parser = subparsers.add_parser("check", help="Check the stack")
     _add_live_check(check_parser)
+    _add_docker_api_version(check_parser)
+    check_parser.add_argument(
+        "--audit-stats",
+        action="store_true",
+        help="Prints the time spent and alerts found by each audit inspector, most expensive first.",
+    )
+    check_parser.add_argument(
+        "--audit-timeout",
+        type=_positive_float,
+        default=60,
+        metavar="SECONDS",
+        help="Ignores audit inspectors without result after SECONDS. Defaults to 60.",
+    )
+    check_parser.add_argument(
+        "--audit-cache",
+        metavar="FILE",
+        help="Keeps audit results in FILE: next checks only inspect services that changed. Secret values are never written.",
+    )
     _add_extra_args(check_parser)
 
     # up
     up_parser = subparsers.add_parser("up")
     _add_dry_run(up_parser)
     _add_live_check(up_parser)
+    _add_docker_api_version(up_parser)
     up_parser.add_argument(
         "--service",
         nargs="*",
         help="If specified, launches only those services",
     )
+    _add_parallel(up_parser)
+    up_parser.add_argument(
+        "--pull-per-registry",
+        type=_positive_int,
+        default=4,
+        metavar="N",
+        help="Maximum number of images pulled at the same time from one registry. Defaults to 4.",
+    )
+    _add_trace_out(up_parser)
     _add_extra_args(up_parser)
 
     # down
     down_parser = subparsers.add_parser("down")
     _add_dry_run(down_parser)
     _add_live_check(down_parser)
+    _add_docker_api_version(down_parser)
     down_parser.add_argument(
         "--service", nargs="*", help="If specified, stops only those services"
     )
+    _add_parallel(down_parser)
+    _add_trace_out(down_parser)
     _add_extra_args(down_parser)
 
+    # graph
+    graph_parser = subparsers.add_parser(
+        "graph", help="Export the dependency graph of the stack"
+    )
+    graph_parser.add_argument(
+        "--format",
+        choices=["dot", "json"],
+        default="dot",
+        help="Output format: Graphviz DOT or JSON. Defaults to dot.",
+    )
+    graph_parser.add_argument(
+        "--timings",
+        metavar="FILE",
+        help="Trace written by `up --trace-out`. Annotates services with pull, start and health durations and highlights the critical path.",
+    )
+    _add_extra_args(graph_parser)
+
     args = parser.parse_args(args=known_args)
     config = Config(args)
 
@@ -140,6 +235,53 @@ def _add_live_check(parser: argparse.ArgumentParser) -> None:
     )
 
 
+def _add_docker_api_version(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--docker-api-version",
+        default=os.environ.get("DOCKER_API_VERSION") or None,
+        metavar="VERSION",
+        help="Docker API version to use (like 1.41), skips asking the daemon for its version when connecting. Defaults to the DOCKER_API_VERSION environment variable, if set.",
+    )
+
+
+def _add_parallel(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--parallel",
+        type=_positive_int,
+        default=1,
+        metavar="N",
+        help="Maximum number of services handled at the same time. With up, a service starts as soon as its dependencies are healthy. With down, a service is removed as soon as services depending on it are removed. Defaults to 1.",
+    )
+
+
+def _add_trace_out(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--trace-out",
+        metavar="FILE",
+        help="Writes the start and end of each docker operation to FILE (JSON, Chrome trace-event format), one track per service. Open it in chrome://tracing or https://ui.perfetto.dev.",
+    )
+
+
+def _positive_int(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid number: {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def _positive_float(value: str) -> float:
+    try:
+        number = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid number: {value!r}")
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be positive, got {value}")
+    return number
+
+
 def _add_extra_args(parser: argparse.ArgumentParser) -> None:
     parser.add_argument(
         "extra_args", nargs=argparse.REMAINDER, help="Your own arguments"
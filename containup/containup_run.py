@@ -1,15 +1,20 @@
 import logging
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 from .containup_cli import Config
-from containup.infra.runner.runner import StackRunner
 from .stack.stack import Stack
 
+if TYPE_CHECKING:
+    from containup.infra.runner.runner import OperatorBackend
+
 logger = logging.getLogger(__name__)
 
 
 def containup_run(
-    stack: Stack, config: Optional[Config] = None, debug: bool = False
+    stack: Stack,
+    config: Optional[Config] = None,
+    debug: bool = False,
+    backend: "OperatorBackend" = "docker",
 ) -> None:
     """
     Runs commands given from the config over the stack.
@@ -18,9 +23,39 @@ def containup_run(
         stack: stack to run
         config: if None (most ot your use cases) command line arguments will be taken from the CLI
         debug: to activate debug automatically (in case you don't have already configured a logger)
+        backend: "docker" (docker SDK, default) or "engine" (direct Docker Engine API calls)
+    """
+    # imported here: stacks importing containup only pay for the runner when run
+    from containup.infra.runner.runner import StackRunner
+
+    ensure_logging_configured(debug)
+    StackRunner(stack=stack, config=config, backend=backend).run()
+
+
+async def async_containup_run(
+    stack: Stack,
+    config: Optional[Config] = None,
+    debug: bool = False,
+    backend: "OperatorBackend" = "docker",
+) -> None:
+    """
+    Same as containup_run, as a coroutine, to run stacks from an asyncio application.
+
+    Pulls and health waits are awaited on the event loop: many stacks can run at the
+    same time from one loop, and cancelling the task stops the command. A failed
+    command raises ContainerOperatorException (containup_run exits the process).
+
+    Args:
+        stack: stack to run
+        config: if None, command line arguments will be taken from the CLI. When you
+            embed containup, you will usually build one with containup_cli_args(prog, args).
+        debug: to activate debug automatically (in case you don't have already configured a logger)
+        backend: "docker" (docker SDK, default) or "engine" (direct Docker Engine API calls)
     """
+    from containup.infra.runner.runner import StackRunner
+
     ensure_logging_configured(debug)
-    StackRunner(stack=stack, config=config).run()
+    await StackRunner(stack=stack, config=config, backend=backend).run_async()
 
 
 def ensure_logging_configured(debug: bool = False) -> None:
@@ -1,5 +1,7 @@
 import logging
-from typing import Optional, Tuple, cast
+import re
+import threading
+from typing import Any, Callable, Iterator, Optional, Tuple, cast
 
 import docker
 import docker.models
@@ -8,18 +10,34 @@ import docker.models.volumes
 
 from docker.utils import parse_repository_tag  # type: ignore
 from docker.errors import DockerException, ImageNotFound
-from docker.models.containers import Container
 
 from containup.business.commands.container_health_status import ContainerHealthStatus
 from containup.business.commands.container_operator import (
+    Cancellation,
+    ContainerNotFoundException,
     ContainerOperator,
     ContainerOperatorException,
+    HealthListener,
+)
+from containup.business.commands.service_config_hash import (
+    CONFIG_HASH_LABEL,
+    service_config_hash,
 )
 from containup.business.commands.user_interactions import UserInteractions
+from containup.business.live_state.live_inventory import LiveContainer, LiveInventory
+from containup.infra.docker.health_events import (
+    ContainerHealthWatcher,
+    EventFilters,
+    HealthEventStream,
+)
 from containup.infra.docker.healthcheck import healthcheck_to_docker_spec_unsafe
+from containup.infra.docker.labels import make_labels
 from containup.infra.docker.mounts import mounts_to_docker_specs
 from containup.infra.docker.ports import ports_to_docker_spec
+from containup.infra.docker.pull_progress import PullProgress
+from containup.infra.resource_pool import ResourcePool
 from containup.stack.network import Network
+from containup.stack.service_healthcheck import NoneHealthcheck
 from containup.stack.stack import Service
 from containup.stack.volume import Volume
 from containup.utils.secret_value import SecretValue
@@ -28,12 +46,26 @@ logger = logging.getLogger(__name__)
 
 
 class DockerOperator(ContainerOperator):
+    """
+    Container operator using the docker SDK.
+
+    Calls take a client from the pool for their duration, so operations running
+    at the same time never share a client (and its underlying HTTP session).
+
+    Args:
+        clients: pool of docker clients, sized to the number of operations running
+            at the same time
+    """
 
     def __init__(
-        self, client: docker.DockerClient, system_interactions: UserInteractions
+        self,
+        clients: ResourcePool[docker.DockerClient],
+        system_interactions: UserInteractions,
     ):
-        self.client = client
+        self.clients = clients
         self._system_interactions = system_interactions
+        self._health_watchers: dict[str, ContainerHealthWatcher] = {}
+        self._health_watchers_lock = threading.Lock()
 
     def image_exists(self, image: str) -> bool:
         try:
@@ -41,7 +73,8 @@ class DockerOperator(ContainerOperator):
             tag = image_tag or "latest"  # type: ignore
             exists = False
             try:
-                self.client.images.get(image)
+                with self.clients.lease() as client:
+                    client.images.get(image)
                 logger.debug(f"Image {repository}:{tag} already downloaded.")
                 exists = True
             except ImageNotFound:
@@ -50,29 +83,55 @@ class DockerOperator(ContainerOperator):
                 pass
         except DockerException as e:
             raise ContainerOperatorException(
-                "Can not check if image [{image}] exists : {e}"
+                f"Can not check if image [{image}] exists : {e}"
             ) from e
         return exists
 
-    def image_pull(self, image: str):
+    def image_pull(self, image: str, cancellation: Optional[Cancellation] = None):
         try:
             (repository, image_tag) = cast(Tuple[str, str], parse_repository_tag(image))
             tag = image_tag or "latest"  # type: ignore
             logger.info(f"Image {repository}:{tag} pulling image")
-            pull_log = self.client.api.pull(  # type: ignore
-                repository, tag=tag, stream=True, all_tags=False, decode=True
-            )  # type: ignore
-            for log in pull_log:  # type: ignore
-                logger.info((log.get("status") or "unknown status") + " " + (log.get("progress") or ""))  # type: ignore
+            with self.clients.lease() as client:
+                pull_log = client.api.pull(  # type: ignore
+                    repository, tag=tag, stream=True, all_tags=False, decode=True
+                )  # type: ignore
+                progress = PullProgress(f"{repository}:{tag}")
+                for log in pull_log:  # type: ignore
+                    # the SDK can't interrupt its stream: stop at the next message
+                    if cancellation is not None and cancellation.cancelled:
+                        raise ContainerOperatorException(
+                            f"Pull of image [{image}] cancelled"
+                        )
+                    message = cast(dict[str, Any], log)
+                    if message.get("error"):
+                        raise ContainerOperatorException(
+                            f"Can not pull image [{image}] : {message.get('error')}"
+                        )
+                    progress.update(message)
+                progress.finish()
         except DockerException as e:
             raise ContainerOperatorException(
-                "Can not pull image [{image}] : {e}"
+                f"Can not pull image [{image}] : {e}"
+            ) from e
+
+    def image_id(self, image: str) -> Optional[str]:
+        try:
+            with self.clients.lease() as client:
+                attrs = cast(dict[str, Any], client.api.inspect_image(image))  # type: ignore
+            return str(attrs.get("Id") or "") or None
+        except ImageNotFound:
+            return None
+        except DockerException as e:
+            raise ContainerOperatorException(
+                f"Can not get id of image [{image}] : {e}"
             ) from e
 
     def container_exists(self, container_name: str) -> bool:
         """Asks docker if the container exists"""
         try:
-            self.client.containers.get(container_name)
+            with self.clients.lease() as client:
+                client.containers.get(container_name)
             return True
         except docker.errors.NotFound:  # type: ignore
             return False
@@ -84,43 +143,73 @@ class DockerOperator(ContainerOperator):
     def container_remove(self, container_name: str):
         """Removes a container"""
         try:
-            self.client.containers.get(container_name).remove(force=True)
+            with self.clients.lease() as client:
+                client.api.remove_container(container_name, force=True)  # type: ignore
+        except docker.errors.NotFound as e:  # type: ignore
+            raise ContainerNotFoundException(
+                f"Container {container_name} not found"
+            ) from e
         except DockerException as e:
             raise ContainerOperatorException(
                 f"Failed to remove container {container_name}: {e}"
             ) from e
 
+    def container_rename(self, container_name: str, new_name: str) -> None:
+        """Renames a container"""
+        try:
+            with self.clients.lease() as client:
+                client.api.rename(container_name, new_name)  # type: ignore
+        except docker.errors.NotFound as e:  # type: ignore
+            raise ContainerNotFoundException(
+                f"Container {container_name} not found"
+            ) from e
+        except DockerException as e:
+            raise ContainerOperatorException(
+                f"Failed to rename container {container_name} to {new_name}: {e}"
+            ) from e
+
     def container_run(self, stack_name: str, service: Service):
         """Run a container like docker run"""
         container_name = service.container_name or service.name
 
         try:
 
+            # listen to health events before the container starts, to miss none of them
+            if service.healthcheck is not None and not isinstance(
+                service.healthcheck, NoneHealthcheck
+            ):
+                self._health_watcher(stack_name).start()
+
             # time to reveal secrects, no other way is possible to give them to docker
             env = {
                 key: value.reveal() if isinstance(value, SecretValue) else value
                 for key, value in service.environment.items()
             }
 
+            # stamp the config, so that next up knows if the container changed
+            config_hash = service_config_hash(service, self.image_id(service.image))
+            labels = {**service.labels, CONFIG_HASH_LABEL: config_hash}
+
             # create the container
-            logger.info(f"Container {container_name}: create")
-            container = self.client.containers.create(  # type: ignore
-                image=service.image,
-                command=service.command,
-                name=container_name,
-                environment=env,
-                ports=ports_to_docker_spec(service.ports),  # type: ignore
-                mounts=mounts_to_docker_specs(service.mounts_all()),
-                network=service.network,
-                labels=make_labels(stack_name, service.labels),
-                restart_policy=service.restart,
-                detach=True,
-                healthcheck=healthcheck_to_docker_spec_unsafe(service.healthcheck),
-            )
+            with self.clients.lease() as client:
+                logger.info(f"Container {container_name}: create")
+                container = client.containers.create(  # type: ignore
+                    image=service.image,
+                    command=service.command,
+                    name=container_name,
+                    environment=env,
+                    ports=ports_to_docker_spec(service.ports),  # type: ignore
+                    mounts=mounts_to_docker_specs(service.mounts_all()),
+                    network=service.network,
+                    labels=make_labels(stack_name, labels),
+                    restart_policy=service.restart,
+                    detach=True,
+                    healthcheck=healthcheck_to_docker_spec_unsafe(service.healthcheck),
+                )
 
-            logger.info(f"Container {container_name}: starting")
-            container.start()
-            logger.info(f"Container {container_name}: launched")
+                logger.info(f"Container {container_name}: starting")
+                container.start()
+                logger.info(f"Container {container_name}: launched")
 
         except DockerException as e:
             raise ContainerOperatorException(
@@ -128,45 +217,164 @@ class DockerOperator(ContainerOperator):
             ) from e
 
     def container_health_status(self, container_name: str) -> ContainerHealthStatus:
-        container: Container = self.client.containers.get(container_name)
-        container.reload()
-        state: dict[str, str] = container.attrs.get("State", {})
-        health: str = str(state.get("Health", {}).get("Status") or "unknown")  # type: ignore
-        status: str = str(state.get("Status") or "unknown")  # type: ignore
-        return ContainerHealthStatus(status, health)
+        return self._container_inspect_health(container_name)[1]
+
+    def container_wait_healthy(
+        self, stack_name: str, container_name: str, timeout: float
+    ) -> ContainerHealthStatus:
+        return self._health_watcher(stack_name).wait(container_name, timeout)
+
+    def container_health_subscribe(
+        self, stack_name: str, listener: HealthListener
+    ) -> Optional[Callable[[], None]]:
+        return self._health_watcher(stack_name).subscribe(listener)
+
+    def _container_inspect_health(
+        self, container_name: str
+    ) -> tuple[str, ContainerHealthStatus]:
+        """Returns container id and health status, with only one API call"""
+        try:
+            with self.clients.lease() as client:
+                attrs = cast(
+                    dict[str, Any],
+                    client.api.inspect_container(container_name),  # type: ignore
+                )
+        except DockerException as e:
+            raise ContainerOperatorException(
+                f"Failed to inspect container {container_name}: {e}"
+            ) from e
+        state: dict[str, Any] = attrs.get("State") or dict[str, Any]()
+        health_state: dict[str, Any] = state.get("Health") or dict[str, Any]()
+        health: str = str(health_state.get("Status") or "unknown")
+        status: str = str(state.get("Status") or "unknown")
+        return str(attrs.get("Id") or ""), ContainerHealthStatus(status, health)
+
+    def _health_watcher(self, stack_name: str) -> ContainerHealthWatcher:
+        with self._health_watchers_lock:
+            watcher = self._health_watchers.get(stack_name)
+            if watcher is None:
+                watcher = ContainerHealthWatcher(
+                    stack_name, self._open_events, self._container_inspect_health
+                )
+                self._health_watchers[stack_name] = watcher
+            return watcher
+
+    def _open_events(self, filters: EventFilters) -> HealthEventStream:
+        # the stream lives as long as the stack runs: it gets its own client
+        client = self.clients.create_unpooled()
+        stream = client.events(decode=True, filters=filters)  # type: ignore
+        return _ClientEventStream(client, stream)  # type: ignore
 
     def volume_exists(self, volume_name: str) -> bool:
         """Asks docker if the volume exists"""
-        docker_volumes: list[docker.models.volumes.Volume] = self.client.volumes.list()  # type: ignore
+        with self.clients.lease() as client:
+            docker_volumes: list[docker.models.volumes.Volume] = client.volumes.list(filters={"name": volume_name})  # type: ignore
         return any(v.name == volume_name for v in docker_volumes)
 
     def volume_create(self, stack_name: str, volume: Volume) -> None:
         """Creates the volume"""
-        self.client.volumes.create(  # type: ignore
-            name=volume.name,
-            driver=volume.driver,
-            driver_opts=volume.driver_opts,
-            labels=make_labels(stack_name, volume.labels),
-        )
+        with self.clients.lease() as client:
+            client.volumes.create(  # type: ignore
+                name=volume.name,
+                driver=volume.driver,
+                driver_opts=volume.driver_opts,
+                labels=make_labels(stack_name, volume.labels),
+            )
 
     def network_exists(self, network_name: str) -> bool:
         """Asks docker if the network exists"""
-        docker_networks: list[docker.models.networks.Network] = self.client.networks.list()  # type: ignore
+        with self.clients.lease() as client:
+            docker_networks: list[docker.models.networks.Network] = client.networks.list(names=[network_name])  # type: ignore
         return any(net.name == network_name for net in docker_networks)
 
     def network_create(self, stack_name: str, network: Network) -> None:
         """Creates the network"""
-        self.client.networks.create(
-            name=network.name,
-            driver=network.driver,
-            options=network.options,
-            labels=make_labels(stack_name, None),
-        )
-
-
-def make_labels(stack_name: str, labels: Optional[dict[str, str]]) -> dict[str, str]:
-    return {
-        **(labels or {}),
-        "com.docker.compose.project": stack_name,
-        "containup.stack.name": stack_name,
-    }
+        with self.clients.lease() as client:
+            client.networks.create(
+                name=network.name,
+                driver=network.driver,
+                options=network.options,
+                labels=make_labels(stack_name, None),
+            )
+
+    def inventory(
+        self,
+        container_names: list[str],
+        volume_names: list[str],
+        network_names: list[str],
+    ) -> LiveInventory:
+        """
+        Lists everything with 4 API calls, using low-level API to avoid inspecting
+        each object. Containers, volumes and networks are filtered by name on the
+        daemon side (filters are partial matches, exact names are checked here).
+        """
+        inventory = LiveInventory()
+        try:
+            with self.clients.lease() as client:
+                api = client.api
+                if container_names:
+                    name_filters = [f"^/{re.escape(name)}$" for name in container_names]
+                    containers = cast(
+                        list[dict[str, Any]],
+                        api.containers(all=True, filters={"name": name_filters}),  # type: ignore
+                    )
+                    for c in containers:
+                        names: list[str] = c.get("Names") or []
+                        labels: dict[str, str] = c.get("Labels") or {}
+                        for name in names:
+                            inventory.containers[name.lstrip("/")] = LiveContainer(
+                                name.lstrip("/"), c.get("State") == "running", labels
+                            )
+                if volume_names:
+                    volumes = cast(
+                        dict[str, Any],
+                        api.volumes(filters={"name": volume_names}),  # type: ignore
+                    )
+                    for v in cast(list[dict[str, Any]], volumes.get("Volumes") or []):
+                        inventory.volumes.add(str(v.get("Name")))
+                if network_names:
+                    networks = cast(
+                        list[dict[str, Any]],
+                        api.networks(names=network_names),  # type: ignore
+                    )
+                    for n in networks:
+                        inventory.networks.add(str(n.get("Name")))
+                images = cast(list[dict[str, Any]], api.images())  # type: ignore
+                for i in images:
+                    tags: list[str] = i.get("RepoTags") or []
+                    digests: list[str] = i.get("RepoDigests") or []
+                    references = tags + digests
+                    inventory.add_image(str(i.get("Id")), references)
+        except DockerException as e:
+            raise ContainerOperatorException(
+                f"Failed to list docker objects: {e}"
+            ) from e
+        return inventory
+
+    def close(self) -> None:
+        """Stops listening to docker events. The client pool belongs to the caller."""
+        with self._health_watchers_lock:
+            watchers = list(self._health_watchers.values())
+            self._health_watchers.clear()
+        for watcher in watchers:
+            watcher.close()
+
+
+class _ClientEventStream:
+    """Events stream that also closes the client it was opened with"""
+
+    def __init__(self, client: docker.DockerClient, stream: HealthEventStream):
+        self._client = client
+        self._stream = stream
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        return iter(self._stream)
+
+    def close(self) -> None:
+        self._stream.close()
+        self._client.close()  # type: ignore
+
+
+def close_client(client: docker.DockerClient) -> None:
+    """Closes a docker client (its HTTP session)"""
+    client.close()  # type: ignore
@@ -0,0 +1,263 @@
+import http.client
+import json
+import logging
+import os
+import socket
+from dataclasses import dataclass
+from typing import Any, Iterator, Optional
+from urllib.parse import quote, urlencode
+
+from containup.infra.resource_pool import PoolStats, ResourcePool
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOCKET_PATH = "/var/run/docker.sock"
+"""Where the docker daemon listens by default"""
+
+
+class EngineApiError(Exception):
+    """Docker Engine API answered with an error"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(f"{status}: {message}")
+        self.status = status
+        self.message = message
+
+
+class EngineApiNotFound(EngineApiError):
+    """Docker Engine API answered 404: the object does not exist"""
+
+
+@dataclass
+class EngineResponse:
+    status: int
+    data: Any
+    """Decoded JSON body, None if the body is empty"""
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTP connection over a unix socket"""
+
+    def __init__(self, socket_path: str, timeout: Optional[float] = None):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout is not None:
+            sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self.sock = sock
+
+
+class EngineStream:
+    """
+    Stream of JSON messages (pull progress, events), read line by line.
+
+    The stream owns its connection. Closing it, even from another thread,
+    interrupts the reading.
+    """
+
+    def __init__(self, connection: UnixHTTPConnection, response: Any):
+        self._connection = connection
+        self._response = response
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        while True:
+            line = self._response.readline()
+            if not line:
+                return
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+    def close(self) -> None:
+        sock = self._connection.sock
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        self._connection.close()
+
+
+class EngineClient:
+    """
+    Minimal Docker Engine API client over the unix socket.
+
+    Connections are kept alive and reused between calls: a call takes an idle
+    connection from the pool, or opens one if there is none, and gives it back
+    when the response is fully read. Responses are plain decoded JSON, nothing
+    else is built.
+
+    Args:
+        socket_path (str): path of the docker daemon socket
+        api_version (str): API version to ask for (like "1.41"). None uses the
+            daemon's own version.
+        timeout (float): socket timeout in seconds for regular calls. Streams
+            (pull, events) have no timeout.
+        max_connections (int): maximum number of connections for regular calls,
+            usually the number of operations running at the same time. Streams
+            have their own connections.
+    """
+
+    def __init__(
+        self,
+        socket_path: str = DEFAULT_SOCKET_PATH,
+        api_version: Optional[str] = None,
+        timeout: Optional[float] = 60,
+        max_connections: int = 10,
+    ):
+        self.socket_path = socket_path
+        self._prefix = f"/v{api_version}" if api_version else ""
+        self._timeout = timeout
+        self._pool = ResourcePool(
+            lambda: UnixHTTPConnection(self.socket_path, self._timeout),
+            max_connections,
+            close=lambda connection: connection.close(),
+        )
+
+    @classmethod
+    def from_env(
+        cls, api_version: Optional[str] = None, max_connections: int = 10
+    ) -> "EngineClient":
+        """Client for DOCKER_HOST if it is a unix socket, the default socket otherwise."""
+        host = os.environ.get("DOCKER_HOST", "")
+        if not host:
+            return cls(
+                DEFAULT_SOCKET_PATH, api_version, max_connections=max_connections
+            )
+        if host.startswith("unix://"):
+            return cls(
+                host[len("unix://") :], api_version, max_connections=max_connections
+            )
+        raise ValueError(
+            f"DOCKER_HOST={host} is not supported by the engine API backend, only unix sockets are."
+        )
+
+    def get(self, path: str, query: Optional[dict[str, Any]] = None) -> Any:
+        return self.request("GET", path, query).data
+
+    def post(
+        self,
+        path: str,
+        query: Optional[dict[str, Any]] = None,
+        body: Optional[Any] = None,
+    ) -> Any:
+        return self.request("POST", path, query, body).data
+
+    def delete(self, path: str, query: Optional[dict[str, Any]] = None) -> Any:
+        return self.request("DELETE", path, query).data
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        query: Optional[dict[str, Any]] = None,
+        body: Optional[Any] = None,
+    ) -> EngineResponse:
+        """Sends a request, raises EngineApiError if the status is an error"""
+        url = self._url(path, query)
+        payload, headers = _encode_body(body)
+        connection, reused = self._pool.acquire()
+        try:
+            try:
+                connection.request(method, url, body=payload, headers=headers)
+                response = connection.getresponse()
+            except (http.client.RemoteDisconnected, BrokenPipeError):
+                # the daemon closed an idle connection, retry once on a new one
+                if not reused:
+                    raise
+                connection.close()
+                connection.request(method, url, body=payload, headers=headers)
+                response = connection.getresponse()
+            raw = response.read()
+        except BaseException:
+            self._pool.release(connection, reusable=False)
+            raise
+        self._pool.release(connection, reusable=not response.will_close)
+        data = _decode_body(response.status, raw)
+        _raise_for_status(response.status, data)
+        return EngineResponse(response.status, data)
+
+    def stream(
+        self,
+        method: str,
+        path: str,
+        query: Optional[dict[str, Any]] = None,
+        body: Optional[Any] = None,
+    ) -> EngineStream:
+        """Sends a request whose answer is a stream of JSON messages"""
+        url = self._url(path, query)
+        payload, headers = _encode_body(body)
+        connection = UnixHTTPConnection(self.socket_path, None)
+        try:
+            connection.request(method, url, body=payload, headers=headers)
+            response = connection.getresponse()
+            if response.status >= 400:
+                raw = response.read()
+                _raise_for_status(response.status, _decode_body(response.status, raw))
+        except BaseException:
+            connection.close()
+            raise
+        return EngineStream(connection, response)
+
+    @property
+    def connections_opened(self) -> int:
+        """Number of connections opened so far for regular calls"""
+        return self._pool.stats().created
+
+    def pool_stats(self) -> PoolStats:
+        """Statistics of the connection pool"""
+        return self._pool.stats()
+
+    def close(self) -> None:
+        """Closes idle connections"""
+        self._pool.close()
+
+    def _url(self, path: str, query: Optional[dict[str, Any]]) -> str:
+        url = self._prefix + path
+        if query:
+            url += "?" + urlencode(
+                {
+                    key: json.dumps(value) if isinstance(value, dict) else value
+                    for key, value in query.items()
+                    if value is not None
+                }
+            )
+        return url
+
+
+def path_param(value: str) -> str:
+    """Escapes a name (container, image) to be put in an API path"""
+    return quote(value, safe="/:@")
+
+
+def _encode_body(body: Optional[Any]) -> tuple[Optional[bytes], dict[str, str]]:
+    if body is None:
+        return None, {}
+    return json.dumps(body).encode("utf-8"), {"Content-Type": "application/json"}
+
+
+def _decode_body(status: int, raw: bytes) -> Any:
+    """
+    JSON body of a response. Error bodies that are not JSON (from a proxy in
+    front of the daemon, for example) are given as their text, to be the message.
+    """
+    if not raw:
+        return None
+    try:
+        return json.loads(raw)
+    except ValueError:
+        if status < 400:
+            raise
+        return raw.decode("utf-8", errors="replace").strip()
+
+
+def _raise_for_status(status: int, data: Any) -> None:
+    if status < 400:
+        return
+    message = str(data.get("message")) if isinstance(data, dict) else str(data)  # type: ignore
+    if status == 404:
+        raise EngineApiNotFound(status, message)
+    raise EngineApiError(status, message)
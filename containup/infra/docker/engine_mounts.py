@@ -0,0 +1,85 @@
+from typing import Any, Optional, Union
+
+from containup.stack.service_mounts import (
+    BindMount,
+    ServiceMounts,
+    ServiceMount,
+    TmpfsMount,
+    VolumeMount,
+)
+from containup.utils.absolute_paths import to_absolute_path
+
+_BYTE_UNITS = {"b": 1, "k": 1024, "m": 1024 * 1024, "g": 1024 * 1024 * 1024}
+
+
+def mounts_to_engine_specs(mount_list: ServiceMounts) -> list[dict[str, Any]]:
+    """
+    Transforms service mounts into the Mounts of the Engine API (HostConfig), the
+    same as docker.types.Mount builds, without importing the docker SDK.
+    """
+    return [mount_to_engine_specs(m) for m in mount_list]
+
+
+def mount_to_engine_specs(mount: ServiceMount) -> dict[str, Any]:
+    """Transforms one service mount into an Engine API mount"""
+    if isinstance(mount, BindMount):
+        spec = _spec(mount, "bind", to_absolute_path(mount.source), mount.consistency)
+        if mount.propagation is not None:
+            spec["BindOptions"] = {"Propagation": mount.propagation}
+
+    elif isinstance(mount, VolumeMount):
+        spec = _spec(mount, "volume", mount.source, mount.consistency)
+        volume_options: dict[str, Any] = {}
+        if mount.no_copy:
+            volume_options["NoCopy"] = True
+        if mount.labels:
+            volume_options["Labels"] = mount.labels
+        if mount.driver_config:
+            volume_options["DriverConfig"] = dict(mount.driver_config)
+        if volume_options:
+            spec["VolumeOptions"] = volume_options
+
+    elif isinstance(mount, TmpfsMount):  # type: ignore
+        spec = _spec(mount, "tmpfs", "", mount.consistency)
+        tmpfs_options: dict[str, Any] = {}
+        if mount.tmpfs_mode:
+            tmpfs_options["Mode"] = mount.tmpfs_mode
+        if mount.tmpfs_size:
+            tmpfs_options["SizeBytes"] = parse_bytes(mount.tmpfs_size)
+        if tmpfs_options:
+            spec["TmpfsOptions"] = tmpfs_options
+
+    else:
+        raise TypeError(f"Unsupported mount type: {type(mount)}")
+    return spec
+
+
+def _spec(
+    mount: ServiceMount, mount_type: str, source: str, consistency: Optional[str]
+) -> dict[str, Any]:
+    spec: dict[str, Any] = {
+        "Target": mount.target,
+        "Source": source,
+        "Type": mount_type,
+        "ReadOnly": False if mount.read_only is None else mount.read_only,
+    }
+    if consistency:
+        spec["Consistency"] = consistency
+    return spec
+
+
+def parse_bytes(size: Union[int, str]) -> int:
+    """Parses a size like "64m" (b, k, m, g units, 1024 based) into bytes"""
+    if isinstance(size, int):
+        return size
+    value = size.strip().lower()
+    if len(value) > 2 and value.endswith("b") and value[-2].isalpha():
+        value = value[:-1]
+    unit = value[-1:] if value[-1:].isalpha() else "b"
+    digits = value[:-1] if value[-1:].isalpha() else value
+    if unit not in _BYTE_UNITS:
+        raise ValueError(f"Invalid size {size}: the unit should be one of b, k, m or g")
+    try:
+        return int(float(digits) * _BYTE_UNITS[unit])
+    except ValueError as e:
+        raise ValueError(f"Invalid size {size}") from e
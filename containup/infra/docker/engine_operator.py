@@ -0,0 +1,394 @@
+import logging
+import re
+import threading
+from typing import Any, Callable, Optional
+
+from containup.business.commands.container_health_status import ContainerHealthStatus
+from containup.business.commands.container_operator import (
+    Cancellation,
+    ContainerNotFoundException,
+    ContainerOperator,
+    ContainerOperatorException,
+    HealthListener,
+)
+from containup.business.commands.service_config_hash import (
+    CONFIG_HASH_LABEL,
+    service_config_hash,
+)
+from containup.business.live_state.live_inventory import LiveContainer, LiveInventory
+from containup.infra.docker.engine_client import (
+    EngineApiError,
+    EngineApiNotFound,
+    EngineClient,
+    path_param,
+)
+from containup.infra.docker.health_events import (
+    ContainerHealthWatcher,
+    EventFilters,
+    HealthEventStream,
+)
+from containup.infra.docker.labels import make_labels
+from containup.infra.docker.healthcheck import healthcheck_to_docker_spec
+from containup.infra.docker.engine_mounts import mounts_to_engine_specs
+from containup.infra.docker.ports import ports_to_docker_spec
+from containup.infra.docker.pull_progress import PullProgress
+from containup.stack.network import Network
+from containup.stack.service_healthcheck import NoneHealthcheck
+from containup.stack.stack import Service
+from containup.stack.volume import Volume
+from containup.utils.image_reference import normalize_image_reference
+from containup.utils.secret_value import SecretValue
+
+logger = logging.getLogger(__name__)
+
+
+class EngineApiOperator(ContainerOperator):
+    """
+    Container operator talking directly to the Docker Engine API.
+
+    Same behavior as DockerOperator, without the docker SDK model layer: each
+    operation is one HTTP call on a kept-alive unix socket connection, and only
+    the fields containup needs are read from the answers.
+    """
+
+    def __init__(self, client: EngineClient):
+        self.client = client
+        self._health_watchers: dict[str, ContainerHealthWatcher] = {}
+        self._health_watchers_lock = threading.Lock()
+
+    def image_exists(self, image: str) -> bool:
+        return self.image_id(image) is not None
+
+    def image_pull(self, image: str, cancellation: Optional[Cancellation] = None):
+        reference = normalize_image_reference(image)
+        repository, tag = _split_tag(reference)
+        logger.info(f"Image {repository}:{tag} pulling image")
+        try:
+            stream = self.client.stream(
+                "POST", "/images/create", {"fromImage": repository, "tag": tag}
+            )
+            try:
+                if cancellation is not None:
+                    # closing the stream interrupts the reading right away
+                    cancellation.on_cancel(stream.close)
+                progress = PullProgress(f"{repository}:{tag}")
+                for log in stream:
+                    if log.get("error"):
+                        raise ContainerOperatorException(
+                            f"Can not pull image [{image}] : {log.get('error')}"
+                        )
+                    progress.update(log)
+                if cancellation is not None and cancellation.cancelled:
+                    raise ContainerOperatorException(
+                        f"Pull of image [{image}] cancelled"
+                    )
+                progress.finish()
+            finally:
+                stream.close()
+        except (EngineApiError, OSError) as e:
+            if cancellation is not None and cancellation.cancelled:
+                raise ContainerOperatorException(
+                    f"Pull of image [{image}] cancelled"
+                ) from e
+            raise ContainerOperatorException(
+                f"Can not pull image [{image}] : {e}"
+            ) from e
+
+    def image_id(self, image: str) -> Optional[str]:
+        try:
+            attrs: dict[str, Any] = self.client.get(f"/images/{path_param(image)}/json")
+            return str(attrs.get("Id") or "") or None
+        except EngineApiNotFound:
+            return None
+        except (EngineApiError, OSError) as e:
+            raise ContainerOperatorException(
+                f"Can not get id of image [{image}] : {e}"
+            ) from e
+
+    def container_exists(self, container_name: str) -> bool:
+        try:
+            self._container_inspect(container_name)
+            return True
+        except ContainerNotFoundException:
+            return False
+
+    def container_remove(self, container_name: str):
+        try:
+            self.client.delete(
+                f"/containers/{path_param(container_name)}", {"force": "1"}
+            )
+        except EngineApiNotFound as e:
+            raise ContainerNotFoundException(
+                f"Container {container_name} not found"
+            ) from e
+        except (EngineApiError, OSError) as e:
+            raise ContainerOperatorException(
+                f"Failed to remove container {container_name}: {e}"
+            ) from e
+
+    def container_rename(self, container_name: str, new_name: str) -> None:
+        try:
+            self.client.post(
+                f"/containers/{path_param(container_name)}/rename", {"name": new_name}
+            )
+        except EngineApiNotFound as e:
+            raise ContainerNotFoundException(
+                f"Container {container_name} not found"
+            ) from e
+        except (EngineApiError, OSError) as e:
+            raise ContainerOperatorException(
+                f"Failed to rename container {container_name} to {new_name}: {e}"
+            ) from e
+
+    def container_run(self, stack_name: str, service: Service):
+        container_name = service.container_name_safe()
+        try:
+            # listen to health events before the container starts, to miss none of them
+            if service.healthcheck is not None and not isinstance(
+                service.healthcheck, NoneHealthcheck
+            ):
+                self._health_watcher(stack_name).start()
+
+            config_hash = service_config_hash(service, self.image_id(service.image))
+            labels = {**service.labels, CONFIG_HASH_LABEL: config_hash}
+
+            logger.info(f"Container {container_name}: create")
+            self.client.post(
+                "/containers/create",
+                {"name": container_name},
+                container_create_body(stack_name, service, labels),
+            )
+            logger.info(f"Container {container_name}: starting")
+            self.client.post(f"/containers/{path_param(container_name)}/start")
+            logger.info(f"Container {container_name}: launched")
+        except (EngineApiError, OSError) as e:
+            raise ContainerOperatorException(
+                f"Failed to run container {container_name} : {e}"
+            ) from e
+
+    def container_health_status(self, container_name: str) -> ContainerHealthStatus:
+        return self._container_inspect_health(container_name)[1]
+
+    def container_wait_healthy(
+        self, stack_name: str, container_name: str, timeout: float
+    ) -> ContainerHealthStatus:
+        return self._health_watcher(stack_name).wait(container_name, timeout)
+
+    def container_health_subscribe(
+        self, stack_name: str, listener: HealthListener
+    ) -> Optional[Callable[[], None]]:
+        return self._health_watcher(stack_name).subscribe(listener)
+
+    def _container_inspect(self, container_name: str) -> dict[str, Any]:
+        try:
+            return self.client.get(f"/containers/{path_param(container_name)}/json")
+        except EngineApiNotFound as e:
+            raise ContainerNotFoundException(
+                f"Container {container_name} not found"
+            ) from e
+        except (EngineApiError, OSError) as e:
+            raise ContainerOperatorException(
+                f"Failed to inspect container {container_name}: {e}"
+            ) from e
+
+    def _container_inspect_health(
+        self, container_name: str
+    ) -> tuple[str, ContainerHealthStatus]:
+        attrs = self._container_inspect(container_name)
+        state: dict[str, Any] = attrs.get("State") or {}
+        health_state: dict[str, Any] = state.get("Health") or {}
+        health = str(health_state.get("Status") or "unknown")
+        status = str(state.get("Status") or "unknown")
+        return str(attrs.get("Id") or ""), ContainerHealthStatus(status, health)
+
+    def _health_watcher(self, stack_name: str) -> ContainerHealthWatcher:
+        with self._health_watchers_lock:
+            watcher = self._health_watchers.get(stack_name)
+            if watcher is None:
+                watcher = ContainerHealthWatcher(
+                    stack_name, self._open_events, self._container_inspect_health
+                )
+                self._health_watchers[stack_name] = watcher
+            return watcher
+
+    def _open_events(self, filters: EventFilters) -> HealthEventStream:
+        return self.client.stream("GET", "/events", {"filters": filters})
+
+    def volume_exists(self, volume_name: str) -> bool:
+        try:
+            self.client.get(f"/volumes/{path_param(volume_name)}")
+            return True
+        except EngineApiNotFound:
+            return False
+        except (EngineApiError, OSError) as e:
+            raise ContainerOperatorException(
+                f"Failed to check if volume {volume_name} exists: {e}"
+            ) from e
+
+    def volume_create(self, stack_name: str, volume: Volume) -> None:
+        body = _without_none(
+            {
+                "Name": volume.name,
+                "Driver": volume.driver,
+                "DriverOpts": volume.driver_opts,
+                "Labels": make_labels(stack_name, volume.labels),
+            }
+        )
+        try:
+            self.client.post("/volumes/create", body=body)
+        except (EngineApiError, OSError) as e:
+            raise ContainerOperatorException(
+                f"Failed to create volume {volume.name}: {e}"
+            ) from e
+
+    def network_exists(self, network_name: str) -> bool:
+        return network_name in self._network_names([network_name])
+
+    def network_create(self, stack_name: str, network: Network) -> None:
+        body = _without_none(
+            {
+                "Name": network.name,
+                "Driver": network.driver,
+                "Options": network.options,
+                "Labels": make_labels(stack_name, None),
+            }
+        )
+        try:
+            self.client.post("/networks/create", body=body)
+        except (EngineApiError, OSError) as e:
+            raise ContainerOperatorException(
+                f"Failed to create network {network.name}: {e}"
+            ) from e
+
+    def inventory(
+        self,
+        container_names: list[str],
+        volume_names: list[str],
+        network_names: list[str],
+    ) -> LiveInventory:
+        """
+        Lists everything with 4 API calls. Containers, volumes and networks are
+        filtered by name on the daemon side (partial matches, exact names are
+        checked here).
+        """
+        inventory = LiveInventory()
+        try:
+            if container_names:
+                name_filters = [f"^/{re.escape(name)}$" for name in container_names]
+                containers: list[dict[str, Any]] = self.client.get(
+                    "/containers/json",
+                    {"all": "1", "filters": {"name": name_filters}},
+                )
+                for c in containers:
+                    names: list[str] = c.get("Names") or []
+                    labels: dict[str, str] = c.get("Labels") or {}
+                    for name in names:
+                        inventory.containers[name.lstrip("/")] = LiveContainer(
+                            name.lstrip("/"), c.get("State") == "running", labels
+                        )
+            if volume_names:
+                volumes: dict[str, Any] = self.client.get(
+                    "/volumes", {"filters": {"name": volume_names}}
+                )
+                volume_list: list[dict[str, Any]] = volumes.get("Volumes") or []
+                for v in volume_list:
+                    inventory.volumes.add(str(v.get("Name")))
+            if network_names:
+                inventory.networks.update(self._network_names(network_names))
+            images: list[dict[str, Any]] = self.client.get("/images/json")
+            for i in images:
+                tags: list[str] = i.get("RepoTags") or []
+                digests: list[str] = i.get("RepoDigests") or []
+                inventory.add_image(str(i.get("Id")), tags + digests)
+        except (EngineApiError, OSError) as e:
+            raise ContainerOperatorException(
+                f"Failed to list docker objects: {e}"
+            ) from e
+        return inventory
+
+    def _network_names(self, network_names: list[str]) -> set[str]:
+        try:
+            networks: list[dict[str, Any]] = self.client.get(
+                "/networks", {"filters": {"name": network_names}}
+            )
+        except (EngineApiError, OSError) as e:
+            raise ContainerOperatorException(f"Failed to list networks: {e}") from e
+        return {str(n.get("Name")) for n in networks}
+
+    def close(self) -> None:
+        """Stops listening to docker events. The client belongs to the caller."""
+        with self._health_watchers_lock:
+            watchers = list(self._health_watchers.values())
+            self._health_watchers.clear()
+        for watcher in watchers:
+            watcher.close()
+
+
+def container_create_body(
+    stack_name: str, service: Service, labels: dict[str, str]
+) -> dict[str, Any]:
+    """Body of the `POST /containers/create` call for a service"""
+
+    # time to reveal secrects, no other way is possible to give them to docker
+    env = [
+        f"{key}={value.reveal() if isinstance(value, SecretValue) else value}"
+        for key, value in service.environment.items()
+    ]
+
+    ports = ports_to_docker_spec(service.ports)
+    port_bindings: dict[str, list[dict[str, str]]] = {}
+    for key, bindings in ports.items():
+        port_bindings[key] = [
+            (
+                {"HostIp": binding[0], "HostPort": str(binding[1])}
+                if isinstance(binding, tuple)
+                else {"HostIp": "", "HostPort": str(binding)}
+            )
+            for binding in bindings
+        ]
+
+    host_config: dict[str, Any] = {
+        "Mounts": mounts_to_engine_specs(service.mounts_all()),
+        "PortBindings": port_bindings,
+    }
+    if service.restart is not None:
+        host_config["RestartPolicy"] = service.restart
+    if service.network is not None:
+        host_config["NetworkMode"] = service.network
+
+    body: dict[str, Any] = {
+        "Image": service.image,
+        "Env": env,
+        "Labels": make_labels(stack_name, labels),
+        "ExposedPorts": {key: {} for key in ports},
+        "HostConfig": host_config,
+    }
+    if service.command:
+        body["Cmd"] = service.command
+    if service.network is not None:
+        body["NetworkingConfig"] = {"EndpointsConfig": {service.network: {}}}
+    if service.healthcheck is not None:
+        spec = healthcheck_to_docker_spec(service.healthcheck)
+        body["Healthcheck"] = {
+            "Test": spec["test"],
+            "Interval": spec["interval"],
+            "Timeout": spec["timeout"],
+            "Retries": spec["retries"],
+            "StartPeriod": spec["start_period"],
+            "StartInterval": spec["start_interval"],
+        }
+    return body
+
+
+def _split_tag(reference: str) -> tuple[str, str]:
+    """Splits a normalized reference in repository and tag (or digest)"""
+    if "@" in reference:
+        name, _, digest = reference.partition("@")
+        repository = name[: name.rfind(":")] if ":" in name.split("/")[-1] else name
+        return repository, digest
+    repository, _, tag = reference.rpartition(":")
+    return repository, tag
+
+
+def _without_none(values: dict[str, Any]) -> dict[str, Any]:
+    return {key: value for key, value in values.items() if value is not None}
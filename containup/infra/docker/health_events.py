@@ -0,0 +1,194 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Iterator, Optional, Protocol
+
+from containup.business.commands.container_health_status import ContainerHealthStatus
+from containup.business.commands.container_operator import HealthListener
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL_SECONDS = 1.0
+"""Polling interval used only when the events stream is not available."""
+
+
+class HealthEventStream(Protocol):
+    """Stream of decoded docker events, like the one returned by `client.events()`."""
+
+    def __iter__(self) -> Iterator[dict[str, Any]]: ...
+
+    def close(self) -> None: ...
+
+
+EventFilters = dict[str, list[str]]
+
+
+class ContainerHealthWatcher:
+    """
+    Waits for containers of one stack to become healthy, using one shared docker
+    events stream (`health_status`, `die` and `destroy` events) instead of polling.
+
+    Every container waiting at the same time is served by the same stream. Events
+    are indexed by container id so that events from a removed container with the
+    same name (for example the one replaced during `up`) are never mistaken for
+    the new one.
+
+    If the stream breaks, waiters fall back to polling the container state.
+    Listeners (see subscribe) let asyncio waiters follow the same stream.
+
+    Args:
+        stack_name (str): only containers labelled with this stack are watched
+        open_events (Callable): opens an events stream with the given filters
+        inspect (Callable): returns (container id, health status) of a container by name
+    """
+
+    def __init__(
+        self,
+        stack_name: str,
+        open_events: Callable[[EventFilters], HealthEventStream],
+        inspect: Callable[[str], tuple[str, ContainerHealthStatus]],
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._filters: EventFilters = {
+            "type": ["container"],
+            "event": ["health_status", "die", "destroy"],
+            "label": [f"containup.stack.name={stack_name}"],
+        }
+        self._open_events = open_events
+        self._inspect = inspect
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._stream: Optional[HealthEventStream] = None
+        self._thread: Optional[threading.Thread] = None
+        self._sequence = 0
+        self._events: dict[str, tuple[int, ContainerHealthStatus]] = {}
+        self._listeners: list[HealthListener] = []
+
+    def start(self) -> None:
+        """
+        Connects to the events stream, if not already done.
+
+        Call it before starting containers so that no event is missed.
+        """
+        with self._cond:
+            if self._stream is not None:
+                return
+            stream = self._open_events(self._filters)
+            self._stream = stream
+            self._thread = threading.Thread(
+                target=self._read,
+                args=(stream,),
+                name="containup-health-events",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def close(self) -> None:
+        """Closes the events stream."""
+        with self._cond:
+            stream, thread = self._stream, self._thread
+            self._stream, self._thread = None, None
+        if stream is not None:
+            stream.close()
+        if thread is not None:
+            thread.join(timeout=5)
+
+    def subscribe(self, listener: HealthListener) -> Optional[Callable[[], None]]:
+        """
+        Calls listener(True) after each event, listener(False) when the stream
+        stops. Returns the function ending the subscription, None if there is no
+        stream to follow.
+        """
+        try:
+            self.start()
+        except Exception as e:
+            logger.warning(f"Docker events not available, polling instead: {e}")
+            return None
+        with self._cond:
+            if self._stream is None:
+                return None
+            self._listeners.append(listener)
+
+        def unsubscribe() -> None:
+            with self._cond:
+                if listener in self._listeners:
+                    self._listeners.remove(listener)
+
+        return unsubscribe
+
+    def wait(self, container_name: str, timeout: float) -> ContainerHealthStatus:
+        """
+        Blocks until the container is healthy, unhealthy or exited, or timeout
+        (seconds) expired.
+
+        Returns the last known status.
+        """
+        try:
+            self.start()
+        except Exception as e:
+            logger.warning(f"Docker events not available, polling instead: {e}")
+        deadline = self._clock() + timeout
+
+        with self._cond:
+            last_sequence = self._sequence
+        container_id, status = self._inspect(container_name)
+
+        while True:
+            with self._cond:
+                event = self._events.get(container_id)
+                if event is not None and event[0] > last_sequence:
+                    last_sequence, status = event
+                remaining = deadline - self._clock()
+                if is_health_final(status) or remaining <= 0:
+                    return status
+                if self._stream is not None:
+                    self._cond.wait(remaining)
+                    continue
+            time.sleep(min(remaining, POLL_INTERVAL_SECONDS))
+            container_id, status = self._inspect(container_name)
+
+    def _read(self, stream: HealthEventStream) -> None:
+        try:
+            for event in stream:
+                self._handle(event)
+        except Exception as e:
+            logger.debug(f"Docker events stream stopped: {e}")
+        finally:
+            with self._cond:
+                if self._stream is stream:
+                    self._stream = None
+                listeners, self._listeners = self._listeners, []
+                self._cond.notify_all()
+            for listener in listeners:
+                listener(False)
+
+    def _handle(self, event: dict[str, Any]) -> None:
+        action = str(event.get("Action") or event.get("status") or "")
+        container_id = str(event.get("id") or event.get("Actor", {}).get("ID") or "")
+        if not container_id:
+            return
+        with self._cond:
+            previous = self._events.get(container_id)
+            status = (
+                previous[1] if previous else ContainerHealthStatus("running", "unknown")
+            )
+            if action.startswith("health_status"):
+                health = action.partition(":")[2].strip() or "unknown"
+                status = ContainerHealthStatus(status.status, health)
+            elif action == "die":
+                status = ContainerHealthStatus("exited", status.health)
+            elif action == "destroy":
+                status = ContainerHealthStatus("removed", status.health)
+            else:
+                return
+            self._sequence += 1
+            self._events[container_id] = (self._sequence, status)
+            self._cond.notify_all()
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener(True)
+
+
+def is_health_final(status: ContainerHealthStatus) -> bool:
+    """Tells if waiting for health can stop: see ContainerHealthStatus.is_final()"""
+    return status.is_final()
@@ -0,0 +1,10 @@
+from typing import Optional
+
+
+def make_labels(stack_name: str, labels: Optional[dict[str, str]]) -> dict[str, str]:
+    """Labels of everything created for the stack, with the stack labels added"""
+    return {
+        **(labels or {}),
+        "com.docker.compose.project": stack_name,
+        "containup.stack.name": stack_name,
+    }
@@ -0,0 +1,117 @@
+import logging
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_INTERVAL_SECONDS = 5.0
+"""Minimum delay between two progress summaries of the same pull"""
+
+_LAYER_DONE = ("Pull complete", "Already exists")
+_LAYER_DOWNLOADED = ("Download complete", "Verifying Checksum", "Extracting")
+
+
+@dataclass
+class PullSnapshot:
+    """State of a pull at one moment, as logged in summaries"""
+
+    image: str
+    layers: int
+    layers_done: int
+    bytes_done: int
+    bytes_total: int
+
+    @property
+    def percent(self) -> float:
+        """Downloaded part of layers whose size is known, 0 to 100"""
+        if self.bytes_total == 0:
+            return 100.0 if self.layers and self.layers == self.layers_done else 0.0
+        return min(100.0, 100.0 * self.bytes_done / self.bytes_total)
+
+    def summary(self) -> str:
+        return (
+            f"{self.layers_done}/{self.layers} layers, "
+            f"{_megabytes(self.bytes_done)} / {_megabytes(self.bytes_total)} "
+            f"({self.percent:.0f}%)"
+        )
+
+
+class PullProgress:
+    """
+    Folds the messages of a docker pull stream into per-layer progress.
+
+    Each raw message is logged at DEBUG only. At INFO, a summary (layers done,
+    bytes downloaded, percentage) is logged at most every `interval` seconds,
+    and once when the pull ends. Summaries carry the snapshot in the log record
+    (`record.containup_pull`) for structured log handlers.
+
+    Args:
+        image (str): image being pulled, for messages
+        interval (float): minimum seconds between two summaries
+    """
+
+    def __init__(
+        self,
+        image: str,
+        interval: float = SUMMARY_INTERVAL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.image = image
+        self._interval = interval
+        self._clock = clock
+        self._next_summary = clock() + interval
+        self._layers: dict[str, tuple[int, int, bool]] = {}
+        """Layer id to (bytes done, bytes total, done)"""
+
+    def update(self, message: dict[str, Any]) -> None:
+        """Takes one decoded message of the pull stream"""
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                f"Image {self.image}: {message.get('id') or ''} "
+                f"{message.get('status') or ''} {message.get('progress') or ''}"
+            )
+        layer = message.get("id")
+        status = str(message.get("status") or "")
+        if layer and not status.startswith("Pulling from"):
+            self._update_layer(str(layer), status, message)
+        now = self._clock()
+        if now >= self._next_summary:
+            self._next_summary = now + self._interval
+            self._log("pulling")
+
+    def finish(self) -> None:
+        """Logs the final summary"""
+        self._log("pulled")
+
+    def snapshot(self) -> PullSnapshot:
+        return PullSnapshot(
+            image=self.image,
+            layers=len(self._layers),
+            layers_done=sum(1 for _, _, done in self._layers.values() if done),
+            bytes_done=sum(current for current, _, _ in self._layers.values()),
+            bytes_total=sum(total for _, total, _ in self._layers.values()),
+        )
+
+    def _update_layer(self, layer: str, status: str, message: dict[str, Any]) -> None:
+        current, total, done = self._layers.get(layer, (0, 0, False))
+        detail: dict[str, Any] = message.get("progressDetail") or {}
+        if status == "Downloading":
+            current = int(detail.get("current") or current)
+            total = int(detail.get("total") or total)
+        elif status in _LAYER_DOWNLOADED:
+            current = total
+        elif status in _LAYER_DONE:
+            current, done = total, True
+        self._layers[layer] = (current, total, done)
+
+    def _log(self, verb: str) -> None:
+        snapshot = self.snapshot()
+        logger.info(
+            f"Image {self.image}: {verb}, {snapshot.summary()}",
+            extra={"containup_pull": {**asdict(snapshot), "percent": snapshot.percent}},
+        )
+
+
+def _megabytes(size: int) -> str:
+    return f"{size / 1_000_000:.1f} MB"
@@ -1,15 +1,17 @@
 from dataclasses import dataclass
-from typing import Dict
+from typing import Dict, Optional
 
 from containup import Service, Volume, Network
 from containup.business.commands.container_health_status import ContainerHealthStatus
 from containup.business.commands.container_operator import (
+    Cancellation,
+    ContainerNotFoundException,
     ContainerOperator,
-    ContainerOperatorException,
 )
 from containup.business.execution_listener import (
     ExecutionListener,
 )
+from containup.business.live_state.live_inventory import LiveContainer, LiveInventory
 
 
 class DryRunOperator(ContainerOperator):
@@ -27,9 +29,12 @@ class DryRunOperator(ContainerOperator):
 
         return exists
 
-    def image_pull(self, image: str):
+    def image_pull(self, image: str, cancellation: Optional[Cancellation] = None):
         pass
 
+    def image_id(self, image: str) -> Optional[str]:
+        return None
+
     def container_exists(self, container_name: str) -> bool:
         result = container_name in self._containers
 
@@ -40,9 +45,18 @@ class DryRunOperator(ContainerOperator):
             del self._containers[container_name]
 
         except KeyError as e:
-            raise ContainerOperatorException(
+            raise ContainerNotFoundException(
+                f"Container {container_name} not found"
+            ) from e
+
+    def container_rename(self, container_name: str, new_name: str) -> None:
+        try:
+            container = self._containers.pop(container_name)
+        except KeyError as e:
+            raise ContainerNotFoundException(
                 f"Container {container_name} not found"
             ) from e
+        self._containers[new_name] = DryRunContainer(new_name, container.service)
 
     def container_run(self, stack_name: str, service: Service):
         container_id: str = service.container_name or service.name
@@ -51,6 +65,11 @@ class DryRunOperator(ContainerOperator):
     def container_health_status(self, container_name: str) -> ContainerHealthStatus:
         return ContainerHealthStatus("running", "healthy")
 
+    def container_wait_healthy(
+        self, stack_name: str, container_name: str, timeout: float
+    ) -> ContainerHealthStatus:
+        return ContainerHealthStatus("running", "healthy")
+
     def volume_exists(self, volume_name: str) -> bool:
         result = volume_name in self._volumes
         return result
@@ -65,6 +84,26 @@ class DryRunOperator(ContainerOperator):
     def network_create(self, stack_name: str, network: Network) -> None:
         self._networks[network.name] = DryRunNetwork(network.name, network)
 
+    def inventory(
+        self,
+        container_names: list[str],
+        volume_names: list[str],
+        network_names: list[str],
+    ) -> LiveInventory:
+        inventory = LiveInventory(
+            containers={
+                name: LiveContainer(name, True) for name in self._containers.keys()
+            },
+            volumes=set(self._volumes.keys()),
+            networks=set(self._networks.keys()),
+        )
+        for image in self._images:
+            inventory.add_image(image, [image])
+        return inventory
+
+    def close(self) -> None:
+        pass
+
 
 @dataclass
 class DryRunContainer:
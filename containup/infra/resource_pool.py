@@ -0,0 +1,151 @@
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from typing import Callable, Generic, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class PoolStats:
+    """Counters of a :class:`ResourcePool`, to tune its size."""
+
+    max_size: int
+    """Maximum number of resources"""
+
+    created: int = 0
+    """Resources created since the beginning"""
+
+    acquired: int = 0
+    """Number of times a resource was taken"""
+
+    reused: int = 0
+    """Number of times an idle resource was taken instead of creating one"""
+
+    waits: int = 0
+    """Number of times a caller had to wait because every resource was in use"""
+
+    wait_seconds: float = 0.0
+    """Total time spent waiting for a resource"""
+
+    in_use: int = 0
+    """Resources currently taken"""
+
+    max_in_use: int = 0
+    """Highest number of resources taken at the same time"""
+
+    @property
+    def reuse_rate(self) -> float:
+        """Part of acquisitions served by an idle resource (0 to 1)"""
+        return self.reused / self.acquired if self.acquired else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"size {self.max_size}, created {self.created}, in use {self.in_use} "
+            f"(max {self.max_in_use}), acquired {self.acquired}, "
+            f"reuse rate {self.reuse_rate:.0%}, waits {self.waits} "
+            f"({self.wait_seconds:.3f}s)"
+        )
+
+
+class ResourcePool(Generic[T]):
+    """
+    Thread-safe pool of resources (clients, connections), created on demand.
+
+    At most max_size resources exist at the same time. When all of them are in
+    use, callers wait for one to be released. Resources are created lazily: a pool
+    that is never used creates nothing.
+
+    Args:
+        factory: creates a new resource
+        max_size: maximum number of resources
+        close: releases a resource that is not kept (broken, or idle when closing the pool)
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], T],
+        max_size: int,
+        close: Optional[Callable[[T], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_size < 1:
+            raise ValueError(f"max_size must be at least 1, got {max_size}")
+        self._factory = factory
+        self._close = close
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._idle: list[T] = []
+        self._size = 0
+        self._stats = PoolStats(max_size)
+
+    def acquire(self) -> tuple[T, bool]:
+        """
+        Takes a resource, waiting if all of them are in use.
+
+        Returns the resource and True if it is an idle one being reused. Give it
+        back with :meth:`release`.
+        """
+        with self._cond:
+            if not self._idle and self._size >= self._stats.max_size:
+                self._stats.waits += 1
+                start = self._clock()
+                while not self._idle and self._size >= self._stats.max_size:
+                    self._cond.wait()
+                self._stats.wait_seconds += self._clock() - start
+            self._stats.acquired += 1
+            self._stats.in_use += 1
+            self._stats.max_in_use = max(self._stats.max_in_use, self._stats.in_use)
+            if self._idle:
+                self._stats.reused += 1
+                return self._idle.pop(), True
+            self._size += 1
+            self._stats.created += 1
+        try:
+            return self._factory(), False
+        except BaseException:
+            with self._cond:
+                self._size -= 1
+                self._stats.in_use -= 1
+                self._cond.notify()
+            raise
+
+    def release(self, resource: T, reusable: bool = True) -> None:
+        """Gives back a resource. Not reusable ones (broken) are closed and forgotten."""
+        with self._cond:
+            self._stats.in_use -= 1
+            if reusable:
+                self._idle.append(resource)
+            else:
+                self._size -= 1
+            self._cond.notify()
+        if not reusable and self._close is not None:
+            self._close(resource)
+
+    @contextmanager
+    def lease(self) -> Iterator[T]:
+        """Takes a resource for the duration of the with block"""
+        resource, _ = self.acquire()
+        try:
+            yield resource
+        finally:
+            self.release(resource)
+
+    def create_unpooled(self) -> T:
+        """Creates a resource outside of the pool, for long-lived uses like streams"""
+        return self._factory()
+
+    def stats(self) -> PoolStats:
+        """Snapshot of the pool counters"""
+        with self._cond:
+            return replace(self._stats)
+
+    def close(self) -> None:
+        """Closes idle resources. The pool can still be used afterwards."""
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+        if self._close is not None:
+            for resource in idle:
+                self._close(resource)
@@ -1,21 +1,56 @@
-from typing import Optional
-
-import docker
+import asyncio
+import json
+import logging
+import os
+from typing import TYPE_CHECKING, Literal, Optional
 
 from containup import containup_cli, Config
+from containup.business.audit.audit_cache import AuditCache
 from containup.business.audit.audit_registry import AuditRegistry
+from containup.business.audit.audit_report import AuditResult
+from containup.business.commands.async_command_down import AsyncCommandDown
+from containup.business.commands.async_command_up import AsyncCommandUp
+from containup.business.commands.async_container_operator import (
+    ThreadedAsyncContainerOperator,
+)
 from containup.business.commands.command_down import CommandDown
 from containup.business.commands.command_up import CommandUp
+from containup.business.commands.timed_operator import (
+    OperationTimer,
+    TimedContainerOperator,
+)
 from containup.business.execution_listener import ExecutionListenerStd
 from containup.business.live_state.stack_state import StackState
 from containup.business.live_state.stack_state_resolver import StackStateResolver
 from containup.business.plugins.plugin_builtins import PluginBuiltins
 from containup.business.plugins.plugin_registry import PluginRegistry, register
+from containup.business.reports.report_audit_stats import report_audit_stats
 from containup.business.reports.report_generator import ReportGenerator
-from containup.infra.docker.docker_operator import DockerOperator
+from containup.business.reports.report_graph import (
+    graph_dot,
+    graph_json,
+    timings_from_trace,
+)
+from containup.business.reports.report_trace import chrome_trace
+from containup.business.commands.container_operator import ContainerOperator
+from containup.infra.docker.engine_client import EngineClient
 from containup.infra.dryrun.dryrun_operator import DryRunOperator
+from containup.infra.resource_pool import PoolStats, ResourcePool
 from containup.infra.user_interactions_cli import UserInteractionsCLI
 from containup.stack.stack import Stack
+from containup.utils.secret_providers import resolver as secret_resolver
+
+if TYPE_CHECKING:
+    import docker
+
+logger = logging.getLogger(__name__)
+
+OperatorBackend = Literal["docker", "engine"]
+"""
+How containup talks to docker:
+- "docker": through the docker SDK (default)
+- "engine": directly to the Docker Engine API on the unix socket, with kept-alive connections
+"""
 
 
 class StackRunner:
@@ -26,27 +61,179 @@ class StackRunner:
     - choose implementation of container
     - choose implementation of user interactions
     - give access to main run()
+
+    Args:
+        backend: how to talk to docker, see OperatorBackend
     """
 
-    def __init__(self, stack: Stack, config: Optional[Config] = None):
+    def __init__(
+        self,
+        stack: Stack,
+        config: Optional[Config] = None,
+        backend: OperatorBackend = "docker",
+    ):
         self.stack = stack
         self.config = config or containup_cli()
-        self.client: docker.DockerClient = docker.from_env()
+        self.backend = backend
+        # one docker client (or connection) per operation running at the same time,
+        # plus one for health checks, created when first needed: check, graph and
+        # dry-runs without --live-check never connect to docker
+        pool_size = max(self.config.parallel, self.config.pull_per_registry) + 1
+        self._docker_clients: ResourcePool["docker.DockerClient"] = ResourcePool(
+            self._docker_client, pool_size, close=_close_docker_client
+        )
+        self._client: Optional["docker.DockerClient"] = None
+        self._engine_client = (
+            EngineClient.from_env(
+                api_version=self.config.docker_api_version,
+                max_connections=pool_size,
+            )
+            if backend == "engine"
+            else None
+        )
         self._execution_listener = ExecutionListenerStd()
         register(PluginBuiltins)
         self._plugin_registry = PluginRegistry()
-        self._audit_registry = AuditRegistry(self._plugin_registry)
+        self._audit_cache = self._load_audit_cache()
+        self._audit_registry = AuditRegistry(
+            self._plugin_registry,
+            timeout=self.config.audit_timeout,
+            cache=self._audit_cache,
+        )
         self._report_generator = ReportGenerator()
         self.system_interactions = UserInteractionsCLI()
+        self._timer = OperationTimer(self.system_interactions.time)
 
     # Handle command line parsing and launches the commands on the stack
     def run(self):
 
         # Audit the stack (no live access here, just static checks)
-        alerts = self._audit_registry.inspect(self.stack)
+        alerts = self._inspect()
 
         # tells if we run for real (true) or of we are not connected to any system (false)
-        live_operations = (
+        live_operations = self._live_operations()
+
+        operator = self._operator(live_operations)
+
+        try:
+            # Take the stack and check its state. If we are not "live" just return an empty State
+            # with everything marked as "unknown", otherwise, check the live status of the system.
+            stack_state = (
+                StackState()
+                if not live_operations
+                else StackStateResolver(operator).resolve(self.stack)
+            )
+
+            if self.config.command == "up":
+                CommandUp(
+                    stack=self.stack,
+                    operator=operator,
+                    system_interactions=self.system_interactions,
+                    auditor=self._execution_listener,
+                    dry_run=self.config.dry_run,
+                    live_check=self.config.live_check,
+                    stack_state=stack_state,
+                    parallel=self.config.parallel,
+                    pull_per_registry=self.config.pull_per_registry,
+                ).up(self.config.services)
+            elif self.config.command == "down":
+                CommandDown(
+                    stack=self.stack,
+                    operator=operator,
+                    system_interactions=self.system_interactions,
+                    auditor=self._execution_listener,
+                    dry_run=self.config.dry_run,
+                    live_check=self.config.live_check,
+                    stack_state=stack_state,
+                    parallel=self.config.parallel,
+                ).down(self.config.services)
+            elif self.config.command == "check":
+                pass
+            elif self.config.command == "graph":
+                print(self._graph())
+            else:
+                raise RuntimeError(f"Unimplemented command [{self.config.command}]")
+        finally:
+            operator.close()
+            self._release_connections(live_operations)
+            self._write_trace()
+            # looked up secrets are only kept beyond the run for their TTL
+            secret_resolver.forget()
+
+        self._print_report(alerts, stack_state, live_operations)
+
+    async def run_async(self):
+        """
+        Same as run(), as a coroutine.
+
+        Docker calls run in worker threads, health waits sleep on the event loop, so
+        one loop can run many stacks at the same time. Cancelling stops the command.
+        The audit and file writes run in worker threads too.
+        """
+        alerts = await asyncio.to_thread(self._inspect)
+        live_operations = self._live_operations()
+        sync_operator = self._operator(live_operations)
+        operator = ThreadedAsyncContainerOperator(sync_operator, timer=self._timer)
+
+        try:
+            stack_state = (
+                StackState()
+                if not live_operations
+                else await asyncio.to_thread(
+                    StackStateResolver(sync_operator).resolve, self.stack
+                )
+            )
+
+            if self.config.command == "up":
+                await AsyncCommandUp(
+                    stack=self.stack,
+                    operator=operator,
+                    system_interactions=self.system_interactions,
+                    auditor=self._execution_listener,
+                    dry_run=self.config.dry_run,
+                    live_check=self.config.live_check,
+                    stack_state=stack_state,
+                    parallel=self.config.parallel,
+                    pull_per_registry=self.config.pull_per_registry,
+                ).up(self.config.services)
+            elif self.config.command == "down":
+                await AsyncCommandDown(
+                    stack=self.stack,
+                    operator=operator,
+                    system_interactions=self.system_interactions,
+                    auditor=self._execution_listener,
+                    dry_run=self.config.dry_run,
+                    live_check=self.config.live_check,
+                    stack_state=stack_state,
+                    parallel=self.config.parallel,
+                ).down(self.config.services)
+            elif self.config.command == "check":
+                pass
+            elif self.config.command == "graph":
+                print(await asyncio.to_thread(self._graph))
+            else:
+                raise RuntimeError(f"Unimplemented command [{self.config.command}]")
+        finally:
+            await asyncio.shield(operator.close())
+            self._release_connections(live_operations)
+            await asyncio.shield(asyncio.to_thread(self._write_trace))
+            # looked up secrets are only kept beyond the run for their TTL
+            secret_resolver.forget()
+
+        self._print_report(alerts, stack_state, live_operations)
+
+    def _graph(self) -> str:
+        timings = None
+        if self.config.timings:
+            with open(self.config.timings, encoding="utf-8") as f:
+                timings = timings_from_trace(self.stack, json.load(f))
+        if self.config.graph_format == "json":
+            return graph_json(self.stack, timings)
+        return graph_dot(self.stack, timings)
+
+    def _live_operations(self) -> bool:
+        """Tells if we run for real (true) or of we are not connected to any system (false)"""
+        return (
             (self.config.command == "check" and self.config.live_check)
             or (self.config.command == "up" and not self.config.dry_run)
             or (
@@ -62,50 +249,11 @@ class StackRunner:
             )
         )
 
-        # if we shall not be connected to live systems, use the DryRunOperator to be sure
-        # that nothing goes to Doccker
-        operator = (
-            DockerOperator(self.client, self.system_interactions)
-            if live_operations
-            else DryRunOperator(self._execution_listener)
-        )
-
-        # Take the stack and check its state. If we are not "live" just return an empty State
-        # with everything marked as "unknown", otherwise, check the live status of the system.
-        stack_state = (
-            StackState()
-            if not live_operations
-            else StackStateResolver(operator).resolve(self.stack)
-        )
-
-        # Report is displayed if we launch "check" or any command with --dry-run
-        generate_report = self.config.command == "check" or self.config.dry_run
-
-        if self.config.command == "up":
-            CommandUp(
-                stack=self.stack,
-                operator=operator,
-                system_interactions=self.system_interactions,
-                auditor=self._execution_listener,
-                dry_run=self.config.dry_run,
-                live_check=self.config.live_check,
-                stack_state=stack_state,
-            ).up(self.config.services)
-        elif self.config.command == "down":
-            CommandDown(
-                stack=self.stack,
-                operator=operator,
-                auditor=self._execution_listener,
-                dry_run=self.config.dry_run,
-                live_check=self.config.live_check,
-                stack_state=stack_state,
-            ).down(self.config.services)
-        elif self.config.command == "check":
-            pass
-        else:
-            raise RuntimeError(f"Unimplemented command [{self.config.command}]")
-
-        if generate_report:
+    def _print_report(
+        self, alerts: AuditResult, stack_state: StackState, live_operations: bool
+    ) -> None:
+        """Report is displayed if we launch "check" or any command with --dry-run"""
+        if self.config.command == "check" or self.config.dry_run:
             print(
                 self._report_generator.generate_report(
                     stack=self.stack,
@@ -116,3 +264,99 @@ class StackRunner:
                     live_operations=live_operations,
                 ),
             )
+        if self.config.audit_stats:
+            print("\n" + report_audit_stats(alerts.stats))
+
+    @property
+    def client(self) -> "docker.DockerClient":
+        """
+        Docker SDK client, for scripts using the runner's client. Created on first
+        access, outside of the pool: holding it never makes commands wait.
+        """
+        if self._client is None:
+            self._client = self._docker_clients.create_unpooled()
+        return self._client
+
+    def pool_stats(self) -> PoolStats:
+        """Statistics of the docker clients (or Engine API connections) pool"""
+        if self._engine_client is not None:
+            return self._engine_client.pool_stats()
+        return self._docker_clients.stats()
+
+    def _release_connections(self, live_operations: bool) -> None:
+        if live_operations:
+            logger.debug(f"Docker connections pool: {self.pool_stats().summary()}")
+        # idle clients are not needed anymore, the pool creates new ones if run again
+        self._docker_clients.close()
+        if self._engine_client is not None:
+            self._engine_client.close()
+
+    def _operator(self, live_operations: bool) -> ContainerOperator:
+        # if we shall not be connected to live systems, use the DryRunOperator to be sure
+        # that nothing goes to Docker
+        operator = (
+            self._live_operator()
+            if live_operations
+            else DryRunOperator(self._execution_listener)
+        )
+        return TimedContainerOperator(operator, self._timer)
+
+    def _inspect(self) -> AuditResult:
+        alerts = self._audit_registry.inspect(self.stack)
+        self._save_audit_cache()
+        return alerts
+
+    def _load_audit_cache(self) -> Optional[AuditCache]:
+        """Cache of --audit-cache, empty if the file is missing or unreadable"""
+        if not self.config.audit_cache:
+            return None
+        try:
+            with open(self.config.audit_cache, encoding="utf-8") as f:
+                return AuditCache(json.load(f))
+        except (OSError, ValueError) as e:
+            logger.debug(f"Audit cache {self.config.audit_cache} not used: {e}")
+            return AuditCache()
+
+    def _save_audit_cache(self) -> None:
+        cache = self._audit_cache
+        if cache is None or not cache.changed or not self.config.audit_cache:
+            return
+        # written aside then moved, so a concurrent check never reads half a file
+        temporary = f"{self.config.audit_cache}.{os.getpid()}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump(cache.document(), f)
+        os.replace(temporary, self.config.audit_cache)
+
+    def _write_trace(self) -> None:
+        """Writes operation timings to --trace-out, also when the command failed"""
+        if not self.config.trace_out:
+            return
+        with open(self.config.trace_out, "w", encoding="utf-8") as f:
+            json.dump(chrome_trace(self.stack, self._timer.operations()), f)
+        logger.info(f"Trace written to {self.config.trace_out}")
+
+    def _live_operator(self) -> ContainerOperator:
+        # imported here, with the docker SDK they need: offline runs do without
+        if self._engine_client is not None:
+            from containup.infra.docker.engine_operator import EngineApiOperator
+
+            return EngineApiOperator(self._engine_client)
+        from containup.infra.docker.docker_operator import DockerOperator
+
+        return DockerOperator(self._docker_clients, self.system_interactions)
+
+    def _docker_client(self) -> "docker.DockerClient":
+        """
+        New docker SDK client. The SDK is imported here, only when containup talks
+        to docker. Without --docker-api-version, the client asks the daemon for its
+        version first.
+        """
+        import docker
+
+        return docker.from_env(version=self.config.docker_api_version)
+
+
+def _close_docker_client(client: "docker.DockerClient") -> None:
+    from containup.infra.docker.docker_operator import close_client
+
+    close_client(client)
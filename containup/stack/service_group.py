@@ -0,0 +1,64 @@
+from dataclasses import dataclass, field
+
+from .service import Service
+
+
+@dataclass
+class ServiceGroup:
+    """
+    Named group of interchangeable services (replicas), updated in a rolling way.
+
+    When `up` has to recreate members of the group, they are not all removed at
+    once: members are replaced a few at a time, and a member's slot is released
+    only when its new container is healthy. If a replacement fails, the members
+    not yet replaced keep running their old container.
+
+    Example::
+
+        stack.add(ServiceGroup(
+            "web",
+            [Service(f"web_{i}", image="nginx:1.27", healthcheck=...) for i in range(3)],
+            max_unavailable=1,
+            max_surge=1,
+        ))
+    """
+
+    name: str
+    """Name of the group"""
+
+    services: list[Service] = field(default_factory=lambda: [])
+    """Members of the group, added to the stack with the group"""
+
+    max_unavailable: int = 1
+    """
+    Maximum number of members whose old container is removed before the new one
+    is healthy, at the same time.
+    """
+
+    max_surge: int = 0
+    """
+    Maximum number of new containers started next to the old ones, at the same
+    time. With surge, the old container is kept (renamed) until the new one is
+    healthy, then removed, so the member stays available.
+
+    Surge doesn't apply to members publishing fixed host ports: the old container
+    holds the port, they are replaced in place.
+    """
+
+    def __post_init__(self):
+        if self.max_unavailable < 0 or self.max_surge < 0:
+            raise ValueError(
+                f"Service group {self.name}: max_unavailable and max_surge can not be negative"
+            )
+        if self.max_unavailable == 0 and self.max_surge == 0:
+            raise ValueError(
+                f"Service group {self.name}: max_unavailable and max_surge can not both be 0"
+            )
+
+    def member_names(self) -> list[str]:
+        return [service.name for service in self.services]
+
+
+def has_fixed_host_ports(service: Service) -> bool:
+    """Tells if the service publishes ports on fixed host ports"""
+    return any(port.host_port for port in service.ports)
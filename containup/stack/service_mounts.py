@@ -1,9 +1,11 @@
 import uuid
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import List, Literal, Optional, Union
+from typing import TYPE_CHECKING, List, Literal, Optional, Union
 
-from docker.types import DriverConfig
+if TYPE_CHECKING:
+    # the docker SDK is slow to import, stacks are declared without it
+    from docker.types import DriverConfig
 
 
 class ServiceMount(ABC):
@@ -79,7 +81,7 @@ class VolumeMount(ServiceMount):
     labels: Optional[dict[str, str]] = None
     """Labels to set on the volume"""
 
-    driver_config: Optional[DriverConfig] = None
+    driver_config: Optional["DriverConfig"] = None
     """Name and configuration of the driver used to create the volume."""
 
     _id: str = field(default_factory=lambda: str(uuid.uuid4()))
@@ -115,6 +117,8 @@ class TmpfsMount(ServiceMount):
     tmpfs_mode: Optional[int] = None
     """Filesystem permission mode (e.g., 1777)."""
 
+    _id: str = field(default_factory=lambda: str(uuid.uuid4()))
+
     def type(self):
         return "tmp"
 
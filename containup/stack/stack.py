@@ -1,14 +1,53 @@
 import logging
-from typing import List, Optional, Union
+from typing import Any, Iterable, List, Optional, Union
 
 from .network import Network
 from .service import Service
+from .service_group import ServiceGroup
+from .stack_graph import (
+    ServiceCycleException as ServiceCycleException,
+    ServiceDuplicateException as ServiceDuplicateException,
+    ServiceUnknownDependencyException as ServiceUnknownDependencyException,
+    StackGraph,
+    services_topological_sort as services_topological_sort,
+)
 from .volume import Volume
 
 # Initialize logger for this lib. Don't force the logger
 logger = logging.getLogger(__name__)
 
-StockItem = Union[Service, Volume, Network]
+StockItem = Union[Service, Volume, Network, ServiceGroup]
+
+
+def _counted(name: str) -> Any:
+    """List method that counts a change of the list before doing it"""
+
+    def method(self: "_ServiceList", *args: Any, **kwargs: Any) -> Any:
+        self.version += 1
+        return getattr(super(_ServiceList, self), name)(*args, **kwargs)
+
+    return method
+
+
+class _ServiceList(List[Service]):
+    """List of services counting its changes, so the stack graph knows when to rebuild"""
+
+    def __init__(self, services: Iterable[Service] = ()):
+        super().__init__(services)
+        self.version = 0
+
+    append = _counted("append")
+    extend = _counted("extend")
+    insert = _counted("insert")
+    remove = _counted("remove")
+    pop = _counted("pop")
+    clear = _counted("clear")
+    sort = _counted("sort")
+    reverse = _counted("reverse")
+    __setitem__ = _counted("__setitem__")
+    __delitem__ = _counted("__delitem__")
+    __iadd__ = _counted("__iadd__")
+    __imul__ = _counted("__imul__")
 
 
 class Stack:
@@ -16,20 +55,60 @@ class Stack:
         self.name = name
         self.volumes: list[Volume] = []
         self.networks: list[Network] = []
-        self.services: list[Service] = []
+        self._services = _ServiceList()
+        self.groups: list[ServiceGroup] = []
+        self._graph = StackGraph()
+        self._indexed = (self._services, 0)
+        """List and version of the services indexed by the graph"""
+
+    @property
+    def services(self) -> list[Service]:
+        return self._services
+
+    @services.setter
+    def services(self, services: list[Service]) -> None:
+        self._services = _ServiceList(services)
+
+    @property
+    def graph(self) -> StackGraph:
+        """Index of the services: by name, dependencies, dependents, order"""
+        indexed, version = self._indexed
+        if indexed is not self._services or version != self._services.version:
+            # services were changed without add(), index them again
+            self._graph = StackGraph()
+            for service in self._services:
+                self._graph.add(service, self._group_declaring(service))
+            self._indexed = (self._services, self._services.version)
+        return self._graph
 
     def add(self, item_or_list: Union[StockItem, List[StockItem]]):
         items = item_or_list if isinstance(item_or_list, list) else [item_or_list]
+        graph = self.graph
         for item in items:
             logger.debug(item)
             if isinstance(item, Service):
-                self.services.append(item)
+                graph.add(item)
+                self._services.append(item)
+            elif isinstance(item, ServiceGroup):
+                for service in item.services:
+                    graph.add(service, item)
+                self.groups.append(item)
+                self._services.extend(item.services)
             elif isinstance(item, Volume):
                 self.volumes.append(item)
             elif isinstance(item, Network):  # type: ignore
                 self.networks.append(item)
+        # indexed above, no rebuild needed
+        self._indexed = (self._services, self._services.version)
         return self
 
+    def _group_declaring(self, service: Service) -> Optional[ServiceGroup]:
+        return next((g for g in self.groups if service in g.services), None)
+
+    def group_of(self, service_name: str) -> Optional[ServiceGroup]:
+        """Returns the group the service belongs to, None if it has no group"""
+        return self.graph.group_of(service_name)
+
     def get_services_sorted(
         self, filter_services: Optional[List[str]] = None
     ) -> list[Service]:
@@ -45,51 +124,10 @@ class Stack:
         """
         # if filter_services is empty or None then ignore it
         # otherwise filter services to run to match filter_services (only the services the user wants to run)
-        sorted_services = services_topological_sort(self.services)
-        targets: list[Service] = (
-            sorted_services
-            if not filter_services
-            else [
-                service
-                for service in sorted_services
-                if service.name in filter_services
-            ]
-        )
+        sorted_services = self.graph.sorted()
+        if not filter_services:
+            return sorted_services
+        wanted = set(filter_services)
+        targets = [service for service in sorted_services if service.name in wanted]
 
         return targets
-
-
-def services_topological_sort(services: list[Service]) -> list[Service]:
-    name_to_service = {s.name: s for s in services}
-    visited: set[str] = set()
-    temp_mark: set[str] = set()
-    result: list[Service] = []
-
-    def visit(service: Service):
-        if service.name in visited:
-            return
-        if service.name in temp_mark:
-            raise ServiceCycleException(f"Cycle detected involving: {service.name}")
-        temp_mark.add(service.name)
-        for dep in service.depends_on:
-            if dep not in name_to_service:
-                raise ServiceUnknownDependencyException(
-                    f"Unknown dependency '{dep}' required by '{service.name}'"
-                )
-            visit(name_to_service[dep])
-        temp_mark.remove(service.name)
-        visited.add(service.name)
-        result.append(service)
-
-    for s in services:
-        visit(s)
-
-    return result
-
-
-class ServiceCycleException(Exception):
-    pass
-
-
-class ServiceUnknownDependencyException(Exception):
-    pass
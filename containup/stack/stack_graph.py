@@ -0,0 +1,249 @@
+from typing import Optional
+
+from .service import Service
+from .service_group import ServiceGroup
+
+
+class StackGraph:
+    """
+    Index of the services of a stack, kept up to date by `Stack.add()`.
+
+    Gives by name: the service, the services it depends on, the services
+    depending on it, and its group. The topological order and the levels are
+    computed once, when first asked, and again only after services are added.
+
+    Services are indexed as they are when added: changing the `depends_on` of a
+    service already in the stack is not seen.
+    """
+
+    def __init__(self):
+        self._services: dict[str, Service] = {}
+        self._dependents: dict[str, list[str]] = {}
+        self._groups: dict[str, ServiceGroup] = {}
+        self._order: Optional[list[Service]] = None
+        self._levels: Optional[dict[str, int]] = None
+
+    def add(self, service: Service, group: Optional[ServiceGroup] = None) -> None:
+        """Indexes a service. Raises ServiceDuplicateException if its name is taken."""
+        if service.name in self._services:
+            raise ServiceDuplicateException(
+                f"Service '{service.name}' is defined more than once"
+            )
+        self._services[service.name] = service
+        self._dependents.setdefault(service.name, [])
+        for dependency in service.depends_on:
+            self._dependents.setdefault(dependency, []).append(service.name)
+        if group is not None:
+            self._groups[service.name] = group
+        self._order = None
+        self._levels = None
+
+    def __len__(self) -> int:
+        return len(self._services)
+
+    def __contains__(self, service_name: str) -> bool:
+        return service_name in self._services
+
+    def get(self, service_name: str) -> Optional[Service]:
+        """Service with this name, None if there is none"""
+        return self._services.get(service_name)
+
+    def dependencies(self, service_name: str) -> list[str]:
+        """Names of the services this one depends on"""
+        service = self._services.get(service_name)
+        return list(service.depends_on) if service else []
+
+    def dependents(self, service_name: str) -> list[str]:
+        """Names of the services depending on this one, in the order they were added"""
+        return list(self._dependents.get(service_name, []))
+
+    def group_of(self, service_name: str) -> Optional[ServiceGroup]:
+        """Group of the service, None if it has no group"""
+        return self._groups.get(service_name)
+
+    def sorted(self) -> list[Service]:
+        """Services, each one after the services it depends on"""
+        if self._order is None:
+            self._order = services_topological_sort(list(self._services.values()))
+        return list(self._order)
+
+    def levels(self) -> dict[str, int]:
+        """
+        Level of each service: 0 without dependencies, otherwise one more than the
+        highest level of its dependencies. Services of the same level don't depend
+        on each other.
+        """
+        if self._levels is None:
+            levels: dict[str, int] = {}
+            for service in self.sorted():
+                levels[service.name] = 1 + max(
+                    (levels[d] for d in service.depends_on), default=-1
+                )
+            self._levels = levels
+        return dict(self._levels)
+
+    def waves(self) -> list[list[Service]]:
+        """
+        Services grouped by level, lowest first. A wave only depends on previous
+        waves: its services can be started at the same time.
+        """
+        levels = self.levels()
+        waves: list[list[Service]] = [
+            [] for _ in range(max(levels.values(), default=-1) + 1)
+        ]
+        for service in self._services.values():
+            waves[levels[service.name]].append(service)
+        return waves
+
+
+def services_topological_sort(services: list[Service]) -> list[Service]:
+    """
+    Services, each one after the services it depends on. Otherwise services keep
+    the order they are given in.
+
+    Iterative depth-first search: chains of any length are fine.
+
+    Raises:
+        ServiceUnknownDependencyException: a service depends on a service not in the list
+        ServiceCycleException: services depend on each other, with every cycle found
+    """
+    name_to_service = {s.name: s for s in services}
+    _check_dependencies(services, name_to_service)
+    visited: set[str] = set()
+    in_progress: set[str] = set()
+    result: list[Service] = []
+
+    for root in services:
+        if root.name in visited:
+            continue
+        visited.add(root.name)
+        in_progress.add(root.name)
+        path = [(root, iter(root.depends_on))]
+        while path:
+            service, dependencies = path[-1]
+            dep = next(dependencies, None)
+            if dep is None:
+                path.pop()
+                in_progress.discard(service.name)
+                result.append(service)
+            elif dep in in_progress:
+                raise ServiceCycleException(services_cycles(services))
+            elif dep not in visited:
+                visited.add(dep)
+                in_progress.add(dep)
+                dependency = name_to_service[dep]
+                path.append((dependency, iter(dependency.depends_on)))
+
+    return result
+
+
+def services_topological_levels(services: list[Service]) -> list[list[Service]]:
+    """
+    Services grouped by level (see `StackGraph.levels()`): each group only depends
+    on previous groups, so the services of a group can be started at the same
+    time once the previous groups are up. Groups keep the order services are
+    given in.
+
+    Raises the same exceptions as `services_topological_sort`.
+    """
+    levels: dict[str, int] = {}
+    for service in services_topological_sort(services):
+        levels[service.name] = 1 + max(
+            (levels[d] for d in service.depends_on), default=-1
+        )
+    grouped: list[list[Service]] = [
+        [] for _ in range(max(levels.values(), default=-1) + 1)
+    ]
+    seen: set[str] = set()
+    for service in services:
+        if service.name not in seen:
+            seen.add(service.name)
+            grouped[levels[service.name]].append(service)
+    return grouped
+
+
+def services_cycles(services: list[Service]) -> list[list[str]]:
+    """
+    Every group of services depending on each other (strongly connected
+    components with more than one service, or a service depending on itself),
+    in the order services are given. Unknown dependencies are ignored.
+
+    Iterative Tarjan's algorithm, linear in services and dependencies.
+    """
+    name_to_service = {s.name: s for s in services}
+    index: dict[str, int] = {}
+    lowlink: dict[str, int] = {}
+    on_stack: set[str] = set()
+    stack: list[str] = []
+    cycles: list[list[str]] = []
+
+    for root in services:
+        if root.name in index:
+            continue
+        index[root.name] = lowlink[root.name] = len(index)
+        stack.append(root.name)
+        on_stack.add(root.name)
+        path = [(root.name, iter(root.depends_on))]
+        while path:
+            name, dependencies = path[-1]
+            dep = next(dependencies, None)
+            if dep is None:
+                path.pop()
+                if path:
+                    parent = path[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[name])
+                if lowlink[name] == index[name]:
+                    component: list[str] = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == name:
+                            break
+                    if len(component) > 1 or name in name_to_service[name].depends_on:
+                        cycles.append(list(reversed(component)))
+            elif dep not in name_to_service:
+                continue
+            elif dep not in index:
+                index[dep] = lowlink[dep] = len(index)
+                stack.append(dep)
+                on_stack.add(dep)
+                path.append((dep, iter(name_to_service[dep].depends_on)))
+            elif dep in on_stack:
+                lowlink[name] = min(lowlink[name], index[dep])
+
+    return cycles
+
+
+def _check_dependencies(
+    services: list[Service], name_to_service: dict[str, Service]
+) -> None:
+    unknown = [
+        f"'{dep}' required by '{service.name}'"
+        for service in services
+        for dep in service.depends_on
+        if dep not in name_to_service
+    ]
+    if unknown:
+        raise ServiceUnknownDependencyException(
+            f"Unknown dependencies: {', '.join(unknown)}"
+        )
+
+
+class ServiceCycleException(Exception):
+    """Services depend on each other. `cycles` lists each group of services involved."""
+
+    def __init__(self, cycles: list[list[str]]):
+        self.cycles = cycles
+        super().__init__(
+            "Cycles detected involving: "
+            + "; ".join(", ".join(cycle) for cycle in cycles)
+        )
+
+
+class ServiceUnknownDependencyException(Exception):
+    pass
+
+
+class ServiceDuplicateException(Exception):
+    pass
@@ -0,0 +1,49 @@
+DEFAULT_REGISTRY = "docker.io"
+DEFAULT_TAG = "latest"
+
+
+def normalize_image_reference(image: str) -> str:
+    """
+    Returns the fully qualified form of an image reference, like docker does.
+
+    `nginx`, `nginx:latest`, `library/nginx` and `docker.io/library/nginx:latest`
+    all give `docker.io/library/nginx:latest`. References with a digest keep it and
+    don't get a default tag.
+    """
+    registry, path, tag, digest = _split_image_reference(image)
+    result = f"{registry}/{path}"
+    if tag:
+        result += ":" + tag
+    if digest:
+        result += "@" + digest
+    return result
+
+
+def image_registry(image: str) -> str:
+    """Returns the registry an image reference is pulled from (docker.io if implicit)."""
+    return _split_image_reference(image)[0]
+
+
+def _split_image_reference(image: str) -> tuple[str, str, str, str]:
+    name, _, digest = image.strip().partition("@")
+
+    # a colon after the last slash separates the tag (before, it is a registry port)
+    tag = ""
+    last_slash = name.rfind("/")
+    last_colon = name.rfind(":")
+    if last_colon > last_slash:
+        name, tag = name[:last_colon], name[last_colon + 1 :]
+
+    # the first component is a registry only if it looks like a host
+    registry = DEFAULT_REGISTRY
+    first, sep, rest = name.partition("/")
+    if sep and ("." in first or ":" in first or first == "localhost"):
+        registry, name = first, rest
+    if registry == "index.docker.io":
+        registry = DEFAULT_REGISTRY
+    if registry == DEFAULT_REGISTRY and "/" not in name:
+        name = "library/" + name
+
+    if not tag and not digest:
+        tag = DEFAULT_TAG
+    return registry, name, tag, digest
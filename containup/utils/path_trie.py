@@ -0,0 +1,58 @@
+from pathlib import PurePosixPath
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class PathTrie(Generic[T]):
+    """
+    Items stored under POSIX paths, to find the ones on overlapping paths.
+
+    Two paths overlap when they are equal or one is inside the other, the way
+    `PurePosixPath.relative_to` sees it: `/data` and `/data/cache` overlap,
+    `/data` and `/database` don't, nor do a relative and an absolute path.
+    """
+
+    def __init__(self):
+        self._root = _Node[T]()
+        self._count = 0
+
+    def add(self, path: str, item: T) -> None:
+        node = self._root
+        for part in _path_key(path):
+            node = node.children.setdefault(part, _Node[T]())
+        node.items.append((self._count, item))
+        self._count += 1
+
+    def overlapping(self, path: str) -> list[T]:
+        """Items on this path, above it or below it, in the order they were added"""
+        found: list[tuple[int, T]] = []
+        node = self._root
+        for part in _path_key(path):
+            found += node.items
+            child = node.children.get(part)
+            if child is None:
+                return [item for _, item in sorted(found, key=_order)]
+            node = child
+        below = [node]
+        while below:
+            current = below.pop()
+            found += current.items
+            below.extend(current.children.values())
+        return [item for _, item in sorted(found, key=_order)]
+
+
+class _Node(Generic[T]):
+    def __init__(self):
+        self.children: dict[str, _Node[T]] = {}
+        self.items: list[tuple[int, T]] = []
+
+
+def _order(entry: tuple[int, object]) -> int:
+    return entry[0]
+
+
+def _path_key(path: str) -> tuple[str, ...]:
+    pure = PurePosixPath(path)
+    # relative paths get their own root, they never overlap absolute ones
+    return pure.parts if pure.is_absolute() else ("",) + pure.parts
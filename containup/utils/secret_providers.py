@@ -0,0 +1,180 @@
+"""
+Secrets read from somewhere else than the stack script: environment variables,
+files, commands, or any function (a vault client, for example).
+
+Their value is only looked up when needed, that is when a container using them
+is started. Lookups of the same secret (same key) are done once, even from
+several threads, and values are kept until the end of the run, or for the TTL
+given to `secret_cache_ttl()`. Values stay in memory only, and errors never
+include them.
+"""
+
+import json
+import os
+import subprocess
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Iterable, Optional
+
+from containup.utils.secret_value import SecretValue
+
+
+class SecretProviderException(Exception):
+    """A secret could not be read. The message never contains the value."""
+
+
+@dataclass
+class _Lookup:
+    value: "Future[str]"
+    at: float
+
+
+class SecretResolver:
+    """
+    Looks up secrets once per key, and keeps values for `ttl` seconds, or until
+    `forget()` if there is no TTL.
+    """
+
+    def __init__(
+        self,
+        ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = ttl
+        self._clock = clock
+        self._lookups: dict[str, _Lookup] = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, key: str, provider: Callable[[], str]) -> str:
+        """Value for key, calling provider unless it is known or being looked up"""
+        with self._lock:
+            lookup = self._lookups.get(key)
+            owner = lookup is None or self._expired(lookup)
+            if owner:
+                lookup = _Lookup(Future(), self._clock())
+                self._lookups[key] = lookup
+        assert lookup is not None
+        if owner:
+            try:
+                lookup.value.set_result(provider())
+            except BaseException as e:
+                # failures are not kept, next lookups try again
+                with self._lock:
+                    if self._lookups.get(key) is lookup:
+                        del self._lookups[key]
+                lookup.value.set_exception(e)
+        return lookup.value.result()
+
+    def forget(self) -> None:
+        """Drops values, except the ones still within the TTL"""
+        with self._lock:
+            self._lookups = {
+                key: lookup
+                for key, lookup in self._lookups.items()
+                if self.ttl is not None and not self._expired(lookup)
+            }
+
+    def _expired(self, lookup: _Lookup) -> bool:
+        return (
+            self.ttl is not None
+            and lookup.value.done()
+            and self._clock() - lookup.at >= self.ttl
+        )
+
+
+resolver = SecretResolver()
+"""Resolver used by the secrets of this module"""
+
+
+def secret_cache_ttl(seconds: Optional[float]) -> None:
+    """
+    Keeps looked up secrets for `seconds` (in memory), across runs of the same
+    process. None (the default) keeps them until the end of each run.
+    """
+    resolver.ttl = seconds
+
+
+def secret_from(
+    label: str, provider: Callable[[], str], key: Optional[str] = None
+) -> SecretValue:
+    """
+    Secret given by calling provider when needed.
+
+    Secrets with the same key are looked up once, and share the values kept by
+    the TTL. Without key, the secret shares its lookups with no other.
+    """
+    lookup_key = key if key is not None else f"callable:{uuid.uuid4()}"
+
+    def reveal() -> str:
+        return resolver.resolve(lookup_key, provider)
+
+    return SecretValue.lazy(label, reveal)
+
+
+def secret_from_env(label: str, variable: str) -> SecretValue:
+    """Secret read from an environment variable when needed"""
+
+    def read() -> str:
+        value = os.environ.get(variable)
+        if value is None:
+            raise SecretProviderException(
+                f"Secret {label}: environment variable {variable} is not set"
+            )
+        return value
+
+    return secret_from(label, read, f"env:{variable}")
+
+
+def secret_from_file(label: str, path: str) -> SecretValue:
+    """Secret read from a file when needed, without its trailing newline"""
+    absolute = os.path.abspath(path)
+
+    def read() -> str:
+        try:
+            with open(absolute, encoding="utf-8") as f:
+                return f.read().rstrip("\n")
+        except OSError as e:
+            raise SecretProviderException(
+                f"Secret {label}: can't read {absolute}: {e.strerror}"
+            ) from None
+
+    return secret_from(label, read, f"file:{absolute}")
+
+
+def secret_from_command(
+    label: str, command: list[str], timeout: float = 30
+) -> SecretValue:
+    """Secret printed by a command when needed, without its trailing newline"""
+
+    def run() -> str:
+        try:
+            result = subprocess.run(
+                command, capture_output=True, text=True, timeout=timeout
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            raise SecretProviderException(
+                f"Secret {label}: command {command[0]} failed: {type(e).__name__}"
+            ) from None
+        if result.returncode != 0:
+            # outputs are not shown, they may contain the secret
+            raise SecretProviderException(
+                f"Secret {label}: command {command[0]} exited with {result.returncode}"
+            )
+        return result.stdout.rstrip("\n")
+
+    return secret_from(label, run, f"command:{json.dumps(command)}")
+
+
+def resolve_secrets(secrets: Iterable[SecretValue], workers: int = 8) -> None:
+    """Looks up lazy secrets at the same time, so later reveals are immediate"""
+    lazy = [s for s in secrets if s.is_lazy()]
+    if not lazy:
+        return
+    with ThreadPoolExecutor(
+        max_workers=min(workers, len(lazy)), thread_name_prefix="containup-secrets"
+    ) as executor:
+        for _ in executor.map(SecretValue.reveal, lazy):
+            pass
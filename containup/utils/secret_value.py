@@ -1,12 +1,29 @@
-import inspect
+from typing import Callable
 
 
 class SecretValue:
-    __slots__ = ("__label", "__value")
+    """
+    A secret, whose value is only given by reveal().
+
+    The value is held by a function of the instance (a closure over it, or the
+    provider of lazy secrets): no attribute or slot of the object is the value
+    itself, and it goes away with the object.
+    """
+
+    __slots__ = ("__label", "__reveal", "__lazy")
 
     def __init__(self, label: str, value: str):
         self.__label = label
-        self.__value = value
+        self.__reveal: Callable[[], str] = lambda: value
+        self.__lazy = False
+
+    @staticmethod
+    def lazy(label: str, provider: Callable[[], str]) -> "SecretValue":
+        """Secret whose value is given by provider, called at each reveal()"""
+        secret = SecretValue(label, "")
+        secret.__reveal = provider
+        secret.__lazy = True
+        return secret
 
     def __repr__(self):
         return f"<Secret: {self.__label}>"
@@ -14,21 +31,12 @@ class SecretValue:
     def __str__(self):
         return f"<Secret: {self.__label}>"
 
-    def __getattribute__(self, name):  # type: ignore
-        if name == "_SecretValue__value":
-            # autorise if we come from reveal method
-            stack = inspect.stack()
-            allowed = any(
-                f.function in ("reveal", "__init__")
-                and f.frame.f_locals.get("self") is self
-                for f in stack[1:3]  # Limit analysis to 2 levels for performance
-            )
-            if not allowed:
-                raise AttributeError(f"'SecretValue' object has no attribute '{name}'")
-        return super().__getattribute__(name)  # type: ignore
-
     def reveal(self) -> str:
-        return self.__value
+        return self.__reveal()
+
+    def is_lazy(self) -> bool:
+        """True if the value is given by a provider, when revealed"""
+        return self.__lazy
 
     def label(self) -> str:
         return self.__label
@@ -44,7 +52,7 @@ class SecretValue:
         return ["reveal"]
 
     def __getattr__(self, name):  # type: ignore
-        # Empêche l’accès à __value ou __label par introspection forcée
+        # Empêche l’accès à __label par introspection forcée
         raise AttributeError(f"'SecretValue' object has no attribute '{name}'")
 
     def __hash__(self):
@@ -0,0 +1,111 @@
+import json
+
+from containup import BindMount, CmdHealthcheck, Service, Stack, TmpfsMount, secret
+from containup.business.audit.audit_alert import (
+    AuditAlert,
+    AuditAlertLocation,
+    AuditInspector,
+)
+from containup.business.audit.audit_cache import AuditCache, service_fingerprint
+from containup.business.audit.audit_registry import AuditRegistry
+from containup.business.audit.audit_report import AuditResult
+from containup.business.audit.audit_service_mounts import AuditServiceMountsInspector
+from containup.business.audit.audit_depends_on import AuditServiceDependsOnInspector
+from containup.business.plugins.plugin_registry import PluginRegistry
+
+
+class Inspectors(PluginRegistry):
+    def __init__(self, inspectors: list[AuditInspector]):
+        self._inspectors = inspectors
+
+    def get_all_inspectors(self) -> list[AuditInspector]:
+        return self._inspectors
+
+
+class CountingMounts(AuditServiceMountsInspector):
+    def __init__(self):
+        self.evaluated: list[str] = []
+
+    def evaluate_service(self, stack: Stack, service: Service) -> list[AuditAlert]:
+        self.evaluated.append(service.name)
+        return super().evaluate_service(stack, service)
+
+
+def stack(api_target: str = "/etc") -> Stack:
+    return Stack("s").add(
+        [
+            Service("api", "app:1", volumes=[BindMount("/srv/api", api_target)]),
+            Service("db", "db:1", volumes=[TmpfsMount("/tmp")]),
+        ]
+    )
+
+
+def audit(s: Stack, inspector: AuditInspector, cache: AuditCache) -> AuditResult:
+    return AuditRegistry(Inspectors([inspector]), cache=cache).inspect(s)
+
+
+def round_trip(cache: AuditCache) -> AuditCache:
+    return AuditCache(json.loads(json.dumps(cache.document())))
+
+
+def test_only_changed_services_evaluated_again():
+    inspector = CountingMounts()
+    first = audit(stack(), inspector, AuditCache())
+    cache = AuditCache()
+    audit(stack(), inspector, cache)
+
+    inspector.evaluated.clear()
+    second = audit(stack(), inspector, round_trip(cache))
+    assert inspector.evaluated == []
+    assert second.stats[0].cached == 2
+
+    inspector.evaluated.clear()
+    audit(stack("/data"), inspector, round_trip(cache))
+    assert inspector.evaluated == ["api"]
+
+    # cached alerts point to the mounts of the current run
+    s = stack()
+    cached = audit(s, CountingMounts(), round_trip(cache))
+    mount = s.services[0].mounts_all()[0]
+    location = AuditAlertLocation.service("api").mount(mount.id)
+    assert [a.message for a in cached.query(location)] == [
+        a.message for a in first.query_under(AuditAlertLocation.service("api"))
+    ]
+
+
+def test_dependency_change_invalidates_dependents():
+    def with_db(healthcheck: bool) -> Stack:
+        check = CmdHealthcheck(["true"]) if healthcheck else None
+        return Stack("s").add(
+            [
+                Service("db", "db:1", healthcheck=check),
+                Service("api", "app:1", depends_on=["db"]),
+                Service("web", "web:1"),
+            ]
+        )
+
+    cache = AuditCache()
+    assert len(audit(with_db(False), AuditServiceDependsOnInspector(), cache)) == 1
+    result = audit(with_db(True), AuditServiceDependsOnInspector(), round_trip(cache))
+    assert len(result) == 0
+    assert result.stats[0].cached == 1  # web
+
+
+def test_fingerprint_ignores_secret_values_and_mount_ids():
+    def api(password: str) -> Service:
+        return Service(
+            "api",
+            "app:1",
+            environment={"PASSWORD": secret("password", password)},
+            volumes=[TmpfsMount("/tmp")],
+        )
+
+    assert service_fingerprint(api("one")) == service_fingerprint(api("two"))
+    cache = AuditCache()
+    audit(Stack("s").add(api("hunter2")), CountingMounts(), cache)
+    assert "hunter2" not in json.dumps(cache.document())
+
+
+def test_other_format_ignored():
+    cache = AuditCache({"format": 0, "entries": {"x": []}})
+    assert cache.document()["entries"] == {}
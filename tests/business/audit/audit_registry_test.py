@@ -0,0 +1,137 @@
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+from containup import Service, Stack
+from containup.business.audit.audit_alert import (
+    AuditAlert,
+    AuditAlertLocation,
+    AuditAlertType,
+    AuditInspector,
+)
+from containup.business.audit.audit_cache import AuditCache
+from containup.business.audit.audit_registry import AuditRegistry
+from containup.business.plugins.plugin_registry import PluginRegistry
+
+
+class SlowInspector(AuditInspector):
+    def __init__(self, code: str, seconds: float, alerts: int = 1):
+        self._code = code
+        self._seconds = seconds
+        self._alerts = alerts
+
+    @property
+    def code(self) -> str:
+        return self._code
+
+    def evaluate(self, stack: Stack) -> list[AuditAlert]:
+        time.sleep(self._seconds)
+        return [
+            AuditAlert(
+                AuditAlertType.INFO, self._code, AuditAlertLocation.service("api")
+            )
+        ] * self._alerts
+
+
+class Inspectors(PluginRegistry):
+    def __init__(self, inspectors: list[AuditInspector]):
+        self._inspectors = inspectors
+
+    def get_all_inspectors(self) -> list[AuditInspector]:
+        return self._inspectors
+
+
+STACK = Stack("s").add(Service("api", "app"))
+
+
+def test_inspectors_run_at_the_same_time():
+    inspectors: list[AuditInspector] = [
+        SlowInspector("slow", 0.3, alerts=2),
+        SlowInspector("fast", 0.0),
+        SlowInspector("medium", 0.2),
+    ]
+    start = time.perf_counter()
+    result = AuditRegistry(Inspectors(inspectors)).inspect(STACK)
+    assert time.perf_counter() - start < 0.45
+
+    # alerts keep the order of inspectors
+    messages = [a.message for a in result.query(AuditAlertLocation.service("api"))]
+    assert messages == ["slow", "slow", "fast", "medium"]
+    stats = {s.code: s for s in result.stats}
+    assert stats["slow"].alerts == 2
+    assert stats["slow"].seconds >= 0.3
+    assert stats["fast"].seconds < 0.1
+
+
+def test_inspector_timeout():
+    release = threading.Event()
+
+    class StuckInspector(SlowInspector):
+        def evaluate(self, stack: Stack) -> list[AuditAlert]:
+            release.wait(5)
+            return super().evaluate(stack)
+
+    inspectors: list[AuditInspector] = [
+        StuckInspector("stuck", 0),
+        SlowInspector("fast", 0),
+    ]
+    start = time.perf_counter()
+    result = AuditRegistry(Inspectors(inspectors), timeout=0.2).inspect(STACK)
+    release.set()
+
+    assert time.perf_counter() - start < 1
+    assert [a.message for a in result.query(AuditAlertLocation.service("api"))] == [
+        "fast"
+    ]
+    stats = {s.code: s for s in result.stats}
+    assert stats["stuck"].timed_out
+    assert stats["stuck"].alerts == 0
+    assert not stats["fast"].timed_out
+
+
+def test_timed_out_inspector_does_not_write_the_cache():
+    release = threading.Event()
+
+    class CachedStuckInspector(SlowInspector):
+        def cache_key(self, stack: Stack, fingerprints: dict[str, str]) -> str:
+            return "key"
+
+        def evaluate(self, stack: Stack) -> list[AuditAlert]:
+            release.wait(5)
+            return super().evaluate(stack)
+
+    cache = AuditCache()
+    registry = AuditRegistry(
+        Inspectors([CachedStuckInspector("stuck", 0)]), timeout=0.1, cache=cache
+    )
+    result = registry.inspect(STACK)
+    # the runner saves the cache now: the late result must not get in
+    release.set()
+    for thread in threading.enumerate():
+        if thread.name.startswith("containup-audit"):
+            thread.join(5)
+
+    assert result.stats[0].timed_out
+    assert not cache.changed
+    assert cache.document()["entries"] == {}
+
+
+STUCK_AUDIT = """
+from tests.business.audit.audit_registry_test import Inspectors, SlowInspector, STACK
+from containup.business.audit.audit_registry import AuditRegistry
+
+AuditRegistry(Inspectors([SlowInspector("stuck", 30)]), timeout=0.2).inspect(STACK)
+"""
+
+
+def test_timed_out_inspector_does_not_keep_the_process_alive():
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-c", STUCK_AUDIT],
+        cwd=Path(__file__).parents[3],
+        check=True,
+        timeout=20,
+    )
+    assert time.perf_counter() - start < 10
@@ -0,0 +1,56 @@
+from containup.business.audit.audit_alert import (
+    AuditAlert,
+    AuditAlertLocation,
+    AuditAlertType,
+)
+from containup.business.audit.audit_report import AuditResult
+
+
+def alert(severity: AuditAlertType, location: AuditAlertLocation) -> AuditAlert:
+    return AuditAlert(severity, "message", location)
+
+
+def test_query_exact_location():
+    api = AuditAlertLocation.service("api")
+    image = alert(AuditAlertType.WARN, api.image())
+    env = alert(AuditAlertType.CRITICAL, api.environment("TOKEN"))
+    result = AuditResult(
+        [
+            image,
+            env,
+            alert(AuditAlertType.INFO, AuditAlertLocation.service("db").image()),
+        ]
+    )
+
+    assert result.query(AuditAlertLocation.service("api").image()) == [image]
+    assert result.query(api.environment("TOKEN")) == [env]
+    assert result.query(api.environment("OTHER")) == []
+    assert result.query(api) == []
+
+
+def test_query_under_location():
+    api = AuditAlertLocation.service("api")
+    alerts = [
+        alert(AuditAlertType.WARN, api.image()),
+        alert(AuditAlertType.WARN, api.depends_on("db")),
+        alert(AuditAlertType.WARN, AuditAlertLocation.service("db").image()),
+    ]
+    result = AuditResult(alerts)
+
+    assert result.query_under(api) == alerts[:2]
+    assert result.query_under(AuditAlertLocation.service("other")) == []
+
+
+def test_count_by_severity():
+    api = AuditAlertLocation.service("api")
+    result = AuditResult(
+        [
+            alert(AuditAlertType.WARN, api.image()),
+            alert(AuditAlertType.WARN, api.ports()),
+            alert(AuditAlertType.CRITICAL, api.healthcheck()),
+        ]
+    )
+    assert len(result) == 3
+    assert result.count(AuditAlertType.WARN) == 2
+    assert result.count(AuditAlertType.CRITICAL) == 1
+    assert result.count(AuditAlertType.INFO) == 0
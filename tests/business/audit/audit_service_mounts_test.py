@@ -0,0 +1,52 @@
+from containup import BindMount, Service, Stack, TmpfsMount, VolumeMount
+from containup.business.audit.audit_alert import AuditAlert, AuditAlertLocation
+from containup.business.audit.audit_report import AuditResult
+from containup.business.audit.audit_service_mounts import (
+    AuditServiceMountsInspector,
+    AuditSharedBindSourcesInspector,
+)
+from containup.stack.service_mounts import ServiceMount
+
+
+def messages(alerts: list[AuditAlert], service: str, mount: ServiceMount) -> list[str]:
+    location = AuditAlertLocation.service(service).mount(mount.id)
+    return [alert.message for alert in AuditResult(alerts).query(location)]
+
+
+def test_conflicting_targets():
+    data = VolumeMount("data", "/srv/data")
+    cache = TmpfsMount("/srv/data/cache")
+    other = TmpfsMount("/srv/database")
+    stack = Stack("s").add(Service("api", "app", volumes=[data, cache, other]))
+
+    alerts = AuditServiceMountsInspector().evaluate(stack)
+
+    assert messages(alerts, "api", data) == [
+        "conflicting mount path with /srv/data/cache"
+    ]
+    assert messages(alerts, "api", cache) == ["conflicting mount path with /srv/data"]
+    assert messages(alerts, "api", other) == []
+
+
+def test_bind_sources_shared_between_services():
+    api_rw = BindMount("/srv/shared", "/shared", read_only=False)
+    worker_ro = BindMount("/srv/shared/in", "/in", read_only=True)
+    report_ro = BindMount("/srv/shared/in", "/in", read_only=True)
+    stack = Stack("s").add(
+        [
+            Service("api", "app", volumes=[api_rw]),
+            Service("worker", "app", volumes=[worker_ro]),
+            Service("report", "app", volumes=[report_ro]),
+        ]
+    )
+
+    alerts = AuditSharedBindSourcesInspector().evaluate(stack)
+
+    assert messages(alerts, "api", api_rw) == [
+        "host path shared with worker (/srv/shared/in), writable on one side",
+        "host path shared with report (/srv/shared/in), writable on one side",
+    ]
+    # read-only on both sides is fine
+    assert messages(alerts, "worker", worker_ro) == [
+        "host path shared with api (/srv/shared), writable on one side"
+    ]
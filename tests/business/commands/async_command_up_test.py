@@ -0,0 +1,169 @@
+import asyncio
+
+import pytest
+
+from containup import CmdHealthcheck, Service, Stack
+from containup.business.commands.async_command_down import AsyncCommandDown
+from containup.business.commands.async_command_up import AsyncCommandUp
+from containup.business.commands.async_container_operator import (
+    ThreadedAsyncContainerOperator,
+)
+from containup.business.commands.container_health_status import ContainerHealthStatus
+from containup.business.commands.container_operator import ContainerOperatorException
+from containup.business.execution_listener import (
+    ExecutionEvtContainerRemoved,
+    ExecutionEvtContainerRun,
+    ExecutionListenerStd,
+)
+from containup.business.live_state.stack_state import StackState
+from containup.infra.dryrun.dryrun_operator import DryRunOperator
+from tests.business.commands.fakes import FakeUserInteractions
+
+
+class StartingOperator(DryRunOperator):
+    """Containers become healthy after a number of health checks."""
+
+    def __init__(self, listener: ExecutionListenerStd, checks: dict[str, int]):
+        super().__init__(listener)
+        self._checks = checks
+        self.started: list[str] = []
+
+    def container_run(self, stack_name: str, service: Service):
+        self.started.append(service.name)
+
+    def container_remove(self, container_name: str):
+        pass
+
+    def container_health_status(self, container_name: str) -> ContainerHealthStatus:
+        self._checks[container_name] = self._checks.get(container_name, 0) - 1
+        if self._checks[container_name] > 0:
+            return ContainerHealthStatus("running", "starting")
+        return ContainerHealthStatus("running", "healthy")
+
+
+def stack() -> Stack:
+    def service(name: str, depends_on: list[str] = []) -> Service:
+        return Service(
+            name, "dummy:1", depends_on=depends_on, healthcheck=CmdHealthcheck(["ok"])
+        )
+
+    return Stack("test").add(
+        [service("db"), service("cache"), service("api", ["db", "cache"])]
+    )
+
+
+def command_up(operator: StartingOperator, listener: ExecutionListenerStd):
+    return AsyncCommandUp(
+        stack=stack(),
+        operator=ThreadedAsyncContainerOperator(operator, health_poll_interval=0.01),
+        system_interactions=FakeUserInteractions(),
+        auditor=listener,
+        dry_run=False,
+        live_check=False,
+        stack_state=StackState(),
+        parallel=4,
+    )
+
+
+def test_async_up_waits_for_healthy_dependencies():
+    listener = ExecutionListenerStd()
+    operator = StartingOperator(listener, {"db": 5, "cache": 1})
+    asyncio.run(command_up(operator, listener).up())
+    assert operator.started[-1] == "api"
+    assert [
+        evt.container_id
+        for evt in listener.get_events()
+        if isinstance(evt, ExecutionEvtContainerRun)
+    ] == [s.name for s in stack().get_services_sorted()]
+
+
+def test_async_up_can_be_cancelled_while_waiting_for_health():
+    listener = ExecutionListenerStd()
+    operator = StartingOperator(listener, {"db": 1_000_000})
+
+    async def run_and_cancel() -> None:
+        task = asyncio.create_task(command_up(operator, listener).up())
+        await asyncio.sleep(0.05)
+        task.cancel()
+        await task
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(run_and_cancel())
+    assert "api" not in operator.started
+
+
+def test_many_stacks_on_one_loop():
+    async def run_all() -> list[StartingOperator]:
+        operators = [
+            StartingOperator(ExecutionListenerStd(), {"db": 3}) for _ in range(30)
+        ]
+        await asyncio.gather(
+            *(command_up(op, ExecutionListenerStd()).up() for op in operators)
+        )
+        return operators
+
+    for operator in asyncio.run(run_all()):
+        assert operator.started[-1] == "api"
+
+
+def test_async_down_removes_in_reverse_order():
+    listener = ExecutionListenerStd()
+    asyncio.run(
+        AsyncCommandDown(
+            stack=stack(),
+            operator=ThreadedAsyncContainerOperator(StartingOperator(listener, {})),
+            system_interactions=FakeUserInteractions(),
+            auditor=listener,
+            dry_run=False,
+            live_check=False,
+            stack_state=StackState(),
+            parallel=4,
+        ).down()
+    )
+    assert [
+        evt.container_id
+        for evt in listener.get_events()
+        if isinstance(evt, ExecutionEvtContainerRemoved)
+    ] == [s.name for s in stack().get_services_sorted()[::-1]]
+
+
+class FailingOperator(StartingOperator):
+    def container_run(self, stack_name: str, service: Service):
+        raise ContainerOperatorException(f"cannot create {service.name}")
+
+    def container_remove(self, container_name: str):
+        raise ContainerOperatorException(f"cannot remove {container_name}")
+
+
+def test_failed_stack_raises_and_others_finish():
+    good = StartingOperator(ExecutionListenerStd(), {"db": 3})
+
+    async def run_all() -> tuple[object, object]:
+        return await asyncio.gather(
+            command_up(
+                FailingOperator(ExecutionListenerStd(), {}), ExecutionListenerStd()
+            ).up(),
+            command_up(good, ExecutionListenerStd()).up(),
+            return_exceptions=True,
+        )
+
+    failed, succeeded = asyncio.run(run_all())
+    assert isinstance(failed, ContainerOperatorException)
+    assert succeeded is None
+    assert good.started[-1] == "api"
+
+
+def test_failed_down_raises():
+    listener = ExecutionListenerStd()
+    with pytest.raises(ContainerOperatorException, match="api"):
+        asyncio.run(
+            AsyncCommandDown(
+                stack=stack(),
+                operator=ThreadedAsyncContainerOperator(FailingOperator(listener, {})),
+                system_interactions=FakeUserInteractions(),
+                auditor=listener,
+                dry_run=False,
+                live_check=False,
+                stack_state=StackState(),
+            ).down()
+        )
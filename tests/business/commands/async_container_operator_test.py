@@ -0,0 +1,100 @@
+import asyncio
+import threading
+import time
+from typing import Callable, Optional
+
+import pytest
+
+from containup.business.commands.async_container_operator import (
+    ThreadedAsyncContainerOperator,
+)
+from containup.business.commands.container_health_status import ContainerHealthStatus
+from containup.business.commands.container_operator import (
+    Cancellation,
+    ContainerOperatorException,
+    HealthListener,
+)
+from containup.business.execution_listener import ExecutionListenerStd
+from containup.infra.dryrun.dryrun_operator import DryRunOperator
+
+
+class EventsOperator(DryRunOperator):
+    """Tells about health changes like an operator following docker events."""
+
+    def __init__(self):
+        super().__init__(ExecutionListenerStd())
+        self.health = "starting"
+        self.checks = 0
+        self.listeners: list[HealthListener] = []
+        self.pull_stopped = threading.Event()
+
+    def image_pull(self, image: str, cancellation: Optional[Cancellation] = None):
+        cancelled = threading.Event()
+        assert cancellation is not None
+        cancellation.on_cancel(cancelled.set)
+        cancelled.wait(5)
+        self.pull_stopped.set()
+        raise ContainerOperatorException("cancelled")
+
+    def container_health_status(self, container_name: str) -> ContainerHealthStatus:
+        self.checks += 1
+        return ContainerHealthStatus("running", self.health)
+
+    def container_health_subscribe(
+        self, stack_name: str, listener: HealthListener
+    ) -> Optional[Callable[[], None]]:
+        self.listeners.append(listener)
+        return lambda: self.listeners.remove(listener)
+
+    def change(self, health: str) -> None:
+        self.health = health
+        for listener in list(self.listeners):
+            listener(True)
+
+
+def test_health_wait_follows_changes_without_polling():
+    operator = EventsOperator()
+    threaded = ThreadedAsyncContainerOperator(operator, health_poll_interval=60)
+
+    async def wait_then_change() -> ContainerHealthStatus:
+        wait = asyncio.ensure_future(threaded.container_wait_healthy("s", "web", 30))
+        await asyncio.sleep(0.05)
+        threading.Thread(target=operator.change, args=("healthy",)).start()
+        return await asyncio.wait_for(wait, 5)
+
+    assert asyncio.run(wait_then_change()).health == "healthy"
+    assert operator.checks == 2
+    assert operator.listeners == []
+
+
+def test_health_wait_polls_when_changes_stop_being_followed():
+    operator = EventsOperator()
+    threaded = ThreadedAsyncContainerOperator(operator, health_poll_interval=0.01)
+
+    async def wait_then_stop_events() -> ContainerHealthStatus:
+        wait = asyncio.ensure_future(threaded.container_wait_healthy("s", "web", 30))
+        await asyncio.sleep(0.05)
+        for listener in list(operator.listeners):
+            listener(False)
+        await asyncio.sleep(0.05)
+        operator.health = "healthy"
+        return await asyncio.wait_for(wait, 5)
+
+    assert asyncio.run(wait_then_stop_events()).health == "healthy"
+
+
+def test_cancelling_a_pull_stops_it():
+    operator = EventsOperator()
+    threaded = ThreadedAsyncContainerOperator(operator)
+
+    async def pull_then_cancel() -> None:
+        pull = asyncio.ensure_future(threaded.image_pull("nginx"))
+        await asyncio.sleep(0.05)
+        pull.cancel()
+        await pull
+
+    start = time.monotonic()
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(pull_then_cancel())
+    assert operator.pull_stopped.wait(1)
+    assert time.monotonic() - start < 1
@@ -0,0 +1,95 @@
+import threading
+
+import pytest
+
+from containup import Service, Stack
+from containup.business.commands.command_down import CommandDown
+from containup.business.commands.container_operator import (
+    ContainerNotFoundException,
+    ContainerOperatorException,
+)
+from containup.business.execution_listener import (
+    ExecutionEvtContainerRemoved,
+    ExecutionListenerStd,
+)
+from containup.business.live_state.stack_state import StackState
+from containup.infra.dryrun.dryrun_operator import DryRunOperator
+from tests.business.commands.fakes import FakeUserInteractions
+
+
+class RemoveOperator(DryRunOperator):
+    def __init__(self, failing: set[str], missing: set[str]):
+        super().__init__(ExecutionListenerStd())
+        self._lock = threading.Lock()
+        self._failing = failing
+        self._missing = missing
+        self.removed: list[str] = []
+
+    def container_remove(self, container_name: str):
+        if container_name in self._failing:
+            raise ContainerOperatorException(f"{container_name} is stuck")
+        if container_name in self._missing:
+            raise ContainerNotFoundException(f"{container_name} not found")
+        with self._lock:
+            self.removed.append(container_name)
+
+
+def stack() -> Stack:
+    return Stack("test").add(
+        [
+            Service("db", image="postgres:17"),
+            Service("cache", image="redis:7"),
+            Service("api", image="api:1", depends_on=["db", "cache"]),
+            Service("front", image="front:1", depends_on=["api"]),
+            Service("batch", image="batch:1", depends_on=["db"]),
+        ]
+    )
+
+
+def down(operator: RemoveOperator, listener: ExecutionListenerStd) -> list[int]:
+    interactions = FakeUserInteractions()
+    CommandDown(
+        stack=stack(),
+        operator=operator,
+        system_interactions=interactions,
+        auditor=listener,
+        dry_run=False,
+        live_check=False,
+        stack_state=StackState(),
+        parallel=4,
+    ).down()
+    return interactions.exit_codes
+
+
+def test_down_removes_dependents_first():
+    operator = RemoveOperator(set(), set())
+    listener = ExecutionListenerStd()
+    assert down(operator, listener) == []
+    removed = operator.removed
+    assert removed.index("front") < removed.index("api")
+    assert removed.index("api") < removed.index("db")
+    assert removed.index("batch") < removed.index("db")
+    assert removed.index("api") < removed.index("cache")
+    # events are recorded in reverse topological order whatever the parallelism
+    assert [
+        evt.container_id
+        for evt in listener.get_events()
+        if isinstance(evt, ExecutionEvtContainerRemoved)
+    ] == [s.name for s in stack().get_services_sorted()[::-1]]
+
+
+def test_down_reports_errors_and_keeps_dependencies():
+    operator = RemoveOperator({"api"}, {"batch"})
+    assert down(operator, ExecutionListenerStd()) == [1]
+    # api failed: db and cache are still used, they are kept
+    assert sorted(operator.removed) == ["front"]
+
+
+def test_down_without_interactions_raises():
+    operator = RemoveOperator({"api"}, set())
+    listener = ExecutionListenerStd()
+    # positional arguments as before system_interactions existed
+    command = CommandDown(stack(), operator, listener, False, False, StackState())
+    with pytest.raises(ContainerOperatorException, match="not removed: api"):
+        command.down()
+    assert sorted(operator.removed) == ["batch", "front"]
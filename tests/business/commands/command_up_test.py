@@ -0,0 +1,136 @@
+import threading
+import time
+from typing import Optional
+
+from containup import CmdHealthcheck, Service, Stack
+from containup.business.commands.command_up import CommandUp
+from containup.business.commands.container_health_status import ContainerHealthStatus
+from containup.business.commands.service_config_hash import service_config_hash
+from containup.business.execution_listener import (
+    ExecutionEvtContainer,
+    ExecutionEvtContainerRemoved,
+    ExecutionEvtContainerRun,
+    ExecutionEvtContainerUnchanged,
+    ExecutionListenerStd,
+)
+from containup.business.live_state.stack_state import StackState
+from containup.infra.dryrun.dryrun_operator import DryRunOperator
+from tests.business.commands.fakes import FakeUserInteractions
+
+
+class SlowOperator(DryRunOperator):
+    """Records starts; the first services are the slowest to start."""
+
+    def __init__(self, listener: ExecutionListenerStd, delays: dict[str, float]):
+        super().__init__(listener)
+        self._lock = threading.Lock()
+        self._delays = delays
+        self.started: list[str] = []
+        self.healthy: list[str] = []
+
+    def container_run(self, stack_name: str, service: Service):
+        time.sleep(self._delays.get(service.name, 0))
+        with self._lock:
+            self.started.append(service.name)
+        super().container_run(stack_name, service)
+
+    def container_wait_healthy(
+        self, stack_name: str, container_name: str, timeout: float
+    ) -> ContainerHealthStatus:
+        with self._lock:
+            self.healthy.append(container_name)
+        return super().container_wait_healthy(stack_name, container_name, timeout)
+
+
+def healthy_service(name: str, depends_on: list[str] = []) -> Service:
+    return Service(
+        name, image="dummy:1", depends_on=depends_on, healthcheck=CmdHealthcheck(["ok"])
+    )
+
+
+def test_parallel_up_keeps_events_ordered_and_dependencies_healthy():
+    stack = Stack("test").add(
+        [
+            healthy_service("db"),
+            healthy_service("a"),
+            healthy_service("b"),
+            healthy_service("api", depends_on=["db"]),
+        ]
+    )
+    listener = ExecutionListenerStd()
+    operator = SlowOperator(listener, {"db": 0.05, "a": 0.03})
+    interactions = FakeUserInteractions()
+    CommandUp(
+        stack=stack,
+        operator=operator,
+        system_interactions=interactions,
+        auditor=listener,
+        dry_run=False,
+        live_check=False,
+        stack_state=StackState(),
+        parallel=4,
+    ).up()
+
+    assert interactions.exit_codes == []
+    # fast services did not wait for slow ones
+    assert operator.started.index("b") < operator.started.index("db")
+    # dependent started once its dependency is healthy
+    assert operator.healthy.index("db") < operator.started.index("api")
+    runs = [
+        evt.container_id
+        for evt in listener.get_events()
+        if isinstance(evt, ExecutionEvtContainerRun)
+    ]
+    assert runs == ["db", "a", "b", "api"]
+
+
+class HashOperator(DryRunOperator):
+    def __init__(self, listener: ExecutionListenerStd):
+        super().__init__(listener)
+        self.removed: list[str] = []
+        self.run: list[str] = []
+
+    def image_id(self, image: str) -> Optional[str]:
+        return "sha256:1"
+
+    def container_remove(self, container_name: str):
+        self.removed.append(container_name)
+
+    def container_run(self, stack_name: str, service: Service):
+        self.run.append(service.name)
+
+
+def test_up_leaves_unchanged_containers_untouched():
+    same = Service("same", image="nginx:1")
+    drifted = Service("drifted", image="nginx:1", environment={"A": "new"})
+    stack = Stack("test").add([same, drifted])
+    state = StackState()
+    for name in ["same", "drifted"]:
+        state.set_container_state(name, "exists")
+    state.set_container_config_hash("same", service_config_hash(same, "sha256:1"))
+    state.set_container_config_hash(
+        "drifted", service_config_hash(Service("drifted", image="nginx:1"), "sha256:1")
+    )
+    listener = ExecutionListenerStd()
+    operator = HashOperator(listener)
+    CommandUp(
+        stack=stack,
+        operator=operator,
+        system_interactions=FakeUserInteractions(),
+        auditor=listener,
+        dry_run=False,
+        live_check=False,
+        stack_state=state,
+    ).up()
+
+    assert operator.removed == ["drifted"]
+    assert operator.run == ["drifted"]
+    assert [
+        type(evt)
+        for evt in listener.get_events()
+        if isinstance(evt, ExecutionEvtContainer)
+    ] == [
+        ExecutionEvtContainerRemoved,
+        ExecutionEvtContainerUnchanged,
+        ExecutionEvtContainerRun,
+    ]
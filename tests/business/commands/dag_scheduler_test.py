@@ -0,0 +1,75 @@
+import threading
+
+import pytest
+
+from containup.business.commands.dag_scheduler import DagScheduler
+
+
+def test_one_worker_runs_in_given_order():
+    calls: list[str] = []
+    result = DagScheduler(1).run(["a", "b", "c"], {"b": ["a"]}, calls.append)
+    assert calls == ["a", "b", "c"]
+    assert result.done == ["a", "b", "c"]
+    assert result.errors == {}
+    assert result.skipped == []
+
+
+def test_dependencies_are_done_before_dependents():
+    lock = threading.Lock()
+    calls: list[str] = []
+
+    def action(node: str) -> None:
+        with lock:
+            calls.append(node)
+
+    deps = {"api": ["db", "cache"], "front": ["api"]}
+    DagScheduler(4).run(["db", "cache", "api", "front"], deps, action)
+    assert calls.index("db") < calls.index("api")
+    assert calls.index("cache") < calls.index("api")
+    assert calls.index("api") < calls.index("front")
+
+
+def test_independent_nodes_run_at_the_same_time():
+    barrier = threading.Barrier(3, timeout=5)
+
+    def action(node: str) -> None:
+        barrier.wait()
+
+    result = DagScheduler(3).run(["a", "b", "c"], {}, action)
+    assert sorted(result.done) == ["a", "b", "c"]
+
+
+def test_unscheduled_dependencies_are_satisfied():
+    calls: list[str] = []
+    DagScheduler(2).run(["web"], {"web": ["db"]}, calls.append)
+    assert calls == ["web"]
+
+
+def test_error_skips_dependents_and_stops():
+    def action(node: str) -> None:
+        if node == "db":
+            raise RuntimeError("boom")
+
+    result = DagScheduler(1).run(
+        ["db", "api", "other"], {"api": ["db"]}, action, stop_on_error=True
+    )
+    assert list(result.errors) == ["db"]
+    assert result.skipped == ["api", "other"]
+    assert isinstance(result.first_error(["db", "api", "other"]), RuntimeError)
+
+
+def test_error_without_stop_continues_with_independent_nodes():
+    def action(node: str) -> None:
+        if node == "db":
+            raise RuntimeError("boom")
+
+    result = DagScheduler(1).run(
+        ["db", "api", "other"], {"api": ["db"]}, action, stop_on_error=False
+    )
+    assert result.done == ["other"]
+    assert result.skipped == ["api"]
+
+
+def test_invalid_workers():
+    with pytest.raises(ValueError):
+        DagScheduler(0)
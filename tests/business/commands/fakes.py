@@ -0,0 +1,17 @@
+import time
+
+from containup.business.commands.user_interactions import UserInteractions
+
+
+class FakeUserInteractions(UserInteractions):
+    def __init__(self):
+        self.exit_codes: list[int] = []
+
+    def exit_with_error(self, error_code: int):
+        self.exit_codes.append(error_code)
+
+    def time(self) -> float:
+        return time.time()
+
+    def sleep(self, seconds: float) -> None:
+        pass
@@ -0,0 +1,96 @@
+import threading
+import time
+from typing import Optional
+
+from containup import Service, Stack
+from containup.business.commands.command_up import CommandUp
+from containup.business.commands.container_operator import Cancellation
+from containup.business.commands.image_pulls import (
+    ImagePulls,
+    group_image_references,
+)
+from containup.business.execution_listener import ExecutionListenerStd
+from containup.business.live_state.stack_state import StackState
+from containup.infra.dryrun.dryrun_operator import DryRunOperator
+from tests.business.commands.fakes import FakeUserInteractions
+
+
+class CountingOperator(DryRunOperator):
+    def __init__(self):
+        super().__init__(ExecutionListenerStd())
+        self._lock = threading.Lock()
+        self.pulled: list[str] = []
+        self.running: dict[str, int] = {}
+        self.max_running: dict[str, int] = {}
+
+    def image_pull(self, image: str, cancellation: Optional[Cancellation] = None):
+        registry = image.split("/")[0]
+        with self._lock:
+            self.running[registry] = self.running.get(registry, 0) + 1
+            self.max_running[registry] = max(
+                self.max_running.get(registry, 0), self.running[registry]
+            )
+        time.sleep(0.02)
+        with self._lock:
+            self.running[registry] -= 1
+            self.pulled.append(image)
+
+
+def test_group_image_references():
+    groups = group_image_references(
+        ["nginx", "postgres:17", "nginx:latest", "docker.io/library/nginx:latest"]
+    )
+    assert groups == {
+        "docker.io/library/nginx:latest": [
+            "nginx",
+            "nginx:latest",
+            "docker.io/library/nginx:latest",
+        ],
+        "docker.io/library/postgres:17": ["postgres:17"],
+    }
+
+
+def test_pulls_are_limited_per_registry():
+    operator = CountingOperator()
+    images = [f"ghcr.io/app{i}:1" for i in range(4)] + ["quay.io/other:1"]
+    ImagePulls(operator, per_registry_limit=2).pull_all(images)
+    assert sorted(operator.pulled) == sorted(images)
+    assert operator.max_running["ghcr.io"] == 2
+    assert operator.max_running["quay.io"] == 1
+
+
+def test_pull_threads_match_the_registry_limits():
+    operator = CountingOperator()
+    threads: set[int] = set()
+    pull = operator.image_pull
+
+    def image_pull(image: str, cancellation: Optional[Cancellation] = None):
+        threads.add(threading.get_ident())
+        pull(image, cancellation)
+
+    operator.image_pull = image_pull
+    images = [f"ghcr.io/app{i}:1" for i in range(10)] + ["quay.io/other:1"]
+    ImagePulls(operator, per_registry_limit=3).pull_all(images)
+    assert sorted(operator.pulled) == sorted(images)
+    assert len(threads) == 3 + 1
+
+
+def test_command_up_pulls_each_image_once():
+    stack = Stack("test").add(
+        [
+            Service("a", image="nginx"),
+            Service("b", image="nginx:latest"),
+            Service("c", image="redis:7"),
+        ]
+    )
+    operator = CountingOperator()
+    CommandUp(
+        stack=stack,
+        operator=operator,
+        system_interactions=FakeUserInteractions(),
+        auditor=ExecutionListenerStd(),
+        dry_run=False,
+        live_check=False,
+        stack_state=StackState(),
+    ).up()
+    assert sorted(operator.pulled) == ["nginx", "redis:7"]
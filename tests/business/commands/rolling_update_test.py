@@ -0,0 +1,234 @@
+import threading
+import time
+
+import pytest
+
+from containup import CmdHealthcheck, Service, ServiceGroup, Stack, port
+from containup.stack.service_ports import ServicePortMappings
+from containup.business.commands.command_down import CommandDown
+from containup.business.commands.command_up import CommandUp
+from containup.business.commands.container_health_status import ContainerHealthStatus
+from containup.business.commands.rolling_gate import replaced_name
+from containup.business.execution_listener import (
+    ExecutionEvtContainerRemoved,
+    ExecutionEvtContainerRun,
+    ExecutionListenerStd,
+)
+from containup.business.live_state.stack_state import StackState
+from containup.infra.dryrun.dryrun_operator import DryRunOperator
+from tests.business.commands.fakes import FakeUserInteractions
+
+
+class RollingOperator(DryRunOperator):
+    """Tracks how many containers can serve while the group is replaced."""
+
+    def __init__(self, listener: ExecutionListenerStd, failing: set[str] = set()):
+        super().__init__(listener)
+        self._lock = threading.Lock()
+        self._starting: set[str] = set()
+        self._failing = failing
+        self.min_available: int = 1_000
+        self.calls: list[str] = []
+
+    def container_names(self) -> list[str]:
+        return sorted(self._containers)
+
+    def _record(self, call: str) -> None:
+        self.calls.append(call)
+        available = len([c for c in self._containers if c not in self._starting])
+        self.min_available = min(self.min_available, available)
+
+    def container_run(self, stack_name: str, service: Service):
+        with self._lock:
+            super().container_run(stack_name, service)
+            self._starting.add(service.container_name_safe())
+            self._record(f"run {service.container_name_safe()}")
+
+    def container_remove(self, container_name: str):
+        with self._lock:
+            super().container_remove(container_name)
+            self._starting.discard(container_name)
+            self._record(f"remove {container_name}")
+
+    def container_rename(self, container_name: str, new_name: str) -> None:
+        with self._lock:
+            super().container_rename(container_name, new_name)
+            self._record(f"rename {container_name} {new_name}")
+
+    def container_wait_healthy(
+        self, stack_name: str, container_name: str, timeout: float
+    ) -> ContainerHealthStatus:
+        time.sleep(0.01)
+        if container_name in self._failing:
+            return ContainerHealthStatus("exited", "unhealthy")
+        with self._lock:
+            self._starting.discard(container_name)
+        return ContainerHealthStatus("running", "healthy")
+
+
+def group(
+    size: int, max_unavailable: int, max_surge: int, ports: ServicePortMappings = []
+) -> ServiceGroup:
+    return ServiceGroup(
+        "web",
+        [
+            Service(
+                f"web_{i}", "web:2", healthcheck=CmdHealthcheck(["ok"]), ports=ports
+            )
+            for i in range(size)
+        ],
+        max_unavailable=max_unavailable,
+        max_surge=max_surge,
+    )
+
+
+def run_up(stack: Stack, operator: RollingOperator, listener: ExecutionListenerStd):
+    state = StackState()
+    for service in stack.services:
+        operator.container_run(stack.name, service)
+        operator.container_wait_healthy(stack.name, service.name, 1)
+        state.set_container_state(service.name, "exists")
+    operator.calls.clear()
+    operator.min_available = len(stack.services)
+    interactions = FakeUserInteractions()
+    CommandUp(
+        stack=stack,
+        operator=operator,
+        system_interactions=interactions,
+        auditor=listener,
+        dry_run=False,
+        live_check=False,
+        stack_state=state,
+        parallel=8,
+    ).up()
+    return interactions
+
+
+@pytest.mark.parametrize("max_unavailable,max_surge", [(1, 0), (2, 0), (0, 1), (1, 2)])
+def test_rolling_keeps_availability(max_unavailable: int, max_surge: int):
+    listener = ExecutionListenerStd()
+    operator = RollingOperator(listener)
+    stack = Stack("test").add(group(5, max_unavailable, max_surge))
+
+    interactions = run_up(stack, operator, listener)
+
+    assert interactions.exit_codes == []
+    assert operator.min_available >= 5 - max_unavailable
+    assert operator.container_names() == [f"web_{i}" for i in range(5)]
+    removed = [
+        e.container_id
+        for e in listener.get_events()
+        if isinstance(e, ExecutionEvtContainerRemoved)
+    ]
+    runs = [
+        e.container_id
+        for e in listener.get_events()
+        if isinstance(e, ExecutionEvtContainerRun)
+    ]
+    assert removed == runs == [f"web_{i}" for i in range(5)]
+
+
+def test_surge_removes_old_container_once_new_one_is_healthy():
+    listener = ExecutionListenerStd()
+    operator = RollingOperator(listener)
+    stack = Stack("test").add(group(1, 0, 1))
+
+    run_up(stack, operator, listener)
+
+    old = replaced_name("web_0")
+    assert operator.calls == [f"rename web_0 {old}", "run web_0", f"remove {old}"]
+    assert operator.min_available == 1
+
+
+def test_fixed_host_ports_are_replaced_in_place():
+    listener = ExecutionListenerStd()
+    operator = RollingOperator(listener)
+    stack = Stack("test").add(group(1, 1, 1, ports=[port(80, 8080)]))
+
+    run_up(stack, operator, listener)
+
+    assert operator.calls == ["remove web_0", "run web_0"]
+
+
+def test_failed_surge_restores_old_container_and_stops():
+    listener = ExecutionListenerStd()
+    operator = RollingOperator(listener, failing={"web_0"})
+    stack = Stack("test").add(group(3, 0, 1))
+    interactions = run_up(stack, operator, listener)
+
+    assert interactions.exit_codes == [1]
+    assert operator.container_names() == ["web_0", "web_1", "web_2"]
+    assert "run web_1" not in operator.calls
+    assert not [
+        e for e in listener.get_events() if isinstance(e, ExecutionEvtContainerRun)
+    ]
+
+
+class InterruptedOperator(RollingOperator):
+    """Interrupted (Ctrl-C) while waiting for the new container to be healthy."""
+
+    def container_wait_healthy(
+        self, stack_name: str, container_name: str, timeout: float
+    ) -> ContainerHealthStatus:
+        if f"rename {container_name} {replaced_name(container_name)}" in self.calls:
+            raise KeyboardInterrupt()
+        return super().container_wait_healthy(stack_name, container_name, timeout)
+
+
+def test_interrupted_surge_restores_old_container():
+    listener = ExecutionListenerStd()
+    operator = InterruptedOperator(listener)
+    stack = Stack("test").add(group(1, 0, 1))
+
+    with pytest.raises(KeyboardInterrupt):
+        run_up(stack, operator, listener)
+
+    old = replaced_name("web_0")
+    assert operator.container_names() == ["web_0"]
+    assert operator.calls == [
+        f"rename web_0 {old}",
+        "run web_0",
+        "remove web_0",
+        f"rename {old} web_0",
+    ]
+
+
+def test_down_removes_old_container_left_by_a_replacement():
+    listener = ExecutionListenerStd()
+    operator = RollingOperator(listener)
+    stack = Stack("test").add(group(2, 0, 1))
+    for service in stack.services:
+        operator.container_run(stack.name, service)
+    # interrupted while the new web_1 was starting next to the old one
+    operator.container_rename("web_1", replaced_name("web_1"))
+    operator.container_run(stack.name, stack.services[1])
+
+    CommandDown(
+        stack=stack,
+        operator=operator,
+        system_interactions=FakeUserInteractions(),
+        auditor=listener,
+        dry_run=False,
+        live_check=False,
+        stack_state=StackState(),
+    ).down()
+
+    assert operator.container_names() == []
+    assert [
+        e.container_id
+        for e in listener.get_events()
+        if isinstance(e, ExecutionEvtContainerRemoved)
+    ] == [replaced_name("web_1"), "web_1", "web_0"]
+
+
+def test_stack_add_group_adds_members():
+    web = group(2, 1, 0)
+    stack = Stack("test").add(web)
+    assert [s.name for s in stack.services] == ["web_0", "web_1"]
+    assert stack.group_of("web_1") is web
+    assert stack.group_of("other") is None
+
+
+def test_group_needs_some_room():
+    with pytest.raises(ValueError):
+        ServiceGroup("web", max_unavailable=0, max_surge=0)
@@ -0,0 +1,31 @@
+from containup import BindMount, Service, VolumeMount, port, secret
+from containup.business.commands.service_config_hash import service_config_hash
+
+
+def make_service(password: str = "pwd", env: str = "1") -> Service:
+    return Service(
+        "web",
+        image="nginx:1.27",
+        environment={"ENV": env, "PASSWORD": secret("password", password)},
+        volumes=[VolumeMount("data", "/data"), BindMount("/srv", "/srv", True)],
+        ports=[port(80, 8080)],
+    )
+
+
+def test_same_definition_same_hash():
+    # mounts get a new random id each time, it must not change the hash
+    assert service_config_hash(make_service(), "sha256:1") == service_config_hash(
+        make_service(), "sha256:1"
+    )
+
+
+def test_hash_changes_with_definition():
+    reference = service_config_hash(make_service(), "sha256:1")
+    assert service_config_hash(make_service(env="2"), "sha256:1") != reference
+    assert service_config_hash(make_service(password="other"), "sha256:1") != reference
+
+
+def test_hash_changes_with_image_digest():
+    assert service_config_hash(make_service(), "sha256:1") != service_config_hash(
+        make_service(), "sha256:2"
+    )
@@ -0,0 +1,74 @@
+import pytest
+
+from containup import Service, ServiceGroup, Stack
+from containup.business.commands.container_health_status import ContainerHealthStatus
+from containup.business.commands.container_operator import ContainerOperatorException
+from containup.business.commands.service_config_hash import service_config_hash
+from containup.business.commands.up_plan import UpPlan, check_healthy
+from containup.business.execution_listener import (
+    ExecutionEvtContainerRemoved,
+    ExecutionEvtContainerRun,
+    ExecutionEvtContainerUnchanged,
+    ExecutionListenerStd,
+)
+from containup.business.live_state.stack_state import StackState
+
+
+def services() -> list[Service]:
+    return [
+        Service("kept", "kept:1"),
+        Service("changed", "changed:1"),
+        Service("new", "new:1"),
+    ]
+
+
+def stack_of(items: list[Service]) -> Stack:
+    stack = Stack("test")
+    for item in items:
+        stack.add(item)
+    return stack
+
+
+def test_decide_chooses_an_action_per_service():
+    stack = stack_of(services())
+    stack.add(ServiceGroup("web", [Service("web_0", "web:1")]))
+    state = StackState()
+    for name in ["kept", "changed", "web_0"]:
+        state.set_container_state(name, "exists")
+    state.set_container_config_hash("kept", service_config_hash(services()[0], "sha"))
+    state.set_container_config_hash("changed", "outdated")
+    plan = UpPlan(stack, state, ExecutionListenerStd(), dry_run=False, live_check=False)
+
+    all_services = stack.get_services_sorted()
+    assert plan.images_to_identify(all_services) == ["kept:1", "changed:1"]
+    plan.decide(all_services, {"kept:1": "sha", "changed:1": "sha"})
+
+    assert {s.name: plan.action(s) for s in all_services} == {
+        "kept": "unchanged",
+        "changed": "recreate",
+        "new": "run",
+        "web_0": "rolling",
+    }
+    by_name = {s.name: s for s in all_services}
+    kept, web_0 = by_name["kept"], by_name["web_0"]
+    assert plan.start_events(kept) == [ExecutionEvtContainerUnchanged("kept")]
+    assert plan.start_events(web_0) == [
+        ExecutionEvtContainerRemoved("web_0"),
+        ExecutionEvtContainerRun("web_0", web_0),
+    ]
+
+
+def test_dry_run_records_events_but_returns_no_work():
+    stack = stack_of(services())
+    listener = ExecutionListenerStd()
+    plan = UpPlan(stack, StackState(), listener, dry_run=True, live_check=False)
+
+    assert plan.images_to_pull(stack.get_services_sorted()) == []
+    assert len(listener.get_events()) == 3
+    assert plan.images_to_identify(stack.get_services_sorted()) == []
+    assert plan.health_wait(stack.services[0]) is None
+
+
+def test_check_healthy_fails_on_removed_container():
+    with pytest.raises(ContainerOperatorException, match="was removed"):
+        check_healthy("web", ContainerHealthStatus("removed", "starting"))
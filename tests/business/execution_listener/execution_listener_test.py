@@ -0,0 +1,59 @@
+from containup import Service
+from containup.business.execution_listener import (
+    ExecutionEvt,
+    ExecutionEvtContainer,
+    ExecutionEvtContainerRemoved,
+    ExecutionEvtContainerRun,
+    ExecutionEvtImage,
+    ExecutionEvtImagePull,
+    ExecutionEvtOperation,
+    ExecutionEvtVolume,
+    ExecutionEvtVolumeCreated,
+    ExecutionListener,
+    ExecutionListenerStd,
+)
+from containup.stack.volume import Volume
+
+
+class ListOnlyListener(ExecutionListener):
+    """Listener without index, uses the default events_of"""
+
+    def __init__(self):
+        self._events: list[ExecutionEvt] = []
+
+    def record(self, message: ExecutionEvt) -> None:
+        self._events.append(message)
+
+    def get_events(self) -> list[ExecutionEvt]:
+        return self._events
+
+
+def record_all(listener: ExecutionListener) -> None:
+    listener.record(ExecutionEvtContainerRemoved("api"))
+    listener.record(ExecutionEvtImagePull("nginx"))
+    listener.record(ExecutionEvtContainerRun("api", Service("api", "nginx")))
+    listener.record(ExecutionEvtContainerRemoved("db"))
+    listener.record(ExecutionEvtVolumeCreated("api", Volume("api")))
+    listener.record(ExecutionEvtOperation("run", "container", "api", 0, 1))
+
+
+def test_events_of_resource():
+    for listener in [ExecutionListenerStd(), ListOnlyListener()]:
+        record_all(listener)
+        api = listener.events_of(ExecutionEvtContainer, "api")
+        assert [type(e) for e in api] == [
+            ExecutionEvtContainerRemoved,
+            ExecutionEvtContainerRun,
+        ]
+        assert listener.events_of(ExecutionEvtContainerRun, "db") == []
+        assert len(listener.events_of(ExecutionEvtVolume, "api")) == 1
+        assert listener.events_of(ExecutionEvtVolume, "db") == []
+
+
+def test_images_match_however_written():
+    for listener in [ExecutionListenerStd(), ListOnlyListener()]:
+        record_all(listener)
+        assert len(listener.events_of(ExecutionEvtImage, "nginx:latest")) == 1
+        assert (
+            len(listener.events_of(ExecutionEvtImage, "docker.io/library/nginx")) == 1
+        )
@@ -0,0 +1,60 @@
+from containup import Network, Service, Stack, Volume
+from containup.business.commands.service_config_hash import CONFIG_HASH_LABEL
+from containup.business.execution_listener import ExecutionListenerStd
+from containup.business.live_state.live_inventory import LiveContainer, LiveInventory
+from containup.business.live_state.stack_state_resolver import StackStateResolver
+from containup.infra.dryrun.dryrun_operator import DryRunOperator
+
+
+class InventoryOperator(DryRunOperator):
+    def __init__(self, inventory: LiveInventory):
+        super().__init__(ExecutionListenerStd())
+        self._inventory = inventory
+        self.calls: list[tuple[list[str], list[str], list[str]]] = []
+
+    def inventory(
+        self,
+        container_names: list[str],
+        volume_names: list[str],
+        network_names: list[str],
+    ) -> LiveInventory:
+        self.calls.append((container_names, volume_names, network_names))
+        return self._inventory
+
+
+def test_resolve_with_one_inventory():
+    inventory = LiveInventory(
+        containers={
+            "db": LiveContainer("db", True, {CONFIG_HASH_LABEL: "abc"}),
+            "old": LiveContainer("old", False, {CONFIG_HASH_LABEL: "def"}),
+        },
+        volumes={"data"},
+        networks={"other"},
+    )
+    inventory.add_image("sha256:1", ["nginx:latest", "postgres@sha256:d1"])
+    stack = Stack("test").add(
+        [
+            Volume("data"),
+            Volume("logs"),
+            Network("back"),
+            Service("db", image="postgres:17@sha256:d1"),
+            Service("web", image="docker.io/library/nginx"),
+            Service("old", image="redis:7"),
+        ]
+    )
+    operator = InventoryOperator(inventory)
+    state = StackStateResolver(operator).resolve(stack)
+
+    assert operator.calls == [(["db", "web", "old"], ["data", "logs"], ["back"])]
+    assert state.get_volume_state("data") == "exists"
+    assert state.get_volume_state("logs") == "missing"
+    assert state.get_network_state("back") == "missing"
+    assert state.get_image_state("postgres:17@sha256:d1") == "exists"
+    assert state.get_image_state("docker.io/library/nginx") == "exists"
+    assert state.get_image_id("docker.io/library/nginx") == "sha256:1"
+    assert state.get_image_state("redis:7") == "missing"
+    assert state.get_container_state("db") == "exists"
+    assert state.get_container_state("web") == "missing"
+    assert state.get_container_config_hash("db") == "abc"
+    # only running containers are candidates to be kept as is
+    assert state.get_container_config_hash("old") is None
@@ -0,0 +1,9 @@
+from containup.business.plugins.plugin_builtins import PluginBuiltins
+from containup.business.plugins.plugin_registry import PluginRegistry, register
+
+
+def test_registering_twice_keeps_one_plugin():
+    register(PluginBuiltins)
+    register(PluginBuiltins)
+    codes = [i.code for i in PluginRegistry().get_all_inspectors()]
+    assert len(codes) == len(set(codes))
@@ -0,0 +1,82 @@
+import json
+
+from containup import Service, Stack
+from containup.business.reports.report_graph import (
+    ServiceTimings,
+    critical_path,
+    graph_dot,
+    graph_json,
+    timings_from_trace,
+)
+
+
+def stack() -> Stack:
+    return Stack("shop").add(
+        [
+            Service("db", "postgres:16"),
+            Service("cache", "redis:7"),
+            Service("api", "shop/api:1", depends_on=["db", "cache"]),
+            Service("web", "nginx", depends_on=["api"]),
+            Service("worker", "shop/api:1", depends_on=["cache"]),
+        ]
+    )
+
+
+TIMINGS = {
+    "db": ServiceTimings(pull=4.0, start=0.5, health=9.5),
+    "cache": ServiceTimings(start=0.5, health=1.0),
+    "api": ServiceTimings(start=1.0, health=3.0),
+    "web": ServiceTimings(start=0.5),
+    "worker": ServiceTimings(start=0.5, health=20.0),
+}
+
+
+def test_critical_path_follows_slowest_dependencies():
+    path = critical_path(stack(), TIMINGS)
+    assert path.services == ["cache", "worker"]
+    assert path.seconds == 22.0
+
+    faster_worker = {**TIMINGS, "worker": ServiceTimings(start=1.0)}
+    path = critical_path(stack(), faster_worker)
+    assert path.services == ["db", "api", "web"]
+    assert path.seconds == 14.5
+
+
+def test_timings_from_trace_sums_spans_per_service():
+    def span(name: str, cat: str, resource: str, dur: int):
+        return {
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "dur": dur,
+            "args": {"resource": resource},
+        }
+
+    trace = {
+        "traceEvents": [
+            {"name": "thread_name", "ph": "M", "args": {"name": "db"}},
+            span("pull", "image", "docker.io/library/nginx:latest", 2_000_000),
+            span("run", "container", "db", 500_000),
+            span("health wait", "container", "db", 3_000_000),
+            span("remove", "container", "db", 100_000),
+        ]
+    }
+    timings = timings_from_trace(stack(), trace)
+    assert timings["db"] == ServiceTimings(pull=0.0, start=0.5, health=3.0)
+    assert timings["web"].pull == 2.0
+
+
+def test_graph_json_marks_critical_services():
+    graph = json.loads(graph_json(stack(), TIMINGS))
+    assert graph["critical_path"] == ["cache", "worker"]
+    assert {"from": "db", "to": "api"} in graph["edges"]
+    critical = [s["name"] for s in graph["services"] if s["critical"]]
+    assert critical == ["cache", "worker"]
+
+
+def test_graph_dot_without_timings():
+    dot = graph_dot(stack())
+    assert dot.startswith('digraph "shop" {')
+    assert '  "api" -> "web";' in dot
+    assert "color=red" not in dot
+    assert '"cache" -> "worker" [color=red, penwidth=2];' in graph_dot(stack(), TIMINGS)
@@ -0,0 +1,115 @@
+import json
+
+from containup import CmdHealthcheck, Service, Stack, Volume
+from containup.business.commands.command_up import CommandUp
+from containup.business.commands.timed_operator import (
+    OperationTimer,
+    TimedContainerOperator,
+)
+from containup.business.execution_listener import (
+    ExecutionEvtOperation,
+    ExecutionListenerStd,
+)
+from containup.business.live_state.stack_state import StackState
+from containup.business.reports.report_trace import chrome_trace
+from containup.infra.dryrun.dryrun_operator import DryRunOperator
+from tests.business.commands.fakes import FakeUserInteractions
+
+
+class TickClock:
+    """Each reading is one second after the previous one."""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        self.now += 1
+        return self.now
+
+
+def stack() -> Stack:
+    return Stack("test").add(
+        [
+            Volume("data"),
+            Service("db", "db:1", healthcheck=CmdHealthcheck(["ok"])),
+            Service("api", "api:1", container_name="my_api", depends_on=["db"]),
+        ]
+    )
+
+
+def run_up(listener: ExecutionListenerStd, parallel: int = 1) -> OperationTimer:
+    timer = OperationTimer(TickClock())
+    CommandUp(
+        stack=stack(),
+        operator=TimedContainerOperator(DryRunOperator(listener), timer),
+        system_interactions=FakeUserInteractions(),
+        auditor=listener,
+        dry_run=False,
+        live_check=False,
+        stack_state=StackState(),
+        parallel=parallel,
+    ).up()
+    return timer
+
+
+def test_up_records_timed_operations():
+    listener = ExecutionListenerStd()
+    timer = run_up(listener)
+    operations = [
+        (evt.operation, evt.resource, evt.duration) for evt in timer.operations()
+    ]
+    assert operations == [
+        ("create", "data", 1.0),
+        ("pull", "db:1", 1.0),
+        ("pull", "api:1", 1.0),
+        ("run", "db", 1.0),
+        ("health wait", "db", 1.0),
+        ("run", "my_api", 1.0),
+    ]
+
+
+def test_chrome_trace_has_one_track_per_service():
+    timer = run_up(ExecutionListenerStd())
+    trace = json.loads(json.dumps(chrome_trace(stack(), timer.operations())))
+
+    names = {
+        e["tid"]: e["args"]["name"]
+        for e in trace["traceEvents"]
+        if e["name"] == "thread_name"
+    }
+    spans = [
+        (names[e["tid"]], e["name"], e["ts"], e["dur"])
+        for e in trace["traceEvents"]
+        if e["ph"] == "X"
+    ]
+    assert spans == [
+        ("volume data", "create", 0, 1_000_000),
+        ("image db:1", "pull", 2_000_000, 1_000_000),
+        ("image api:1", "pull", 4_000_000, 1_000_000),
+        ("db", "run", 6_000_000, 1_000_000),
+        ("db", "health wait", 8_000_000, 1_000_000),
+        ("api", "run", 10_000_000, 1_000_000),
+    ]
+    assert list(names.values())[:2] == ["db", "api"]
+
+
+def test_failed_operation_is_recorded():
+    timer = OperationTimer(TickClock())
+    try:
+        with timer.timed("remove", "container", "db"):
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+    [evt] = timer.operations()
+    assert evt.failed
+
+
+def test_timings_stay_out_of_the_listener_events():
+    sequential = ExecutionListenerStd()
+    run_up(sequential)
+    parallel = ExecutionListenerStd()
+    run_up(parallel, parallel=4)
+    assert not [
+        e for e in parallel.get_events() if isinstance(e, ExecutionEvtOperation)
+    ]
+    assert parallel.get_events() == sequential.get_events()
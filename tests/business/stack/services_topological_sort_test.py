@@ -6,6 +6,7 @@ from containup.stack.stack import (
     ServiceUnknownDependencyException,
     ServiceCycleException,
 )
+from containup.stack.stack_graph import services_cycles, services_topological_levels
 
 
 def service(name: str, depends_on: list[str] = []) -> Service:
@@ -49,3 +50,47 @@ def test_cycle_detection():
 
 def test_empty_service_list():
     assert services_topological_sort([]) == []
+
+
+def test_deep_chain_beyond_recursion_limit():
+    services = [service("s0")] + [
+        service(f"s{i}", depends_on=[f"s{i - 1}"]) for i in range(1, 5000)
+    ]
+    sorted_names = [s.name for s in services_topological_sort(services[::-1])]
+    assert sorted_names == [f"s{i}" for i in range(5000)]
+
+
+def test_every_cycle_reported():
+    services = [
+        service("a", depends_on=["b"]),
+        service("b", depends_on=["a"]),
+        service("ok"),
+        service("c", depends_on=["d", "ok"]),
+        service("d", depends_on=["e"]),
+        service("e", depends_on=["c"]),
+        service("self", depends_on=["self"]),
+    ]
+    with pytest.raises(ServiceCycleException) as e:
+        services_topological_sort(services)
+    assert e.value.cycles == [["a", "b"], ["c", "d", "e"], ["self"]]
+    assert services_cycles(services[2:3]) == []
+
+
+def test_every_unknown_dependency_reported():
+    services = [service("web", depends_on=["db"]), service("api", depends_on=["mq"])]
+    with pytest.raises(ServiceUnknownDependencyException, match="'db'.*'mq'"):
+        services_topological_sort(services)
+
+
+def test_levels():
+    services = [
+        service("frontend", depends_on=["api"]),
+        service("api", depends_on=["db", "redis"]),
+        service("db"),
+        service("worker", depends_on=["redis"]),
+        service("redis"),
+    ]
+    levels = [
+        [s.name for s in level] for level in services_topological_levels(services)
+    ]
+    assert levels == [["db", "redis"], ["api", "worker"], ["frontend"]]
@@ -0,0 +1,82 @@
+import pytest
+
+from containup.stack.service_group import ServiceGroup
+from containup.stack.stack import Service, ServiceDuplicateException, Stack
+
+
+def service(name: str, depends_on: list[str] = []) -> Service:
+    return Service(name, image="dummy", depends_on=depends_on)
+
+
+def test_duplicate_name_rejected():
+    stack = Stack("s").add(service("db"))
+    with pytest.raises(ServiceDuplicateException):
+        stack.add(service("db"))
+
+
+def test_dependencies_and_dependents():
+    stack = Stack("s").add(
+        [
+            service("db"),
+            service("api", depends_on=["db"]),
+            service("worker", depends_on=["db"]),
+        ]
+    )
+    assert stack.graph.get("api") is stack.services[1]
+    assert stack.graph.get("missing") is None
+    assert stack.graph.dependencies("api") == ["db"]
+    assert stack.graph.dependents("db") == ["api", "worker"]
+    assert stack.graph.dependents("api") == []
+
+
+def test_levels():
+    stack = Stack("s").add(
+        [
+            service("front", depends_on=["api"]),
+            service("api", depends_on=["db", "cache"]),
+            service("db"),
+            service("cache"),
+        ]
+    )
+    assert stack.graph.levels() == {"db": 0, "cache": 0, "api": 1, "front": 2}
+
+
+def test_order_recomputed_after_add():
+    stack = Stack("s").add(service("db"))
+    assert [s.name for s in stack.get_services_sorted()] == ["db"]
+    stack.add(service("api", depends_on=["db"]))
+    assert [s.name for s in stack.get_services_sorted()] == ["db", "api"]
+    assert stack.graph.levels()["api"] == 1
+
+
+def test_services_appended_directly_are_indexed():
+    stack = Stack("s").add(service("db"))
+    stack.services.append(service("api", depends_on=["db"]))
+    assert stack.graph.dependents("db") == ["api"]
+
+
+def test_services_replaced_directly_are_indexed():
+    stack = Stack("s").add([service("db"), service("api")])
+    assert stack.graph.dependents("db") == []
+    # same number of services, the graph still sees the change
+    stack.services[1] = service("api", depends_on=["db"])
+    assert stack.graph.dependents("db") == ["api"]
+    stack.services = [service("cache")]
+    assert [s.name for s in stack.get_services_sorted()] == ["cache"]
+
+
+def test_group_of():
+    group = ServiceGroup("web", [service("web-1"), service("web-2")])
+    stack = Stack("s").add([service("db"), group])
+    assert stack.group_of("web-2") is group
+    assert stack.group_of("db") is None
+
+
+def test_waves():
+    stack = Stack("s").add(
+        [service("api", depends_on=["db"]), service("db"), service("cache")]
+    )
+    assert [[s.name for s in wave] for wave in stack.graph.waves()] == [
+        ["db", "cache"],
+        ["api"],
+    ]
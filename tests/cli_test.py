@@ -138,3 +138,44 @@ def test_given_down__when_cli__then_up_and_services_found() -> None:
     assert containup_cli_args(
         "myprog", ["down", "--service", "myservice", "myotherservice"]
     ).services == ["myservice", "myotherservice"]
+
+
+# Tests for parallel
+# ------------------
+
+
+def test_given_up__when_cli__then_parallel_defaults_to_one() -> None:
+    assert containup_cli_args("myprog", ["up"]).parallel == 1
+
+
+def test_given_up_with_parallel__when_cli__then_parallel_found() -> None:
+    assert containup_cli_args("myprog", ["up", "--parallel", "8"]).parallel == 8
+
+
+def test_given_up_with_trace_out__when_cli__then_trace_file_found() -> None:
+    args = containup_cli_args("myprog", ["up", "--trace-out", "trace.json"])
+    assert args.trace_out == "trace.json"
+    assert containup_cli_args("myprog", ["up"]).trace_out is None
+
+
+def test_given_graph__when_cli__then_format_and_timings_found() -> None:
+    args = containup_cli_args(
+        "myprog", ["graph", "--format", "json", "--timings", "trace.json"]
+    )
+    assert args.command == "graph"
+    assert args.graph_format == "json"
+    assert args.timings == "trace.json"
+    assert containup_cli_args("myprog", ["graph"]).graph_format == "dot"
+
+
+def test_given_check_with_audit_stats__when_cli__then_audit_options_found() -> None:
+    args = containup_cli_args(
+        "myprog", ["check", "--audit-stats", "--audit-timeout", "2.5"]
+    )
+    assert args.audit_stats
+    assert args.audit_timeout == 2.5
+    assert args.audit_cache is None
+    args = containup_cli_args("myprog", ["check", "--audit-cache", ".audit.json"])
+    assert args.audit_cache == ".audit.json"
+    assert not containup_cli_args("myprog", ["check"]).audit_stats
+    assert containup_cli_args("myprog", ["up"]).audit_timeout == 60
@@ -0,0 +1,123 @@
+import json
+import os
+import socketserver
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler
+from typing import Any, Iterator
+
+import pytest
+
+from containup import Service, port
+from containup.infra.docker.engine_client import EngineApiNotFound, EngineClient
+from containup.infra.docker.engine_operator import container_create_body
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def address_string(self) -> str:
+        return "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        if self.path == "/v1.41/containers/web/json":
+            self._json(200, {"Id": "abc", "State": {"Status": "running"}})
+        elif self.path.startswith("/v1.41/events"):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for event in [{"id": "abc", "Action": "die"}, {"id": "def"}]:
+                line = (json.dumps(event) + "\n").encode()
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(line), line))
+            self.wfile.write(b"0\r\n\r\n")
+        else:
+            self._json(404, {"message": f"No such container: {self.path}"})
+
+    def _json(self, status: int, data: Any) -> None:
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str):
+        super().__init__(path, Handler)
+        self.connections = 0
+
+    def process_request(self, request: Any, client_address: Any) -> None:
+        self.connections += 1
+        super().process_request(request, client_address)
+
+
+@pytest.fixture
+def server() -> Iterator[Server]:
+    with tempfile.TemporaryDirectory() as directory:
+        server = Server(os.path.join(directory, "docker.sock"))
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield server
+        server.shutdown()
+        server.server_close()
+
+
+def client(server: Server) -> EngineClient:
+    return EngineClient(str(server.server_address), api_version="1.41")
+
+
+def test_connection_kept_alive(server: Server):
+    engine = client(server)
+    for _ in range(5):
+        assert engine.get("/containers/web/json")["Id"] == "abc"
+    assert engine.connections_opened == 1
+    assert server.connections == 1
+    engine.close()
+
+
+def test_not_found(server: Server):
+    engine = client(server)
+    with pytest.raises(EngineApiNotFound) as error:
+        engine.get("/containers/missing/json")
+    assert error.value.status == 404
+    assert "No such container" in error.value.message
+    # errors don't lose the connection
+    engine.get("/containers/web/json")
+    assert engine.connections_opened == 1
+
+
+def test_stream(server: Server):
+    stream = client(server).stream("GET", "/events", {"filters": {"type": ["c"]}})
+    assert list(stream) == [{"id": "abc", "Action": "die"}, {"id": "def"}]
+    stream.close()
+
+
+def test_container_create_body():
+    service = Service(
+        "web",
+        image="nginx",
+        command=["nginx", "-g", "daemon off;"],
+        ports=[port(80, 8080), port(53, host_ip="127.0.0.1")],
+        environment={"A": "1"},
+        network="front",
+    )
+    body = container_create_body("mystack", service, {"x": "y"})
+    assert body["Image"] == "nginx"
+    assert body["Cmd"] == ["nginx", "-g", "daemon off;"]
+    assert body["Env"] == ["A=1"]
+    assert body["Labels"]["containup.stack.name"] == "mystack"
+    assert body["Labels"]["x"] == "y"
+    assert body["ExposedPorts"] == {"80/tcp": {}, "53/tcp": {}}
+    assert body["HostConfig"]["PortBindings"] == {
+        "80/tcp": [{"HostIp": "", "HostPort": "8080"}],
+        "53/tcp": [{"HostIp": "127.0.0.1", "HostPort": "53"}],
+    }
+    assert body["HostConfig"]["NetworkMode"] == "front"
+    assert "Healthcheck" not in body
@@ -0,0 +1,44 @@
+from typing import Union
+
+import pytest
+from docker.types import DriverConfig
+
+from containup import BindMount, TmpfsMount, VolumeMount
+from containup.infra.docker.engine_mounts import mounts_to_engine_specs, parse_bytes
+from containup.infra.docker.mounts import mounts_to_docker_specs
+from containup.stack.service_mounts import ServiceMounts
+
+
+def test_same_specs_as_docker_sdk():
+    mounts: ServiceMounts = [
+        BindMount("/home/me/data", "/opt/data", True, "default", "private"),
+        BindMount("/home/me/logs", "/opt/logs"),
+        VolumeMount(
+            source="volume_name",
+            target="/opt/volume",
+            read_only=True,
+            consistency="consistent",
+            no_copy=True,
+            labels={"label1": "value1"},
+            driver_config=DriverConfig(name="mydriver", options={"o": "v"}),
+        ),
+        VolumeMount(source="plain", target="/opt/plain"),
+        TmpfsMount(target="/tmp/a", tmpfs_size="64m", tmpfs_mode=0o1777),
+        TmpfsMount(target="/tmp/b", tmpfs_size=1024),
+    ]
+    assert mounts_to_engine_specs(mounts) == [
+        dict(m) for m in mounts_to_docker_specs(mounts)
+    ]
+
+
+@pytest.mark.parametrize(
+    "size,expected",
+    [(512, 512), ("512", 512), ("2k", 2048), ("64m", 64 << 20), ("1gb", 1 << 30)],
+)
+def test_parse_bytes(size: Union[int, str], expected: int):
+    assert parse_bytes(size) == expected
+
+
+def test_parse_bytes_rejects_unknown_units():
+    with pytest.raises(ValueError):
+        parse_bytes("12x")
@@ -0,0 +1,159 @@
+import queue
+import threading
+from typing import Any, Iterator, Optional
+
+from containup.business.commands.container_health_status import ContainerHealthStatus
+from containup.infra.docker.health_events import (
+    ContainerHealthWatcher,
+    EventFilters,
+    HealthEventStream,
+)
+
+
+class FakeStream:
+    def __init__(self):
+        self._queue: "queue.Queue[Optional[dict[str, Any]]]" = queue.Queue()
+
+    def push(self, container_id: str, action: str) -> None:
+        self._queue.put({"id": container_id, "Action": action})
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        while True:
+            event = self._queue.get()
+            if event is None:
+                return
+            yield event
+
+    def close(self) -> None:
+        self._queue.put(None)
+
+
+class FakeDocker:
+    def __init__(self, container_id: str, status: ContainerHealthStatus):
+        self.stream = FakeStream()
+        self.filters: list[EventFilters] = []
+        self.container_id = container_id
+        self.status = status
+        self.inspections = 0
+
+    def open_events(self, filters: EventFilters) -> HealthEventStream:
+        self.filters.append(filters)
+        return self.stream
+
+    def inspect(self, container_name: str) -> tuple[str, ContainerHealthStatus]:
+        self.inspections += 1
+        return self.container_id, self.status
+
+
+def watcher(docker: FakeDocker) -> ContainerHealthWatcher:
+    return ContainerHealthWatcher("mystack", docker.open_events, docker.inspect)
+
+
+def wait_in_thread(
+    w: ContainerHealthWatcher, timeout: float
+) -> tuple[threading.Thread, list[ContainerHealthStatus]]:
+    results: list[ContainerHealthStatus] = []
+    thread = threading.Thread(target=lambda: results.append(w.wait("web", timeout)))
+    thread.start()
+    return thread, results
+
+
+def test_already_healthy_returns_without_events():
+    docker = FakeDocker("id1", ContainerHealthStatus("running", "healthy"))
+    w = watcher(docker)
+    assert w.wait("web", 5).health == "healthy"
+    assert docker.filters[0]["label"] == ["containup.stack.name=mystack"]
+    w.close()
+
+
+def test_healthy_event_wakes_waiter():
+    docker = FakeDocker("id1", ContainerHealthStatus("running", "starting"))
+    w = watcher(docker)
+    w.start()
+    thread, results = wait_in_thread(w, 10)
+    docker.stream.push("id1", "health_status: healthy")
+    thread.join(5)
+    assert results == [ContainerHealthStatus("running", "healthy")]
+    assert docker.inspections == 1
+    w.close()
+
+
+def test_die_event_fails_immediately():
+    docker = FakeDocker("id1", ContainerHealthStatus("running", "starting"))
+    w = watcher(docker)
+    w.start()
+    thread, results = wait_in_thread(w, 10)
+    docker.stream.push("id1", "die")
+    thread.join(5)
+    assert results[0].status == "exited"
+    w.close()
+
+
+def test_destroy_event_resolves_as_removed():
+    docker = FakeDocker("id1", ContainerHealthStatus("created", "starting"))
+    w = watcher(docker)
+    w.start()
+    thread, results = wait_in_thread(w, 10)
+    # removed without running (no die event): the waiter is not left hanging
+    docker.stream.push("id1", "destroy")
+    thread.join(5)
+    assert results[0].status == "removed"
+    w.close()
+
+
+def test_events_of_other_containers_are_ignored():
+    docker = FakeDocker("new", ContainerHealthStatus("running", "starting"))
+    w = watcher(docker)
+    w.start()
+    thread, results = wait_in_thread(w, 10)
+    docker.stream.push("old", "die")
+    docker.stream.push("new", "health_status: healthy")
+    thread.join(5)
+    assert results == [ContainerHealthStatus("running", "healthy")]
+    w.close()
+
+
+def test_timeout_returns_last_status():
+    docker = FakeDocker("id1", ContainerHealthStatus("running", "starting"))
+    w = watcher(docker)
+    assert w.wait("web", 0.05) == ContainerHealthStatus("running", "starting")
+    w.close()
+
+
+def test_broken_stream_falls_back_to_polling():
+    docker = FakeDocker("id1", ContainerHealthStatus("running", "starting"))
+    w = watcher(docker)
+    w.start()
+    docker.stream.close()
+    docker.status = ContainerHealthStatus("running", "healthy")
+    assert w.wait("web", 5).health == "healthy"
+    w.close()
+
+
+def test_running_unhealthy_container_ends_the_wait():
+    docker = FakeDocker("id1", ContainerHealthStatus("running", "starting"))
+    w = watcher(docker)
+    w.start()
+    thread, results = wait_in_thread(w, 60)
+    docker.stream.push("id1", "health_status: unhealthy")
+    thread.join(5)
+    assert results == [ContainerHealthStatus("running", "unhealthy")]
+
+    # also when polling
+    docker.status = ContainerHealthStatus("running", "unhealthy")
+    assert w.wait("web", 60) == ContainerHealthStatus("running", "unhealthy")
+    w.close()
+
+
+def test_listeners_follow_events_until_the_stream_stops():
+    docker = FakeDocker("id1", ContainerHealthStatus("running", "starting"))
+    w = watcher(docker)
+    changes: "queue.Queue[bool]" = queue.Queue()
+    unsubscribe = w.subscribe(changes.put)
+    assert unsubscribe is not None
+    docker.stream.push("id1", "health_status: healthy")
+    assert changes.get(timeout=5) is True
+    docker.stream.close()
+    assert changes.get(timeout=5) is False
+    assert w.subscribe(changes.put) is not None  # stream opened again
+    w.close()
@@ -0,0 +1,63 @@
+import logging
+
+import pytest
+
+from containup.infra.docker.pull_progress import PullProgress
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def messages() -> list[dict[str, object]]:
+    result: list[dict[str, object]] = [
+        {"status": "Pulling from library/nginx", "id": "latest"},
+        {"status": "Pulling fs layer", "id": "a"},
+        {"status": "Already exists", "id": "b"},
+    ]
+    for current in range(0, 1_000_001, 1000):
+        result.append(
+            {
+                "status": "Downloading",
+                "id": "a",
+                "progressDetail": {"current": current, "total": 2_000_000},
+                "progress": "[=>   ]",
+            }
+        )
+    return result
+
+
+def test_progress_is_folded_per_layer():
+    progress = PullProgress("nginx:latest", clock=Clock())
+    for message in messages():
+        progress.update(message)
+    snapshot = progress.snapshot()
+    assert (snapshot.layers, snapshot.layers_done) == (2, 1)
+    assert (snapshot.bytes_done, snapshot.bytes_total) == (1_000_000, 2_000_000)
+    assert snapshot.percent == 50
+
+    progress.update({"status": "Download complete", "id": "a"})
+    progress.update({"status": "Pull complete", "id": "a"})
+    snapshot = progress.snapshot()
+    assert snapshot.layers_done == 2
+    assert snapshot.percent == 100
+
+
+def test_summaries_are_throttled(caplog: pytest.LogCaptureFixture):
+    clock = Clock()
+    progress = PullProgress("nginx:latest", interval=5, clock=clock)
+    with caplog.at_level(logging.INFO, logger="containup.infra.docker.pull_progress"):
+        for index, message in enumerate(messages()):
+            clock.now = index * 0.01  # about 10 seconds in all
+            progress.update(message)
+        progress.finish()
+    infos = [r for r in caplog.records if r.levelno == logging.INFO]
+    assert len(infos) == 3
+    assert infos[-1].getMessage() == (
+        "Image nginx:latest: pulled, 1/2 layers, 1.0 MB / 2.0 MB (50%)"
+    )
+    assert getattr(infos[-1], "containup_pull")["percent"] == 50
@@ -0,0 +1,153 @@
+"""
+Contract every live ContainerOperator implementation must respect.
+
+Each test runs against the fake engine (tests.support.fake_engine) and against a
+real docker daemon, skipped when none is reachable. On the daemon, they pull
+busybox and create objects named after the test run, removed at the end.
+"""
+
+import os
+import uuid
+from typing import Callable, Iterator
+
+import docker
+import pytest
+
+from containup import CmdShellHealthcheck, HealthcheckOptions, Network, Service, Volume
+from containup.business.commands.container_operator import (
+    Cancellation,
+    ContainerNotFoundException,
+    ContainerOperator,
+    ContainerOperatorException,
+)
+from containup.business.commands.service_config_hash import CONFIG_HASH_LABEL
+from containup.infra.docker.docker_operator import DockerOperator
+from containup.infra.docker.engine_client import (
+    DEFAULT_SOCKET_PATH,
+    EngineApiNotFound,
+    EngineClient,
+)
+from containup.infra.docker.engine_operator import EngineApiOperator
+from containup.infra.resource_pool import ResourcePool
+from containup.infra.user_interactions_cli import UserInteractionsCLI
+from tests.support.fake_engine import FakeEngine, FakeEngineBehavior
+
+IMAGE = "busybox:1.36"
+
+
+def _docker_available() -> bool:
+    host = os.environ.get("DOCKER_HOST", "")
+    if host and not host.startswith("unix://"):
+        return False
+    return os.path.exists(host[len("unix://") :] if host else DEFAULT_SOCKET_PATH)
+
+
+@pytest.fixture(params=["fake", "daemon"])
+def socket_path(request: pytest.FixtureRequest) -> Iterator[str]:
+    """Unix socket of the docker engine the tests talk to"""
+    if request.param == "fake":
+        with FakeEngine(FakeEngineBehavior(health_delay=0.2)) as engine:
+            yield engine.socket_path
+        return
+    if not _docker_available():
+        pytest.skip("no docker daemon on a unix socket")
+    host = os.environ.get("DOCKER_HOST", "")
+    yield host[len("unix://") :] if host else DEFAULT_SOCKET_PATH
+
+
+def _docker_operator(socket_path: str) -> ContainerOperator:
+    def client() -> docker.DockerClient:
+        return docker.DockerClient(base_url=f"unix://{socket_path}")
+
+    return DockerOperator(ResourcePool(client, 2), UserInteractionsCLI())
+
+
+def _engine_operator(socket_path: str) -> ContainerOperator:
+    return EngineApiOperator(EngineClient(socket_path))
+
+
+@pytest.fixture(params=[_docker_operator, _engine_operator], ids=["docker", "engine"])
+def operator(
+    request: pytest.FixtureRequest, socket_path: str
+) -> Iterator[ContainerOperator]:
+    factory: Callable[[str], ContainerOperator] = request.param
+    op = factory(socket_path)
+    yield op
+    op.close()
+
+
+@pytest.fixture
+def name(socket_path: str) -> Iterator[str]:
+    name = f"containup-contract-{uuid.uuid4().hex[:8]}"
+    yield name
+    client = EngineClient(socket_path)
+    for path in [f"/containers/{name}", f"/volumes/{name}", f"/networks/{name}"]:
+        try:
+            client.delete(path, {"force": "1"})
+        except EngineApiNotFound:
+            pass
+    client.close()
+
+
+def test_images(operator: ContainerOperator):
+    operator.image_pull(IMAGE)
+    assert operator.image_exists(IMAGE)
+    assert operator.image_id(IMAGE) is not None
+    assert not operator.image_exists("containup/does-not-exist:0")
+    assert operator.image_id("containup/does-not-exist:0") is None
+
+
+def test_cancelled_pull_raises(operator: ContainerOperator):
+    cancellation = Cancellation()
+    cancellation.cancel()
+    with pytest.raises(ContainerOperatorException, match="cancelled"):
+        operator.image_pull(IMAGE, cancellation)
+
+
+def test_volumes_and_networks(operator: ContainerOperator, name: str):
+    assert not operator.volume_exists(name)
+    operator.volume_create("contract", Volume(name))
+    assert operator.volume_exists(name)
+
+    assert not operator.network_exists(name)
+    operator.network_create("contract", Network(name))
+    assert operator.network_exists(name)
+
+    inventory = operator.inventory([], [name, name + "-missing"], [name])
+    assert inventory.volumes == {name}
+    assert inventory.networks == {name}
+
+
+def test_container_lifecycle(operator: ContainerOperator, name: str):
+    operator.image_pull(IMAGE)
+    service = Service(
+        name,
+        image=IMAGE,
+        command=["sh", "-c", "touch /tmp/ready && sleep 60"],
+        healthcheck=CmdShellHealthcheck(
+            "test -f /tmp/ready",
+            HealthcheckOptions(interval="1s", start_interval="1s"),
+        ),
+    )
+    assert not operator.container_exists(name)
+
+    operator.container_run("contract", service)
+    assert operator.container_exists(name)
+    changes: list[bool] = []
+    unsubscribe = operator.container_health_subscribe("contract", changes.append)
+    state = operator.container_wait_healthy("contract", name, 30)
+    assert state.health == "healthy"
+    assert unsubscribe is not None and changes[:1] == [True]
+    unsubscribe()
+    assert operator.container_health_status(name).status == "running"
+
+    inventory = operator.inventory([name, name + "-missing"], [], [])
+    assert list(inventory.containers) == [name]
+    assert inventory.containers[name].running
+    assert CONFIG_HASH_LABEL in inventory.containers[name].labels
+    assert inventory.image_id(IMAGE) == operator.image_id(IMAGE)
+
+    operator.container_remove(name)
+    assert not operator.container_exists(name)
+    with pytest.raises(ContainerNotFoundException):
+        operator.container_remove(name)
@@ -0,0 +1,87 @@
+import threading
+import time
+
+import pytest
+
+from containup.infra.resource_pool import ResourcePool
+
+
+class Resource:
+    def __init__(self, number: int):
+        self.number = number
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def pool(max_size: int) -> ResourcePool[Resource]:
+    counter = iter(range(1000))
+    return ResourcePool(lambda: Resource(next(counter)), max_size, Resource.close)
+
+
+def test_resources_are_reused():
+    resources = pool(2)
+    for _ in range(5):
+        with resources.lease() as resource:
+            assert resource.number == 0
+    stats = resources.stats()
+    assert (stats.created, stats.acquired, stats.reused) == (1, 5, 4)
+    assert stats.reuse_rate == 0.8
+    assert stats.in_use == 0
+
+
+def test_callers_wait_when_pool_is_full():
+    resources = pool(2)
+    in_use: list[int] = []
+    lock = threading.Lock()
+
+    def work() -> None:
+        with resources.lease() as resource:
+            with lock:
+                in_use.append(resource.number)
+            time.sleep(0.02)
+
+    threads = [threading.Thread(target=work) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = resources.stats()
+    assert stats.created == 2
+    assert stats.max_in_use == 2
+    assert stats.waits >= 1
+    assert stats.wait_seconds > 0
+    assert sorted(set(in_use)) == [0, 1]
+
+
+def test_broken_resources_are_closed_and_replaced():
+    resources = pool(1)
+    resource, reused = resources.acquire()
+    assert not reused
+    resources.release(resource, reusable=False)
+    assert resource.closed
+    with resources.lease() as other:
+        assert other.number == 1
+
+
+def test_failed_creation_frees_the_slot():
+    def fail() -> Resource:
+        raise OSError("no daemon")
+
+    resources: ResourcePool[Resource] = ResourcePool(fail, 1)
+    for _ in range(2):
+        with pytest.raises(OSError):
+            resources.acquire()
+    assert resources.stats().in_use == 0
+
+
+def test_close_closes_idle_resources():
+    resources = pool(2)
+    with resources.lease() as resource:
+        pass
+    resources.close()
+    assert resource.closed
+    with resources.lease() as other:
+        assert other.number == 1
@@ -0,0 +1,135 @@
+"""Runs whole commands through StackRunner and the real clients, against the fake engine."""
+
+import time
+from typing import Iterator
+
+import pytest
+
+from containup import CmdHealthcheck, Network, Service, Stack, Volume, VolumeMount
+from containup.containup_cli import containup_cli_args
+from containup.infra.docker.engine_client import EngineApiError
+from containup.infra.runner.runner import OperatorBackend, StackRunner
+from containup.stack.stack import StockItem
+from tests.support.fake_engine import FakeEngine, FakeEngineBehavior
+
+BACKENDS = ["docker", "engine"]
+
+
+def stack(workers: int = 0) -> Stack:
+    def service(name: str, depends_on: list[str] = []) -> Service:
+        return Service(
+            name,
+            "shop/api:1",
+            network="shop_net",
+            depends_on=depends_on,
+            healthcheck=CmdHealthcheck(["true"]),
+        )
+
+    items: list[StockItem] = [
+        Network("shop_net"),
+        Volume("shop_data"),
+        Service(
+            "db",
+            "postgres:16",
+            volumes=[VolumeMount("shop_data", "/var/lib/postgresql/data")],
+            healthcheck=CmdHealthcheck(["pg_isready"]),
+        ),
+        service("api", ["db"]),
+    ]
+    return Stack("shop").add(items + [service(f"worker_{i}") for i in range(workers)])
+
+
+def run(stack: Stack, backend: OperatorBackend, *args: str) -> None:
+    StackRunner(stack, containup_cli_args("test", list(args)), backend).run()
+
+
+@pytest.fixture
+def engine(monkeypatch: pytest.MonkeyPatch) -> Iterator[FakeEngine]:
+    with FakeEngine(FakeEngineBehavior(health_delay=0.05)) as engine:
+        monkeypatch.setenv("DOCKER_HOST", engine.base_url)
+        yield engine
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_up_again_then_down(engine: FakeEngine, backend: OperatorBackend):
+    run(stack(), backend, "up")
+    assert sorted(engine.containers) == ["api", "db"]
+    assert all(c.health == "healthy" for c in engine.containers.values())
+    assert list(engine.volumes) == ["shop_data"]
+    assert list(engine.networks) == ["shop_net"]
+    assert engine.calls["images.pull"] == 2
+
+    run(stack(), backend, "up")
+    assert engine.calls["containers.create"] == 2
+    assert engine.calls["images.pull"] == 2
+
+    run(stack(), backend, "down")
+    assert engine.containers == {}
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_injected_errors_fail_the_command(engine: FakeEngine, backend: OperatorBackend):
+    engine.behavior.error_rate["containers.create"] = 1.0
+    with pytest.raises(SystemExit) as exit:
+        run(stack(), backend, "up")
+    assert exit.value.code == 1
+    assert engine.containers == {}
+
+
+def test_plain_text_errors_keep_their_message(engine: FakeEngine):
+    engine.behavior.error_rate["*"] = 1.0
+    engine.behavior.plain_text_errors = True
+    client = engine.engine_client()
+    with pytest.raises(EngineApiError) as error:
+        client.get("/containers/json")
+    assert error.value.status == 500
+    assert error.value.message == "fake engine: injected error on containers.list"
+    with pytest.raises(EngineApiError) as error:
+        client.stream("POST", "/images/create", {"fromImage": "nginx", "tag": "1"})
+    assert error.value.message == "fake engine: injected error on images.pull"
+    client.close()
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_unhealthy_dependency_stops_up(engine: FakeEngine, backend: OperatorBackend):
+    engine.behavior.unhealthy.add("db")
+    start = time.monotonic()
+    with pytest.raises(SystemExit):
+        run(stack(), backend, "up")
+    # fails on the health_status event, not at the end of the health deadline
+    assert time.monotonic() - start < 5
+    assert list(engine.containers) == ["db"]
+    assert engine.containers["db"].status == "running"
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_health_waits_overlap_with_parallel(
+    engine: FakeEngine, backend: OperatorBackend
+):
+    engine.behavior.health_delay = 0.3
+    engine.behavior.latency["*"] = 0.001
+    start = time.monotonic()
+    run(stack(workers=4), backend, "up", "--parallel", "6")
+    elapsed = time.monotonic() - start
+    # db then api, workers at the same time: 2 health waits in a row, not 6
+    assert elapsed < 1.2
+    assert len(engine.containers) == 6
+
+
+def test_pinned_api_version_skips_version_negotiation(engine: FakeEngine):
+    run(stack(), "docker", "up", "--docker-api-version", "1.41")
+    assert engine.calls["version"] == 0
+    assert sorted(engine.containers) == ["api", "db"]
+
+    run(stack(), "docker", "down")
+    assert engine.calls["version"] > 0
+
+
+def test_client_is_created_when_first_used(engine: FakeEngine):
+    runner = StackRunner(stack(), containup_cli_args("test", ["up"]))
+    assert engine.calls["version"] == 0
+    run(stack(), "docker", "up")
+    containers = runner.client.containers.list()  # type: ignore
+    assert sorted(c.name for c in containers) == ["api", "db"]  # type: ignore
+    assert runner.client is runner.client
+    assert runner.pool_stats().created == 0
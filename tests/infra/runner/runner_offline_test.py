@@ -0,0 +1,85 @@
+"""Offline commands: the docker SDK is never imported, the event loop never blocked."""
+
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from containup import Service, Stack
+from containup.business.audit.audit_report import AuditResult
+from containup.containup_cli import containup_cli_args
+from containup.infra.runner.runner import StackRunner
+
+SCRIPT = """
+import sys
+from containup import Service, Stack
+from containup.containup_cli import containup_cli_args
+from containup.infra.runner.runner import StackRunner
+
+stack = Stack("s").add(Service("web", "nginx", depends_on=["db"]))
+stack.add(Service("db", "postgres:16"))
+StackRunner(stack, containup_cli_args("test", sys.argv[1:])).run()
+print(sorted(m for m in sys.modules if m == "docker" or m.startswith("docker.")))
+"""
+
+
+@pytest.mark.parametrize(
+    "args", [["check"], ["up", "--dry-run"], ["down", "--dry-run"], ["graph"]]
+)
+def test_docker_not_imported(args: list[str]):
+    result = subprocess.run(
+        [sys.executable, "-c", SCRIPT, *args],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=Path(__file__).parents[3],
+        env={**os.environ, "DOCKER_HOST": "unix:///nonexistent.sock"},
+    )
+    assert result.stdout.splitlines()[-1] == "[]"
+
+
+def test_engine_operator_does_not_import_docker():
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, containup.infra.docker.engine_operator\n"
+            'print(sorted(m for m in sys.modules if m.split(".")[0] == "docker"))',
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=Path(__file__).parents[3],
+    )
+    assert result.stdout.splitlines()[-1] == "[]"
+
+
+def test_async_audit_does_not_block_the_loop(monkeypatch: pytest.MonkeyPatch):
+    runner = StackRunner(
+        Stack("s").add(Service("web", "nginx")), containup_cli_args("test", ["check"])
+    )
+    inspect = runner._inspect  # type: ignore
+
+    def slow_inspect() -> AuditResult:
+        time.sleep(0.3)
+        return inspect()
+
+    monkeypatch.setattr(runner, "_inspect", slow_inspect)
+    ticks: list[float] = []
+
+    async def ticker() -> None:
+        for _ in range(10):
+            await asyncio.sleep(0.01)
+            ticks.append(time.monotonic())
+
+    async def both() -> None:
+        await asyncio.gather(runner.run_async(), ticker())
+
+    start = time.monotonic()
+    asyncio.run(both())
+    assert len(ticks) == 10
+    assert ticks[-1] - start < 0.25
@@ -0,0 +1,680 @@
+"""
+In-process stand-in for the Docker Engine API, over a unix socket.
+
+Implements the subset of the API containup uses (containers, images, volumes,
+networks, events, pull streams, health state), enough for the docker SDK and
+EngineClient to work against it. Objects only live in memory: nothing runs.
+
+Latency, errors and health transitions are configurable per route, so that
+integration and performance tests of the real client path run without docker:
+
+    with FakeEngine(FakeEngineBehavior(latency={"*": 0.002}, health_delay=0.1)) as engine:
+        operator = EngineApiOperator(engine.engine_client())
+        ...
+
+Routes are named `kind.action`: containers.list, containers.inspect,
+containers.create, containers.start, containers.delete, containers.rename,
+images.list, images.inspect, images.pull, volumes.list, volumes.inspect,
+volumes.create, networks.list, networks.inspect, networks.create, events,
+ping, version.
+"""
+
+import json
+import os
+import random
+import re
+import socketserver
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler
+from typing import Any, Callable, Optional, cast
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import docker
+
+from containup.infra.docker.engine_client import EngineClient
+from containup.utils.image_reference import normalize_image_reference
+
+API_VERSION = "1.41"
+
+
+@dataclass
+class FakeEngineBehavior:
+    """How the fake engine answers. Routes are described in the module docstring."""
+
+    latency: dict[str, float] = field(default_factory=lambda: {})
+    """Seconds added before answering, per route. "*" applies to every route."""
+
+    error_rate: dict[str, float] = field(default_factory=lambda: {})
+    """Probability (0 to 1) of answering HTTP 500, per route. "*" for every route."""
+
+    health_delay: float = 0.0
+    """Seconds between the start of a container with a healthcheck and healthy"""
+
+    health_delays: dict[str, float] = field(default_factory=lambda: {})
+    """health_delay, per container name"""
+
+    unhealthy: set[str] = field(default_factory=lambda: set[str]())
+    """Container names that turn unhealthy (and keep running) after their health delay"""
+
+    unknown_images: set[str] = field(default_factory=lambda: set[str]())
+    """Image references that can't be pulled"""
+
+    plain_text_errors: bool = False
+    """Injected errors have a plain text body, as a proxy in front of a daemon answers"""
+
+    seed: int = 0
+    """Seed of the random error injection"""
+
+
+@dataclass
+class FakeContainer:
+    id: str
+    name: str
+    image: str
+    labels: dict[str, str]
+    has_healthcheck: bool
+    status: str = "created"
+    health: Optional[str] = None
+
+    def inspect(self) -> dict[str, Any]:
+        state: dict[str, Any] = {
+            "Status": self.status,
+            "Running": self.status == "running",
+        }
+        if self.health is not None:
+            state["Health"] = {"Status": self.health}
+        return {
+            "Id": self.id,
+            "Name": f"/{self.name}",
+            "Image": self.image,
+            "State": state,
+            "Config": {"Image": self.image, "Labels": self.labels},
+        }
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "Id": self.id,
+            "Names": [f"/{self.name}"],
+            "Image": self.image,
+            "State": self.status,
+            "Labels": self.labels,
+        }
+
+
+class FakeEngine:
+    """
+    Fake Docker Engine API server. Use it as a context manager, or call start()
+    and stop().
+
+    Attributes:
+        calls: number of requests per route
+        connections: number of connections opened by clients
+    """
+
+    def __init__(self, behavior: Optional[FakeEngineBehavior] = None):
+        self.behavior = behavior or FakeEngineBehavior()
+        self.calls: Counter[str] = Counter()
+        self.connections = 0
+        self.containers: dict[str, FakeContainer] = {}
+        """By container name"""
+        self.images: dict[str, str] = {}
+        """Image id by reference (as pulled, like busybox:1.36)"""
+        self.volumes: dict[str, dict[str, Any]] = {}
+        self.networks: dict[str, dict[str, Any]] = {}
+        self.events: list[dict[str, Any]] = []
+        self.lock = threading.Condition()
+        self.random = random.Random(self.behavior.seed)
+        self._timers: list[threading.Timer] = []
+        self.stopping = False
+        self._directory = tempfile.TemporaryDirectory()
+        self.socket_path = os.path.join(self._directory.name, "docker.sock")
+        self._server = _Server(self.socket_path, self)
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            kwargs={"poll_interval": 0.05},
+            name="fake-engine",
+            daemon=True,
+        )
+
+    def __enter__(self) -> "FakeEngine":
+        self.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self.lock:
+            self.stopping = True
+            timers, self._timers = self._timers, []
+            self.lock.notify_all()
+        for timer in timers:
+            timer.cancel()
+        self._server.shutdown()
+        self._server.server_close()
+        self._directory.cleanup()
+
+    @property
+    def base_url(self) -> str:
+        return f"unix://{self.socket_path}"
+
+    def engine_client(self, max_connections: int = 10) -> EngineClient:
+        return EngineClient(
+            self.socket_path, API_VERSION, max_connections=max_connections
+        )
+
+    def docker_client(self) -> docker.DockerClient:
+        return docker.DockerClient(base_url=self.base_url, version=API_VERSION)
+
+    def add_image(self, reference: str) -> str:
+        """Makes an image available as if it was pulled, returns its id"""
+        with self.lock:
+            image_id = self.images.get(reference) or f"sha256:{uuid.uuid4().hex}"
+            self.images[reference] = image_id
+            return image_id
+
+    # -- used by the request handler, under self.lock
+
+    def find_image(self, reference: str) -> Optional[str]:
+        if reference in self.images.values():
+            return reference
+        normalized = normalize_image_reference(reference)
+        for ref, image_id in self.images.items():
+            if normalize_image_reference(ref) == normalized:
+                return image_id
+        return None
+
+    def find_container(self, name_or_id: str) -> Optional[FakeContainer]:
+        container = self.containers.get(name_or_id)
+        if container is not None:
+            return container
+        for container in self.containers.values():
+            if container.id.startswith(name_or_id):
+                return container
+        return None
+
+    def emit(self, container: FakeContainer, action: str) -> None:
+        now = time.time()
+        self.events.append(
+            {
+                "Type": "container",
+                "Action": action,
+                "status": action,
+                "id": container.id,
+                "from": container.image,
+                "Actor": {
+                    "ID": container.id,
+                    "Attributes": {**container.labels, "name": container.name},
+                },
+                "time": int(now),
+                "timeNano": int(now * 1e9),
+            }
+        )
+        self.lock.notify_all()
+
+    def start_container(self, container: FakeContainer) -> None:
+        container.status = "running"
+        self.emit(container, "start")
+        if not container.has_healthcheck:
+            return
+        container.health = "starting"
+        delay = self.behavior.health_delays.get(
+            container.name, self.behavior.health_delay
+        )
+        timer = threading.Timer(delay, self._health_done, args=(container,))
+        timer.daemon = True
+        self._timers.append(timer)
+        timer.start()
+
+    def _health_done(self, container: FakeContainer) -> None:
+        with self.lock:
+            if self.containers.get(container.name) is not container:
+                return
+            if container.name in self.behavior.unhealthy:
+                # like docker, an unhealthy container keeps running
+                container.health = "unhealthy"
+                self.emit(container, "health_status: unhealthy")
+            else:
+                container.health = "healthy"
+                self.emit(container, "health_status: healthy")
+
+
+Query = dict[str, list[str]]
+Answer = tuple[int, Any]
+Route = Callable[["_Handler", re.Match[str], Query], Optional[Answer]]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def address_string(self) -> str:
+        return "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:
+        self._dispatch("POST")
+
+    def do_DELETE(self) -> None:
+        self._dispatch("DELETE")
+
+    @property
+    def engine(self) -> FakeEngine:
+        return cast(_Server, self.server).engine
+
+    def _dispatch(self, method: str) -> None:
+        url = urlsplit(self.path)
+        path = re.sub(r"^/v[0-9.]+(?=/)", "", unquote(url.path))
+        query = parse_qs(url.query)
+        length = int(self.headers.get("Content-Length") or 0)
+        self.body: Any = json.loads(self.rfile.read(length) or b"null")
+        for route_method, pattern, name, handler in _ROUTES:
+            match = re.fullmatch(pattern, path)
+            if route_method != method or match is None:
+                continue
+            self.engine.calls[name] += 1
+            self._inject(name)
+            if self._failed(name):
+                message = f"fake engine: injected error on {name}"
+                if self.engine.behavior.plain_text_errors:
+                    self.send_text(500, message)
+                else:
+                    self.send_json(500, {"message": message})
+                return
+            answer = handler(self, match, query)
+            if answer is not None:
+                self.send_json(*answer)
+            return
+        self.send_json(404, {"message": f"page not found: {method} {path}"})
+
+    def _inject(self, route: str) -> None:
+        latency = self.engine.behavior.latency
+        delay = latency.get(route, latency.get("*", 0.0))
+        if delay:
+            time.sleep(delay)
+
+    def _failed(self, route: str) -> bool:
+        rates = self.engine.behavior.error_rate
+        rate = rates.get(route, rates.get("*", 0.0))
+        with self.engine.lock:
+            return rate > 0 and self.engine.random.random() < rate
+
+    def send_json(self, status: int, data: Any) -> None:
+        body = b"" if data is None else json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_text(self, status: int, text: str) -> None:
+        body = text.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def start_stream(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+    def send_chunk(self, data: Any) -> None:
+        line = (json.dumps(data) + "\r\n").encode()
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(line), line))
+        self.wfile.flush()
+
+    def end_stream(self) -> None:
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+
+def _filters(query: Query) -> dict[str, list[str]]:
+    raw = (query.get("filters") or ["{}"])[0]
+    filters: dict[str, Any] = json.loads(raw)
+    # old clients send {"name": {"x": true}}
+    return {
+        key: (
+            [str(v) for v in cast(list[Any], value)]
+            if isinstance(value, (list, dict))
+            else [str(value)]
+        )
+        for key, value in filters.items()
+    }
+
+
+def _any_name_match(patterns: list[str], name: str) -> bool:
+    """Values of one filter are alternatives. Container names start with /"""
+    return not patterns or any(re.search(p, f"/{name}") for p in patterns)
+
+
+def _labels_match(labels: dict[str, str], wanted: list[str]) -> bool:
+    for label in wanted:
+        key, _, value = label.partition("=")
+        if key not in labels or ("=" in label and labels[key] != value):
+            return False
+    return True
+
+
+# -- containers
+
+
+def _containers_list(h: _Handler, m: re.Match[str], q: Query) -> Answer:
+    filters = _filters(q)
+    everything = (q.get("all") or ["0"])[0] in ("1", "true", "True")
+    with h.engine.lock:
+        result = [
+            c.summary()
+            for c in h.engine.containers.values()
+            if (everything or c.status == "running")
+            and _any_name_match(filters.get("name", []), c.name)
+            and _labels_match(c.labels, filters.get("label", []))
+        ]
+    return 200, result
+
+
+def _containers_inspect(h: _Handler, m: re.Match[str], q: Query) -> Answer:
+    with h.engine.lock:
+        container = h.engine.find_container(m[1])
+        if container is None:
+            return 404, {"message": f"No such container: {m[1]}"}
+        return 200, container.inspect()
+
+
+def _containers_create(h: _Handler, m: re.Match[str], q: Query) -> Answer:
+    body: dict[str, Any] = h.body or {}
+    name = (q.get("name") or [uuid.uuid4().hex[:12]])[0]
+    image = str(body.get("Image") or "")
+    healthcheck: dict[str, Any] = body.get("Healthcheck") or {}
+    test: list[str] = healthcheck.get("Test") or []
+    with h.engine.lock:
+        if name in h.engine.containers:
+            return 409, {
+                "message": f'Conflict. The container name "/{name}" is already in use'
+            }
+        if h.engine.find_image(image) is None:
+            return 404, {"message": f"No such image: {image}"}
+        container = FakeContainer(
+            id=uuid.uuid4().hex + uuid.uuid4().hex,
+            name=name,
+            image=image,
+            labels=dict(body.get("Labels") or {}),
+            has_healthcheck=bool(test) and test[0] != "NONE",
+        )
+        h.engine.containers[name] = container
+        h.engine.emit(container, "create")
+    return 201, {"Id": container.id, "Warnings": []}
+
+
+def _containers_start(h: _Handler, m: re.Match[str], q: Query) -> Answer:
+    with h.engine.lock:
+        container = h.engine.find_container(m[1])
+        if container is None:
+            return 404, {"message": f"No such container: {m[1]}"}
+        if container.status != "running":
+            h.engine.start_container(container)
+    return 204, None
+
+
+def _containers_delete(h: _Handler, m: re.Match[str], q: Query) -> Answer:
+    force = (q.get("force") or ["0"])[0] in ("1", "true", "True")
+    with h.engine.lock:
+        container = h.engine.find_container(m[1])
+        if container is None:
+            return 404, {"message": f"No such container: {m[1]}"}
+        if container.status == "running" and not force:
+            return 409, {"message": "You cannot remove a running container"}
+        del h.engine.containers[container.name]
+        if container.status == "running":
+            h.engine.emit(container, "die")
+        h.engine.emit(container, "destroy")
+    return 204, None
+
+
+def _containers_rename(h: _Handler, m: re.Match[str], q: Query) -> Answer:
+    new_name = (q.get("name") or [""])[0]
+    with h.engine.lock:
+        container = h.engine.find_container(m[1])
+        if container is None:
+            return 404, {"message": f"No such container: {m[1]}"}
+        if new_name in h.engine.containers:
+            return 409, {"message": f"Conflict. The name {new_name} is already in use"}
+        del h.engine.containers[container.name]
+        container.name = new_name
+        h.engine.containers[new_name] = container
+        h.engine.emit(container, "rename")
+    return 204, None
+
+
+# -- images
+
+
+def _images_list(h: _Handler, m: re.Match[str], q: Query) -> Answer:
+    with h.engine.lock:
+        by_id: dict[str, list[str]] = {}
+        for reference, image_id in h.engine.images.items():
+            by_id.setdefault(image_id, []).append(reference)
+    return 200, [
+        {"Id": image_id, "RepoTags": tags, "RepoDigests": []}
+        for image_id, tags in by_id.items()
+    ]
+
+
+def _images_inspect(h: _Handler, m: re.Match[str], q: Query) -> Answer:
+    with h.engine.lock:
+        image_id = h.engine.find_image(m[1])
+    if image_id is None:
+        return 404, {"message": f"No such image: {m[1]}"}
+    return 200, {"Id": image_id, "RepoTags": [m[1]]}
+
+
+def _images_pull(h: _Handler, m: re.Match[str], q: Query) -> None:
+    image = (q.get("fromImage") or [""])[0]
+    tag = (q.get("tag") or ["latest"])[0]
+    reference = f"{image}:{tag}"
+    for prefix in ("docker.io/library/", "docker.io/"):
+        if reference.startswith(prefix):
+            reference = reference[len(prefix) :]
+            break
+    if normalize_image_reference(reference) in {
+        normalize_image_reference(i) for i in h.engine.behavior.unknown_images
+    }:
+        h.send_json(404, {"message": f"pull access denied for {image}"})
+        return
+    h.start_stream()
+    h.send_chunk({"status": f"Pulling from {image}", "id": tag})
+    for layer in ("a1b2c3", "d4e5f6"):
+        h.send_chunk({"status": "Pulling fs layer", "id": layer})
+        for current in (500_000, 1_000_000):
+            h.send_chunk(
+                {
+                    "status": "Downloading",
+                    "id": layer,
+                    "progressDetail": {"current": current, "total": 1_000_000},
+                }
+            )
+        h.send_chunk({"status": "Pull complete", "id": layer})
+    h.engine.add_image(reference)
+    h.send_chunk({"status": f"Status: Downloaded newer image for {reference}"})
+    h.end_stream()
+
+
+# -- volumes and networks
+
+
+def _volumes_list(h: _Handler, m: re.Match[str], q: Query) -> Answer:
+    names = _filters(q).get("name", [])
+    with h.engine.lock:
+        volumes = [
+            v
+            for name, v in h.engine.volumes.items()
+            if not names or any(wanted in name for wanted in names)
+        ]
+    return 200, {"Volumes": volumes, "Warnings": []}
+
+
+def _volumes_inspect(h: _Handler, m: re.Match[str], q: Query) -> Answer:
+    with h.engine.lock:
+        volume = h.engine.volumes.get(m[1])
+    if volume is None:
+        return 404, {"message": f"get {m[1]}: no such volume"}
+    return 200, volume
+
+
+def _volumes_create(h: _Handler, m: re.Match[str], q: Query) -> Answer:
+    body: dict[str, Any] = h.body or {}
+    name = str(body.get("Name") or uuid.uuid4().hex)
+    volume: dict[str, Any] = {
+        "Name": name,
+        "Driver": body.get("Driver") or "local",
+        "Labels": body.get("Labels") or {},
+        "Mountpoint": f"/var/lib/docker/volumes/{name}/_data",
+    }
+    with h.engine.lock:
+        volume = h.engine.volumes.setdefault(name, volume)
+    return 201, volume
+
+
+def _networks_list(h: _Handler, m: re.Match[str], q: Query) -> Answer:
+    names = _filters(q).get("name", [])
+    with h.engine.lock:
+        networks = [
+            n
+            for name, n in h.engine.networks.items()
+            if not names or any(wanted in name for wanted in names)
+        ]
+    return 200, networks
+
+
+def _networks_inspect(h: _Handler, m: re.Match[str], q: Query) -> Answer:
+    with h.engine.lock:
+        for network in h.engine.networks.values():
+            if m[1] in (network["Name"], network["Id"]):
+                return 200, network
+    return 404, {"message": f"network {m[1]} not found"}
+
+
+def _networks_create(h: _Handler, m: re.Match[str], q: Query) -> Answer:
+    body: dict[str, Any] = h.body or {}
+    name = str(body.get("Name") or "")
+    with h.engine.lock:
+        if name in h.engine.networks:
+            return 409, {"message": f"network with name {name} already exists"}
+        network: dict[str, Any] = {
+            "Name": name,
+            "Id": uuid.uuid4().hex,
+            "Driver": body.get("Driver") or "bridge",
+            "Labels": body.get("Labels") or {},
+        }
+        h.engine.networks[name] = network
+    return 201, {"Id": network["Id"], "Warning": ""}
+
+
+# -- events and system
+
+
+def events(h: _Handler, m: re.Match[str], q: Query) -> None:
+    filters = _filters(q)
+    engine = h.engine
+    h.start_stream()
+    with engine.lock:
+        position = len(engine.events)
+    try:
+        while True:
+            with engine.lock:
+                while position == len(engine.events) and not engine.stopping:
+                    engine.lock.wait(0.5)
+                if engine.stopping:
+                    break
+                events = engine.events[position:]
+                position = len(engine.events)
+            for event in events:
+                if _event_match(event, filters):
+                    h.send_chunk(event)
+        h.end_stream()
+    except OSError:
+        # client went away
+        pass
+    h.close_connection = True
+
+
+def _event_match(event: dict[str, Any], filters: dict[str, list[str]]) -> bool:
+    types = filters.get("type", [])
+    actions = filters.get("event", [])
+    attributes: dict[str, str] = event["Actor"]["Attributes"]
+    return (
+        (not types or event["Type"] in types)
+        and (not actions or any(event["Action"].startswith(a) for a in actions))
+        and _labels_match(attributes, filters.get("label", []))
+        and all(
+            n in (attributes["name"], event["id"]) for n in filters.get("container", [])
+        )
+    )
+
+
+def _ping(h: _Handler, m: re.Match[str], q: Query) -> None:
+    body = b"OK"
+    h.send_response(200)
+    h.send_header("Content-Type", "text/plain")
+    h.send_header("Content-Length", str(len(body)))
+    h.end_headers()
+    h.wfile.write(body)
+
+
+def _version(h: _Handler, m: re.Match[str], q: Query) -> Answer:
+    return 200, {
+        "Version": "fake",
+        "ApiVersion": API_VERSION,
+        "MinAPIVersion": "1.24",
+        "Os": "linux",
+    }
+
+
+_ROUTES: list[tuple[str, str, str, Route]] = [
+    ("GET", r"/containers/json", "containers.list", _containers_list),
+    ("POST", r"/containers/create", "containers.create", _containers_create),
+    ("GET", r"/containers/([^/]+)/json", "containers.inspect", _containers_inspect),
+    ("POST", r"/containers/([^/]+)/start", "containers.start", _containers_start),
+    ("POST", r"/containers/([^/]+)/rename", "containers.rename", _containers_rename),
+    ("DELETE", r"/containers/([^/]+)", "containers.delete", _containers_delete),
+    ("GET", r"/images/json", "images.list", _images_list),
+    ("POST", r"/images/create", "images.pull", _images_pull),
+    ("GET", r"/images/(.+)/json", "images.inspect", _images_inspect),
+    ("GET", r"/volumes", "volumes.list", _volumes_list),
+    ("POST", r"/volumes/create", "volumes.create", _volumes_create),
+    ("GET", r"/volumes/([^/]+)", "volumes.inspect", _volumes_inspect),
+    ("GET", r"/networks", "networks.list", _networks_list),
+    ("POST", r"/networks/create", "networks.create", _networks_create),
+    ("GET", r"/networks/([^/]+)", "networks.inspect", _networks_inspect),
+    ("GET", r"/events", "events", events),
+    ("GET", r"/_ping", "ping", _ping),
+    ("GET", r"/version", "version", _version),
+]
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    # kept-alive connections of clients still open must not block server_close
+    block_on_close = False
+
+    def __init__(self, path: str, engine: FakeEngine):
+        super().__init__(path, _Handler)
+        self.engine = engine
+
+    def process_request(self, request: Any, client_address: Any) -> None:
+        self.engine.connections += 1
+        super().process_request(request, client_address)
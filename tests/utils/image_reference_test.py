@@ -0,0 +1,34 @@
+import pytest
+
+from containup.utils.image_reference import image_registry, normalize_image_reference
+
+
+@pytest.mark.parametrize(
+    "image",
+    ["nginx", "nginx:latest", "library/nginx", "docker.io/library/nginx:latest"],
+)
+def test_official_image_spellings(image: str):
+    assert normalize_image_reference(image) == "docker.io/library/nginx:latest"
+
+
+@pytest.mark.parametrize(
+    "image,expected",
+    [
+        ("postgres:17.5", "docker.io/library/postgres:17.5"),
+        ("traefik/whoami", "docker.io/traefik/whoami:latest"),
+        ("index.docker.io/traefik/whoami:v1", "docker.io/traefik/whoami:v1"),
+        ("docker.n8n.io/n8nio/n8n:1.93.0", "docker.n8n.io/n8nio/n8n:1.93.0"),
+        ("localhost:5000/app", "localhost:5000/app:latest"),
+        ("localhost/app:2", "localhost/app:2"),
+        ("nginx@sha256:abc", "docker.io/library/nginx@sha256:abc"),
+        ("nginx:1.27@sha256:abc", "docker.io/library/nginx:1.27@sha256:abc"),
+    ],
+)
+def test_normalize(image: str, expected: str):
+    assert normalize_image_reference(image) == expected
+
+
+def test_registry():
+    assert image_registry("nginx") == "docker.io"
+    assert image_registry("ghcr.io/org/app:1") == "ghcr.io"
+    assert image_registry("localhost:5000/app") == "localhost:5000"
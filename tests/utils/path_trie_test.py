@@ -0,0 +1,52 @@
+import random
+from pathlib import PurePosixPath
+
+from containup.utils.path_trie import PathTrie
+
+
+def overlaps(a: str, b: str) -> bool:
+    def inside(child: PurePosixPath, parent: PurePosixPath) -> bool:
+        try:
+            child.relative_to(parent)
+            return True
+        except ValueError:
+            return False
+
+    pa, pb = PurePosixPath(a), PurePosixPath(b)
+    return inside(pa, pb) or inside(pb, pa)
+
+
+def test_overlapping():
+    trie = PathTrie[str]()
+    for path in ["/data", "/data/cache", "/database", "/data/cache/", "/etc", "data"]:
+        trie.add(path, path)
+    assert trie.overlapping("/data") == ["/data", "/data/cache", "/data/cache/"]
+    assert trie.overlapping("/data/cache/tmp") == [
+        "/data",
+        "/data/cache",
+        "/data/cache/",
+    ]
+    assert trie.overlapping("/") == [
+        "/data",
+        "/data/cache",
+        "/database",
+        "/data/cache/",
+        "/etc",
+    ]
+    assert trie.overlapping("/var") == []
+    assert trie.overlapping("data/x") == ["data"]
+
+
+def test_same_as_relative_to():
+    rnd = random.Random(0)
+    parts = ["a", "b", "ab", "."]
+    paths = [
+        rnd.choice(["/", ""]) + "/".join(rnd.choices(parts, k=rnd.randint(1, 4)))
+        for _ in range(200)
+    ]
+    trie = PathTrie[int]()
+    for i, path in enumerate(paths):
+        trie.add(path, i)
+    for path in paths:
+        expected = [i for i, other in enumerate(paths) if overlaps(path, other)]
+        assert trie.overlapping(path) == expected
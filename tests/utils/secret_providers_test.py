@@ -0,0 +1,131 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from containup import Service, Stack
+from containup.business.commands.command_up import CommandUp
+from containup.business.execution_listener import ExecutionListenerStd
+from containup.business.live_state.stack_state import StackState
+from containup.infra.dryrun.dryrun_operator import DryRunOperator
+from containup.utils.secret_value import SecretValue
+from containup.utils.secret_providers import (
+    SecretProviderException,
+    SecretResolver,
+    resolver,
+    secret_from,
+    secret_from_command,
+    secret_from_env,
+    secret_from_file,
+)
+from tests.business.commands.fakes import FakeUserInteractions
+
+
+@pytest.fixture(autouse=True)
+def forget_secrets():
+    yield
+    resolver.forget()
+
+
+def test_env(monkeypatch: pytest.MonkeyPatch):
+    s = secret_from_env("token", "CONTAINUP_TEST_TOKEN")
+    with pytest.raises(SecretProviderException):
+        s.reveal()
+    monkeypatch.setenv("CONTAINUP_TEST_TOKEN", "abc")
+    assert s.reveal() == "abc"
+    assert "abc" not in repr(s)
+
+
+def test_file(tmp_path: Path):
+    path = tmp_path / "password"
+    path.write_text("hunter2\n")
+    assert secret_from_file("password", str(path)).reveal() == "hunter2"
+    with pytest.raises(SecretProviderException):
+        secret_from_file("password", str(tmp_path / "missing")).reveal()
+
+
+def test_command_errors_never_show_output():
+    ok = secret_from_command("c", [sys.executable, "-c", "print('s3cret')"])
+    assert ok.reveal() == "s3cret"
+    failing = secret_from_command(
+        "c", [sys.executable, "-c", "print('leaked'); raise SystemExit(3)"]
+    )
+    with pytest.raises(SecretProviderException) as e:
+        failing.reveal()
+    assert "leaked" not in str(e.value)
+    assert "3" in str(e.value)
+
+
+def test_same_key_looked_up_once_at_the_same_time():
+    calls: list[int] = []
+
+    def slow() -> str:
+        calls.append(1)
+        time.sleep(0.1)
+        return "value"
+
+    secrets = [secret_from(f"s{i}", slow, key="vault:db") for i in range(5)]
+    values: list[str] = []
+
+    def reveal(s: SecretValue) -> None:
+        values.append(s.reveal())
+
+    threads = [threading.Thread(target=reveal, args=(s,)) for s in secrets]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert values == ["value"] * 5
+    assert len(calls) == 1
+
+
+def test_ttl():
+    now = [0.0]
+    calls: list[int] = []
+
+    def provider() -> str:
+        calls.append(1)
+        return f"v{len(calls)}"
+
+    ttl = SecretResolver(ttl=10, clock=lambda: now[0])
+    assert ttl.resolve("k", provider) == "v1"
+    ttl.forget()
+    now[0] = 5
+    assert ttl.resolve("k", provider) == "v1"
+    now[0] = 11
+    assert ttl.resolve("k", provider) == "v2"
+
+    no_ttl = SecretResolver()
+    no_ttl.resolve("k", provider)
+    no_ttl.forget()
+    assert no_ttl.resolve("k", provider) == "v4"
+
+
+def test_up_only_looks_up_secrets_of_services_started():
+    looked_up: list[str] = []
+
+    def vault(name: str) -> str:
+        looked_up.append(name)
+        return name + "-value"
+
+    def service(name: str) -> Service:
+        return Service(
+            name,
+            "app:1",
+            environment={"TOKEN": secret_from(name, lambda: vault(name))},
+        )
+
+    stack = Stack("s").add([service("web"), service("worker")])
+    listener = ExecutionListenerStd()
+    CommandUp(
+        stack=stack,
+        operator=DryRunOperator(listener),
+        system_interactions=FakeUserInteractions(),
+        auditor=listener,
+        dry_run=False,
+        live_check=False,
+        stack_state=StackState(),
+    ).up(["web"])
+    assert looked_up == ["web"]
@@ -153,3 +153,23 @@ def test_secret_cannot_delete_existing_slots():
     s = SecretValue("a", "b")
     with pytest.raises(AttributeError):
         del s.__label  # type: ignore
+
+
+def test_secret_object_holds_no_reference_to_value():
+    import gc
+
+    s = SecretValue("x", "not-referenced")
+    assert "not-referenced" not in gc.get_referents(s)
+
+
+def test_secret_values_are_kept_per_instance():
+    from containup.utils import secret_value
+
+    secrets = [SecretValue("x", f"value-{i}") for i in range(3)]
+    assert [s.reveal() for s in secrets] == ["value-0", "value-1", "value-2"]
+    # no module level store of values
+    assert not [
+        name
+        for name, value in vars(secret_value).items()
+        if isinstance(value, dict) and not name.startswith("__")
+    ]